@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+import dat_writer
+import profile_store
+
 
 # ============================================================
 # AUXILIARY FUNCTIONS
@@ -98,23 +101,36 @@ class Airfoil:
 
         return cls(name, x_nd, y_nd, c, normalize=True)
 
+    # ------------------------------------------------------------
+    # Perfil desde el almacen binario (profile_store)
+    # ------------------------------------------------------------
+    @classmethod
+    def from_store(cls, ref, c=1.0, normalize=False):
+        """
+        ref = "<almacen.npy>#<nombre>". Las coordenadas son vistas del archivo mapeado
+        (sin copia); normalize=False → el almacen guarda coordenadas reales.
+        """
+        pts = profile_store.load_points(ref)
+        return cls(profile_store.profile_name(ref), pts[:, 0], pts[:, 1], c, normalize=normalize)
+
     # ------------------------------------------------------------
     # EXPORTACIÓN
     # ------------------------------------------------------------
-    def save_dat(self, filename, non_dim=False):
+    def save_dat(self, filename, non_dim=False, skip_unchanged=False):
         """
         non_dim=True  → guarda (x/c, y/c)
         non_dim=False → guarda (X, Y) reales
+        skip_unchanged=True → no reescribe el archivo si ya tiene este contenido
         """
-        with open(filename, "w") as f:
-            f.write(self.name + "\n")
-
-            if non_dim:
-                for xi, yi in zip(self.x_nd, self.y_nd):
-                    f.write(f"{xi:.6f} {yi:.6f}\n")
-            else:
-                for Xi, Yi in zip(self.X, self.Y):
-                    f.write(f"{Xi:.6f} {Yi:.6f}\n")
+        if non_dim:
+            x, y = self.x_nd, self.y_nd
+        else:
+            x, y = self.X, self.Y
+        written = dat_writer.write_dat(filename, self.name, x, y, line_fmt=dat_writer.AIRFOIL_LINE,
+                                       skip_unchanged=skip_unchanged)
+        if not written:
+            print(f"[OK] Archivo .dat sin cambios: {filename}")
+            return
 
         print(f"[OK] Archivo .dat guardado: {filename}")
 
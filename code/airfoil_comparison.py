@@ -1,118 +1,479 @@
 """
 Ranking y visualizacion de resultados aerodinamicos.
 Se invoca desde main.py (flag --run-comparison) o como script standalone.
+La entrada puede ser el CSV combinado o su version columnar (.parquet/.arrow, ver result_export): en ese
+caso solo se leen las columnas necesarias y los filtros de solver/alpha se aplican en la lectura.
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
-from dataclasses import dataclass
+import heapq
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import result_export
 
 try:  # matplotlib es opcional
     import matplotlib.pyplot as plt
 except Exception:  # pragma: no cover - dependencia opcional
     plt = None
 
+try:  # pyarrow es opcional: solo para entradas .parquet/.arrow
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+except ImportError:  # pragma: no cover - dependencia opcional
+    pa = None
+    pads = None
+
 
 NUM_FIELDS = ("alpha", "Re", "mach", "CL", "CD", "CM")
+METRICS = ("cd_mean", "cd_min", "cl_mean", "clcd_mean", "clcd_max")
+LOWER_IS_BETTER = ("cd_mean", "cd_min")
+# columnas que lee cada consumidor de un archivo columnar (los filtros no necesitan proyectarse)
+RANKING_COLUMNS = ("airfoil", "CL", "CD")
+POLAR_COLUMNS = ("solver", "CL", "CD")
+# filas por bloque en el ranking en streaming
+CHUNK_ROWS = 65536
+
+
+def _float_column(values: List[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(valores, validos): lo que no se puede convertir a float (vacio, texto, campo faltante) queda como invalido."""
+    if None not in values:
+        try:
+            return np.array(values, dtype=float), np.ones(len(values), dtype=bool)
+        except ValueError:
+            pass
+    out = np.zeros(len(values))
+    valid = np.ones(len(values), dtype=bool)
+    for i, v in enumerate(values):
+        try:
+            out[i] = float(v)
+        except (TypeError, ValueError):
+            valid[i] = False
+    return out, valid
 
 
-@dataclass
-class Row:
-    solver: str
-    airfoil: str
-    alpha: float
-    Re: float
-    mach: float
-    CL: float
-    CD: float
-    CM: float
+def _read_csv_columns(csv_in: Path) -> Dict[str, np.ndarray]:
+    """CSV combinado como columnas NumPy; se descartan las filas con algun campo numerico invalido."""
+    with csv_in.open("r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return _records_to_columns(header, [r for r in reader if r])
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, str]) -> Optional["Row"]:
-        try:
-            return cls(
-                solver=data.get("solver", ""),
-                airfoil=data.get("airfoil", ""),
-                alpha=float(data.get("alpha", 0.0)),
-                Re=float(data.get("Re", 0.0)),
-                mach=float(data.get("mach", 0.0)),
-                CL=float(data.get("CL", 0.0)),
-                CD=float(data.get("CD", 0.0)),
-                CM=float(data.get("CM", 0.0)),
-            )
-        except Exception:
-            return None
-
-
-def _read_rows(csv_in: Path) -> List[Row]:
+
+def _iter_csv_chunks(csv_in: Path, chunk_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+    """Como `_read_csv_columns`, pero de a `chunk_rows` filas (memoria acotada)."""
+    with csv_in.open("r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        records: List[List[str]] = []
+        for r in reader:
+            if r:
+                records.append(r)
+            if len(records) >= chunk_rows:
+                yield _records_to_columns(header, records)
+                records = []
+        if records:
+            yield _records_to_columns(header, records)
+
+
+def _records_to_columns(header: List[str], records: List[List[str]]) -> Dict[str, np.ndarray]:
+    width = len(header)
+    if any(len(r) < width for r in records):
+        # filas cortas: DictReader deja None en los campos que faltan
+        records = [r + [None] * (width - len(r)) for r in records]
+    raw = dict(zip(header, zip(*records))) if records else {k: () for k in header}
+    return _columns_from_raw(raw, len(records))
+
+
+def _columns_from_raw(raw: Dict[str, Iterable], n: int) -> Dict[str, np.ndarray]:
+    """{campo: valores} -> columnas NumPy, sin las filas con algun campo numerico invalido (ver `_float_column`)."""
+    cols: Dict[str, np.ndarray] = {}
+    keep = np.ones(n, dtype=bool)
+    for k in NUM_FIELDS:
+        if k in raw:
+            cols[k], valid = _float_column(list(raw[k]))
+            keep &= valid
+        else:
+            cols[k] = np.zeros(n)
+    for k in ("solver", "airfoil"):
+        cols[k] = np.array(["" if v is None else v for v in raw[k]] if k in raw else [""] * n, dtype=str)
+    return {k: v[keep] for k, v in cols.items()}
+
+
+def _read_columnar_columns(
+    path: Path,
+    columns: Optional[Iterable[str]] = None,
+    solver: Optional[str] = None,
+    aoa_min: Optional[float] = None,
+    aoa_max: Optional[float] = None,
+) -> Dict[str, np.ndarray]:
+    """Lee un .parquet/.arrow con proyeccion de columnas y filtros empujados a la lectura.
+
+    Las columnas no leidas quedan con 0.0 (numericas) o "" (solver/airfoil).
+    """
+    dataset, columns, expr = _columnar_scan(path, columns, solver, aoa_min, aoa_max)
+    return _arrow_columns(dataset.to_table(columns=columns, filter=expr), columns)
+
+
+def _iter_columnar_chunks(path: Path, columns, solver, aoa_min, aoa_max) -> Iterator[Dict[str, np.ndarray]]:
+    """Lote a lote (record batches del archivo), con la misma proyeccion y filtros."""
+    dataset, columns, expr = _columnar_scan(path, columns, solver, aoa_min, aoa_max)
+    for batch in dataset.to_batches(columns=columns, filter=expr):
+        if batch.num_rows:
+            yield _arrow_columns(pa.Table.from_batches([batch]), columns)
+
+
+def _columnar_scan(path: Path, columns, solver, aoa_min, aoa_max):
+    """(dataset, columnas a leer, expresion de filtro) para un .parquet/.arrow."""
+    if pads is None:
+        raise ImportError(f"pyarrow no está instalado; no se puede leer {path} (pip install pyarrow)")
+    dataset = pads.dataset(str(path), format=result_export.columnar_format(path))
+    names = dataset.schema.names
+    columns = [c for c in (columns or names) if c in names]
+    conditions = [pads.field(c).is_valid() for c in columns if c in NUM_FIELDS]
+    if solver:
+        conditions.append(pads.field("solver") == solver)
+    if aoa_min is not None:
+        conditions.append(pads.field("alpha") >= aoa_min)
+    if aoa_max is not None:
+        conditions.append(pads.field("alpha") <= aoa_max)
+    expr = None
+    for cond in conditions:
+        expr = cond if expr is None else expr & cond
+    return dataset, columns, expr
+
+
+def _arrow_columns(table, columns: List[str]) -> Dict[str, np.ndarray]:
+    n = table.num_rows
+    cols: Dict[str, np.ndarray] = {}
+    for k in NUM_FIELDS:
+        cols[k] = table.column(k).to_numpy().astype(float) if k in columns else np.zeros(n)
+    for k in ("solver", "airfoil"):
+        cols[k] = (np.array(["" if v is None else v for v in table.column(k).to_pylist()], dtype=str)
+                   if k in columns else np.full(n, "", dtype=str))
+    return cols
+
+
+def _load_columns(
+    csv_in: Path,
+    solver: Optional[str] = None,
+    aoa_min: Optional[float] = None,
+    aoa_max: Optional[float] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Dict[str, np.ndarray]:
+    """Columnas filtradas ({campo: array}); en archivos columnares solo se leen `columns`."""
     if not csv_in.exists():
         raise FileNotFoundError(f"No se encontró el CSV de entrada: {csv_in}")
-    rows: List[Row] = []
-    with csv_in.open("r", newline="") as f:
-        reader = csv.DictReader(f)
-        for raw in reader:
-            r = Row.from_dict(raw)
-            if r is not None:
-                rows.append(r)
-    return rows
+    if result_export.columnar_format(csv_in):
+        return _read_columnar_columns(csv_in, columns=columns, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
+    cols = _read_csv_columns(csv_in)
+    return _filter_columns(cols, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
 
 
-def _filter_rows(
-    rows: Iterable[Row],
+def _filter_columns(
+    cols: Dict[str, np.ndarray],
     solver: Optional[str] = None,
     aoa_min: Optional[float] = None,
     aoa_max: Optional[float] = None,
-) -> List[Row]:
-    out = []
-    for r in rows:
-        if solver and r.solver != solver:
-            continue
-        if aoa_min is not None and r.alpha < aoa_min:
-            continue
-        if aoa_max is not None and r.alpha > aoa_max:
-            continue
-        out.append(r)
-    return out
-
-
-def _group_by_airfoil(rows: Iterable[Row]) -> Dict[str, List[Row]]:
-    groups: Dict[str, List[Row]] = {}
-    for r in rows:
-        groups.setdefault(r.airfoil, []).append(r)
-    return groups
-
-
-def _metric_value(rows: List[Row], metric: str) -> Optional[float]:
-    if not rows:
-        return None
+) -> Dict[str, np.ndarray]:
+    """Filtro por solver y rango de alpha con mascaras booleanas (alpha NaN no se descarta)."""
+    keep = np.ones(len(cols["airfoil"]), dtype=bool)
+    if solver:
+        keep &= cols["solver"] == solver
+    if aoa_min is not None:
+        keep &= ~(cols["alpha"] < aoa_min)
+    if aoa_max is not None:
+        keep &= ~(cols["alpha"] > aoa_max)
+    if keep.all():
+        return cols
+    return {k: v[keep] for k, v in cols.items()}
+
+
+def _check_metrics(metrics: Iterable[str]) -> List[str]:
+    metrics = list(metrics)
+    for metric in metrics:
+        if metric.lower() not in METRICS:
+            raise ValueError(f"Métrica desconocida: {metric}")
+    return metrics
+
+
+def _group_aggregates(airfoil: np.ndarray, CL: np.ndarray, CD: np.ndarray):
+    """Agregados por perfil en una pasada de reducciones agrupadas.
+
+    Devuelve (nombres, {agregado: array}); los perfiles quedan en orden de primera aparicion y las sumas
+    se acumulan en el orden de las filas. Los agregados son sumables entre bloques (ver StreamingRanker).
+    """
+    uniq, first, inverse = np.unique(airfoil, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    position = np.empty(len(uniq), dtype=np.intp)
+    position[order] = np.arange(len(uniq))
+    codes = position[inverse.ravel()]
+    names = uniq[order]
+    n_groups = len(names)
+    counts = np.bincount(codes, minlength=n_groups)
+
+    # min/max por grupo con reduceat sobre las filas ordenadas por perfil
+    sorter = np.argsort(codes, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if n_groups else np.zeros(0, dtype=np.intp)
+    nonzero = CD != 0
+    ratio = np.divide(CL, CD, out=np.full(len(CD), -np.inf), where=nonzero)
+    agg = {
+        "count": counts,
+        "cd_sum": np.bincount(codes, weights=CD, minlength=n_groups),
+        "cd_min": np.minimum.reduceat(CD[sorter], starts) if n_groups else np.zeros(0),
+        "cl_sum": np.bincount(codes, weights=CL, minlength=n_groups),
+        "ratio_count": np.bincount(codes[nonzero], minlength=n_groups),
+        "ratio_sum": np.bincount(codes[nonzero], weights=ratio[nonzero], minlength=n_groups),
+        "ratio_max": np.maximum.reduceat(ratio[sorter], starts) if n_groups else np.zeros(0),
+    }
+    return names, agg
+
+
+def _metric_values(agg: Dict[str, np.ndarray], metric: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(valores, definido) de una metrica a partir de los agregados."""
     metric = metric.lower()
+    counts = agg["count"]
     if metric == "cd_mean":
-        vals = [r.CD for r in rows]
-        return sum(vals) / len(vals)
+        return agg["cd_sum"] / np.maximum(counts, 1), counts > 0
     if metric == "cd_min":
-        return min(r.CD for r in rows)
+        return agg["cd_min"], counts > 0
     if metric == "cl_mean":
-        vals = [r.CL for r in rows]
-        return sum(vals) / len(vals)
+        return agg["cl_sum"] / np.maximum(counts, 1), counts > 0
+    has_ratio = agg["ratio_count"] > 0
     if metric == "clcd_mean":
-        ratios = [r.CL / r.CD for r in rows if r.CD != 0]
-        return (sum(ratios) / len(ratios)) if ratios else None
+        return agg["ratio_sum"] / np.maximum(agg["ratio_count"], 1), has_ratio
     if metric == "clcd_max":
-        ratios = [r.CL / r.CD for r in rows if r.CD != 0]
-        return max(ratios) if ratios else None
+        return agg["ratio_max"], has_ratio
     raise ValueError(f"Métrica desconocida: {metric}")
 
 
-def _sort_key(metric: str):
-    metric = metric.lower()
-    # cd_* -> menor es mejor; resto mayor es mejor
-    if metric in ("cd_mean", "cd_min"):
-        return lambda item: item["value"]
-    return lambda item: -item["value"]
+def _sort_key(metric: str, values: np.ndarray) -> np.ndarray:
+    # cd_* -> menor es mejor; resto mayor es mejor. Un valor NaN (CL/CD NaN en alguna fila) va al final,
+    # igual que en np.argsort
+    keys = values if metric.lower() in LOWER_IS_BETTER else -values
+    return np.where(np.isnan(keys), np.inf, keys)
+
+
+def _ranking_entries(names, counts, values, idx, metric, solver) -> List[Dict[str, float]]:
+    return [
+        {
+            "airfoil": name,
+            "metric": metric,
+            "value": value,
+            "count": count,
+            "solver": solver or "all",
+        }
+        for name, value, count in zip(names[idx].tolist(), values[idx].tolist(), counts[idx].tolist())
+    ]
+
+
+def _rank_aggregates(names, agg, metrics, solver) -> Dict[str, List[Dict[str, float]]]:
+    rankings: Dict[str, List[Dict[str, float]]] = {}
+    for metric in metrics:
+        vals, defined = _metric_values(agg, metric)
+        idx = np.flatnonzero(defined)
+        # orden estable: empates en orden de aparicion
+        idx = idx[np.lexsort((_sort_key(metric, vals[idx]), np.isnan(vals[idx])))]
+        rankings[metric] = _ranking_entries(names, agg["count"], vals, idx, metric, solver)
+    return rankings
+
+
+def rank_columns(
+    cols: Dict[str, np.ndarray],
+    metrics: Iterable[str] = ("cd_mean",),
+    solver: Optional[str] = None,
+) -> Dict[str, List[Dict[str, float]]]:
+    """Rankings ({metrica: ranking}) de columnas ya filtradas, todas las metricas en una sola agrupacion."""
+    metrics = _check_metrics(metrics)
+    names, agg = _group_aggregates(cols["airfoil"], cols["CL"], cols["CD"])
+    return _rank_aggregates(names, agg, metrics, solver)
+
+
+class StreamingRanker:
+    """Ranking incremental con memoria acotada por perfil.
+
+    Cada `update` agrega un bloque de filas a los acumulados de cada perfil (conteo, sumas, min/max), sin
+    guardar las filas: un archivo de cualquier tamano se procesa por bloques (`stream_rankings`) y un
+    barrido en curso puede alimentarlo a medida que llegan resultados (es un listener de
+    `result_export.CSVTee`). `top(k)` saca los k mejores con un heap; `rankings()` da el ranking completo.
+    Las sumas se acumulan por bloque, asi que las medias pueden diferir del calculo en memoria en el
+    ultimo bit.
+    """
+
+    def __init__(
+        self,
+        metrics: Iterable[str] = ("cd_mean",),
+        solver: Optional[str] = None,
+        aoa_min: Optional[float] = None,
+        aoa_max: Optional[float] = None,
+    ):
+        self.metrics = _check_metrics(metrics)
+        self.solver = solver
+        self.aoa_min = aoa_min
+        self.aoa_max = aoa_max
+        self.rows = 0
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._agg = {k: np.zeros(0, dtype=np.int64 if k.endswith("count") else float)
+                     for k in ("count", "cd_sum", "cd_min", "cl_sum", "ratio_count", "ratio_sum", "ratio_max")}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __call__(self, rows: Iterable[Dict]):
+        """Alias de `update` para usarlo como listener de CSVTee."""
+        self.update(rows)
+
+    def update(self, rows: Iterable[Dict]):
+        """Agrega filas (dicts con las claves del CSV combinado)."""
+        self.update_columns(ResultSet.from_rows(rows).columns)
+
+    def update_columns(self, cols: Dict[str, np.ndarray], filtered: bool = False):
+        """Agrega un bloque de columnas; `filtered=True` si ya viene filtrado por solver/alpha."""
+        if not filtered:
+            cols = _filter_columns(cols, solver=self.solver, aoa_min=self.aoa_min, aoa_max=self.aoa_max)
+        if not len(cols["airfoil"]):
+            return
+        names, agg = _group_aggregates(cols["airfoil"], cols["CL"], cols["CD"])
+        idx = np.array([self._slot(name) for name in names.tolist()], dtype=np.intp)
+        total = self._agg
+        # idx no se repite dentro de un bloque: basta con indexado directo
+        for k in ("count", "cd_sum", "cl_sum", "ratio_count", "ratio_sum"):
+            total[k][idx] += agg[k]
+        total["cd_min"][idx] = np.minimum(total["cd_min"][idx], agg["cd_min"])
+        total["ratio_max"][idx] = np.maximum(total["ratio_max"][idx], agg["ratio_max"])
+        self.rows += int(agg["count"].sum())
+
+    def _slot(self, name: str) -> int:
+        slot = self._index.get(name)
+        if slot is None:
+            slot = self._index[name] = len(self._names)
+            self._names.append(name)
+            size = len(self._agg["count"])
+            if slot >= size:
+                grow = max(16, size)
+                for k, arr in self._agg.items():
+                    fill = np.inf if k == "cd_min" else (-np.inf if k == "ratio_max" else 0)
+                    self._agg[k] = np.concatenate((arr, np.full(grow, fill, dtype=arr.dtype)))
+        return slot
+
+    def _current(self):
+        n = len(self._names)
+        return np.array(self._names, dtype=str), {k: v[:n] for k, v in self._agg.items()}
+
+    def rankings(self) -> Dict[str, List[Dict[str, float]]]:
+        """Ranking completo de cada metrica con lo acumulado hasta ahora."""
+        names, agg = self._current()
+        return _rank_aggregates(names, agg, self.metrics, self.solver)
+
+    def top(self, k: int, metric: Optional[str] = None) -> List[Dict[str, float]]:
+        """Los `k` mejores de `metric` (la primera por defecto) via heap, sin ordenar todos los perfiles."""
+        metric = metric or self.metrics[0]
+        names, agg = self._current()
+        vals, defined = _metric_values(agg, metric)
+        keys = _sort_key(metric, vals).tolist()
+        nan = np.isnan(vals).tolist()
+        idx = heapq.nsmallest(k, np.flatnonzero(defined).tolist(), key=lambda i: (nan[i], keys[i], i))
+        return _ranking_entries(names, agg["count"], vals, np.array(idx, dtype=np.intp), metric, self.solver)
+
+
+def iter_column_chunks(
+    csv_in: Path,
+    solver: Optional[str] = None,
+    aoa_min: Optional[float] = None,
+    aoa_max: Optional[float] = None,
+    columns: Optional[Iterable[str]] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Bloques de columnas ya filtradas; nunca carga el archivo entero."""
+    csv_in = Path(csv_in)
+    if not csv_in.exists():
+        raise FileNotFoundError(f"No se encontró el CSV de entrada: {csv_in}")
+    if result_export.columnar_format(csv_in):
+        yield from _iter_columnar_chunks(csv_in, columns, solver, aoa_min, aoa_max)
+        return
+    for cols in _iter_csv_chunks(csv_in, chunk_rows):
+        yield _filter_columns(cols, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
+
+
+def stream_rankings(
+    csv_in: Path,
+    metrics: Iterable[str] = METRICS,
+    solver: Optional[str] = None,
+    aoa_min: Optional[float] = None,
+    aoa_max: Optional[float] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> StreamingRanker:
+    """Recorre el archivo por bloques y devuelve el StreamingRanker con todo acumulado."""
+    ranker = StreamingRanker(metrics, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
+    for cols in iter_column_chunks(csv_in, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max,
+                                   columns=RANKING_COLUMNS, chunk_rows=chunk_rows):
+        ranker.update_columns(cols, filtered=True)
+    return ranker
+
+
+class ResultSet:
+    """Resultados en memoria como columnas NumPy, cargados una vez y compartidos por ranking y plots.
+
+    Se arma desde un archivo (`from_file`, CSV o .parquet/.arrow) o desde dicts ya en memoria (`from_rows`),
+    sin volver a disco. Las filas con campos numericos invalidos se descartan.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Path,
+        solver: Optional[str] = None,
+        aoa_min: Optional[float] = None,
+        aoa_max: Optional[float] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> "ResultSet":
+        """Carga ya filtrada; en archivos columnares solo se leen `columns` y el filtro va en la lectura."""
+        return cls(_load_columns(Path(path), solver=solver, aoa_min=aoa_min, aoa_max=aoa_max, columns=columns))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "ResultSet":
+        """Desde dicts con las claves del CSV combinado (p.ej. filas armadas por quien usa el modulo como libreria)."""
+        rows = list(rows)
+        raw = {k: [r.get(k, 0.0) for r in rows] for k in NUM_FIELDS}
+        raw.update({k: [r.get(k, "") for r in rows] for k in ("solver", "airfoil")})
+        return cls(_columns_from_raw(raw, len(rows)))
+
+    def __len__(self) -> int:
+        return len(self.columns["airfoil"])
+
+    def filter(
+        self,
+        solver: Optional[str] = None,
+        aoa_min: Optional[float] = None,
+        aoa_max: Optional[float] = None,
+    ) -> "ResultSet":
+        return ResultSet(_filter_columns(self.columns, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max))
+
+    def rankings(self, metrics: Iterable[str] = METRICS, solver: Optional[str] = None):
+        """{metrica: ranking}; `solver` solo etiqueta las filas (filtrar con `filter`)."""
+        return rank_columns(self.columns, metrics, solver=solver)
+
+
+def compute_rankings(
+    csv_in: Path,
+    metrics: Iterable[str] = METRICS,
+    solver: Optional[str] = None,
+    aoa_min: Optional[float] = None,
+    aoa_max: Optional[float] = None,
+) -> Dict[str, List[Dict[str, float]]]:
+    """Lee y filtra el CSV una vez y devuelve {metrica: ranking} para todas las `metrics`."""
+    metrics = _check_metrics(metrics)
+    data = ResultSet.from_file(csv_in, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max, columns=RANKING_COLUMNS)
+    return data.rankings(metrics, solver=solver)
 
 
 def compute_ranking(
@@ -122,24 +483,27 @@ def compute_ranking(
     aoa_min: Optional[float] = None,
     aoa_max: Optional[float] = None,
 ) -> List[Dict[str, float]]:
-    rows = _filter_rows(_read_rows(csv_in), solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
-    groups = _group_by_airfoil(rows)
-    ranking: List[Dict[str, float]] = []
-    for airfoil, rws in groups.items():
-        value = _metric_value(rws, metric)
-        if value is None:
-            continue
-        ranking.append(
-            {
-                "airfoil": airfoil,
-                "metric": metric,
-                "value": value,
-                "count": len(rws),
-                "solver": solver or "all",
-            }
-        )
-    ranking.sort(key=_sort_key(metric))
-    return ranking
+    return compute_rankings(csv_in, [metric], solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)[metric]
+
+
+def select_candidates(
+    ranking: List[Dict[str, float]],
+    top_k: Optional[int] = None,
+    tol: Optional[float] = None,
+) -> List[Dict[str, float]]:
+    """Filtra un ranking (ya ordenado, mejor primero) para el embudo surrogate -> CFD.
+
+    - tol: se quedan los perfiles cuyo valor esta a menos de `tol` (relativo) del mejor.
+    - top_k: como maximo los `top_k` primeros.
+    Con ambos se aplican los dos (lo mas restrictivo); sin ninguno se devuelve el ranking completo.
+    """
+    selected = list(ranking)
+    if tol is not None and selected:
+        best = selected[0]["value"]
+        selected = [r for r in selected if abs(r["value"] - best) <= tol * abs(best)]
+    if top_k is not None:
+        selected = selected[: max(0, int(top_k))]
+    return selected
 
 
 def _plot_ranking(ranking: List[Dict[str, float]], metric: str, plot_dir: Path, top_n: int = 10):
@@ -147,7 +511,7 @@ def _plot_ranking(ranking: List[Dict[str, float]], metric: str, plot_dir: Path,
         print("[WARN] matplotlib no está instalado; no se generan gráficos.")
         return
     plot_dir.mkdir(parents=True, exist_ok=True)
-    trimmed = ranking[:top_n]
+    trimmed = ranking[:top_n]  # ranking puede traer ya solo el top (StreamingRanker.top)
     if not trimmed:
         print("[WARN] No hay datos para graficar.")
         return
@@ -171,17 +535,16 @@ def _plot_ranking(ranking: List[Dict[str, float]], metric: str, plot_dir: Path,
     print(f"[PLOT] Ranking guardado en {out_path}")
 
 
-def _plot_polar(rows: Iterable[Row], plot_dir: Path):
+def _plot_polar(cols: Dict[str, np.ndarray], plot_dir: Path):
     if plt is None:
         return
-    rows = list(rows)
-    if not rows:
+    if not len(cols["solver"]):
         return
     plot_dir.mkdir(parents=True, exist_ok=True)
     fig, ax = plt.subplots(figsize=(8, 6))
-    for solver in sorted({r.solver for r in rows}):
-        solver_rows = [r for r in rows if r.solver == solver]
-        ax.scatter([r.CD for r in solver_rows], [r.CL for r in solver_rows], label=solver, s=30, alpha=0.8)
+    for solver in np.unique(cols["solver"]).tolist():
+        mask = cols["solver"] == solver
+        ax.scatter(cols["CD"][mask], cols["CL"][mask], label=solver, s=30, alpha=0.8)
     ax.set_xlabel("CD")
     ax.set_ylabel("CL")
     ax.grid(True, linestyle="--", alpha=0.3)
@@ -204,7 +567,7 @@ def save_csv(ranking: List[Dict[str, float]], csv_out: Path):
 
 
 def run_comparison(
-    csv_in: Path,
+    csv_in: Optional[Path],
     csv_out: Path,
     metric: str = "cd_mean",
     solver: Optional[str] = None,
@@ -213,22 +576,61 @@ def run_comparison(
     plot: bool = False,
     plot_dir: Optional[Path] = None,
     top_n: int = 10,
-) -> List[Dict[str, float]]:
-    ranking = compute_ranking(csv_in, metric=metric, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
-    save_csv(ranking, csv_out)
+    data: Optional[ResultSet] = None,
+    stream: bool = False,
+    ranker: Optional[StreamingRanker] = None,
+    chunk_rows: int = CHUNK_ROWS,
+):
+    """Ranking(s) a CSV y plots opcionales.
+
+    La entrada se lee una sola vez (solo las columnas que usan ranking y polar) y la comparten todos los
+    consumidores; con `data` (un `ResultSet` ya en memoria) no se lee `csv_in`.
+    Con `stream=True` la entrada se recorre por bloques con un `StreamingRanker` (memoria acotada por
+    perfil) y con `ranker` se usa uno ya alimentado (p.ej. durante el barrido); en ambos casos no hay filas
+    en memoria y no se grafica la polar.
+
+    `metric` admite varias metricas separadas por coma ("cd_mean,clcd_max"): se calculan en una sola
+    pasada, van todas al mismo CSV (columna `metric`) y se grafica una barra por metrica. Con una metrica
+    devuelve su ranking; con varias, {metrica: ranking}.
+    """
+    metrics = _check_metrics([m.strip() for m in metric.split(",") if m.strip()] if isinstance(metric, str)
+                             else metric)
+    if ranker is not None or stream:
+        if ranker is None:
+            ranker = stream_rankings(csv_in, metrics, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max,
+                                     chunk_rows=chunk_rows)
+        missing = [m for m in metrics if m not in ranker.metrics]
+        if missing:
+            raise ValueError(f"El ranking en streaming no acumula las métricas: {', '.join(missing)}")
+        accumulated = ranker.rankings()
+        rankings = {m: accumulated[m] for m in metrics}
+        save_csv([r for m in metrics for r in rankings[m]], csv_out)
+        if plot:
+            plot_target = plot_dir or csv_out.parent
+            for m in metrics:
+                _plot_ranking(ranker.top(top_n, m), m, plot_target, top_n=top_n)
+            print("[WARN] La polar CL-CD necesita todas las filas; no se genera en modo streaming.")
+        return rankings[metrics[0]] if len(metrics) == 1 else rankings
+    if data is None:
+        columns = RANKING_COLUMNS + tuple(c for c in POLAR_COLUMNS if plot and c not in RANKING_COLUMNS)
+        data = ResultSet.from_file(csv_in, solver=solver, aoa_min=aoa_min, aoa_max=aoa_max, columns=columns)
+    else:
+        data = data.filter(solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
+    rankings = data.rankings(metrics, solver=solver)
+    save_csv([r for m in metrics for r in rankings[m]], csv_out)
     if plot:
         plot_target = plot_dir or csv_out.parent
-        _plot_ranking(ranking, metric, plot_target, top_n=top_n)
-        rows = _filter_rows(_read_rows(csv_in), solver=solver, aoa_min=aoa_min, aoa_max=aoa_max)
-        _plot_polar(rows, plot_target)
-    return ranking
+        for m in metrics:
+            _plot_ranking(rankings[m], m, plot_target, top_n=top_n)
+        _plot_polar(data.columns, plot_target)
+    return rankings[metrics[0]] if len(metrics) == 1 else rankings
 
 
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Ranking y plots de perfiles a partir de un CSV combinado.")
-    parser.add_argument("--input", type=Path, required=True, help="CSV de entrada (combined_results.csv)")
+    parser.add_argument("--input", type=Path, required=True, help="CSV de entrada (combined_results.csv) o .parquet/.arrow")
     parser.add_argument("--metric", type=str, default="cd_mean",
-                        help="cd_mean, cd_min, cl_mean, clcd_mean, clcd_max")
+                        help="cd_mean, cd_min, cl_mean, clcd_mean, clcd_max (varias separadas por coma)")
     parser.add_argument("--solver", type=str, default=None, help="Filtrar solver (su2-incomp, aerosandbox-neuralfoil...)")
     parser.add_argument("--aoa-min", type=float, default=None, help="Ángulo mínimo")
     parser.add_argument("--aoa-max", type=float, default=None, help="Ángulo máximo")
@@ -236,6 +638,9 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--plot", action="store_true", help="Generar gráficos")
     parser.add_argument("--plot-dir", type=Path, default=None, help="Directorio para los PNG")
     parser.add_argument("--top-n", type=int, default=10, help="Top-N para el ranking de barras")
+    parser.add_argument("--stream", action="store_true",
+                        help="Ranking por bloques con memoria acotada por perfil (sin polar)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Filas por bloque con --stream")
     return parser
 
 
@@ -252,6 +657,8 @@ def main():
         plot=args.plot,
         plot_dir=args.plot_dir,
         top_n=args.top_n,
+        stream=args.stream,
+        chunk_rows=args.chunk_rows,
     )
 
 
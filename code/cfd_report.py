@@ -12,18 +12,32 @@ Salidas en: report_plots/
 
 Ejecuta:
     python cfd_report.py
-Requisitos: pandas, numpy, matplotlib, openpyxl.
+    python cfd_report.py --save-parquet dataset.parquet   # convierte la hoja una vez
+    python cfd_report.py --input dataset.parquet          # lee solo las columnas/filas usadas
+Requisitos: pandas, numpy, matplotlib, openpyxl (pyarrow para .parquet/.arrow).
 """
 
+import argparse
 from pathlib import Path
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+import result_export
+
+try:  # pyarrow es opcional: solo para datasets .parquet/.arrow
+    import pyarrow.dataset as pads
+except ImportError:
+    pads = None
+
 EXCEL_PATH = Path("airfoil_rankings.xlsx")
 SHEET_NAME = "DATASET"  # nombre de la hoja en el Excel
 HEADER_ROW = 17  # fila con headers reales en el Excel (0-index)
 OUT_DIR = Path("report_plots")
+# columnas (ya renombradas) que usa el reporte y las que no pueden faltar en una fila
+REPORT_COLUMNS = ["perfil", "mach", "AoA", "Cl_true", "Cd_true", "Cm", "rho", "Re", "altitud", "L", "D",
+                  "P_sim", "T_sim"]
+REQUIRED_COLUMNS = ["perfil", "mach", "AoA", "Cl_true", "Cd_true", "altitud"]
 
 # Parametros aero
 GAMMA = 1.4
@@ -54,6 +68,41 @@ def _clean_columns(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def load_data(path: Path) -> pd.DataFrame:
+    path = Path(path)
+    if result_export.columnar_format(path):
+        return _prepare(_read_columnar(path))
+    return _prepare(_read_excel(path))
+
+
+def _read_columnar(path: Path) -> pd.DataFrame:
+    """Dataset guardado con `save_columnar`: solo REPORT_COLUMNS y sin filas con nulos en REQUIRED_COLUMNS,
+    ambos resueltos por pyarrow en la lectura."""
+    if pads is None:
+        raise ImportError(f"pyarrow no está instalado; no se puede leer {path} (pip install pyarrow)")
+    dataset = pads.dataset(str(path), format=result_export.columnar_format(path))
+    names = dataset.schema.names
+    expr = None
+    for c in REQUIRED_COLUMNS:
+        if c in names:
+            cond = pads.field(c).is_valid()
+            expr = cond if expr is None else expr & cond
+    table = dataset.to_table(columns=[c for c in REPORT_COLUMNS if c in names], filter=expr)
+    return table.to_pandas()
+
+
+def save_columnar(df: pd.DataFrame, path: Path) -> Path:
+    """Guarda el dataset ya limpio (p.ej. el de la hoja Excel) en .parquet/.arrow para no re-parsear el Excel."""
+    path = Path(path)
+    df = df[[c for c in REPORT_COLUMNS if c in df.columns]].astype({"perfil": str}).reset_index(drop=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if result_export.columnar_format(path) == "ipc":
+        df.to_feather(path)
+    else:
+        df.to_parquet(path, index=False)
+    return path
+
+
+def _read_excel(path: Path) -> pd.DataFrame:
     df = pd.read_excel(path, sheet_name=SHEET_NAME, header=HEADER_ROW)
     df = _clean_columns(df)
     # columnas clave que pueden traer espacios
@@ -66,7 +115,10 @@ def load_data(path: Path) -> pd.DataFrame:
         "densidad ": "rho",
         "viscosidad": "mu",
     }
-    df = df.rename(columns=rename)
+    return df.rename(columns=rename)
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
     # filtrar filas con perfil no nulo
     df = df[df["perfil"].notna()]
     # numericos
@@ -268,13 +320,20 @@ def plot_drag_vs_alt(df: pd.DataFrame):
     return path
 
 
-def main():
-    if not EXCEL_PATH.exists():
-        raise FileNotFoundError(f"No se encontró {EXCEL_PATH}")
-    df = load_data(EXCEL_PATH)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reporte CFD a partir del dataset (Excel o .parquet/.arrow)")
+    parser.add_argument("--input", type=Path, default=EXCEL_PATH, help="Excel con la hoja DATASET o .parquet/.arrow")
+    parser.add_argument("--save-parquet", type=Path, default=None,
+                        help="Guarda el dataset limpio en .parquet/.arrow para las siguientes corridas")
+    args = parser.parse_args(argv)
+    if not args.input.exists():
+        raise FileNotFoundError(f"No se encontró {args.input}")
+    df = load_data(args.input)
     if df.empty:
         print("Dataset vacío.")
         return
+    if args.save_parquet:
+        print(f"[DATASET] Guardado en {save_columnar(df, args.save_parquet)}")
 
     # Guardar polinomio Cl(AoA)
     poly = build_cl_poly(df, deg=3)
@@ -0,0 +1,52 @@
+"""
+Escritura rapida de archivos .dat de perfiles.
+Todo el array de coordenadas se formatea con una sola operacion % sobre una plantilla repetida
+(en C, sin un f-string por punto) y el archivo se escribe con un unico write.
+Con skip_unchanged=True no se reescribe un .dat cuyo contenido ya es identico: regenerar una familia
+sin cambios casi no cuesta y el mtime de los archivos no se mueve.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+# Formato de linea de los generadores (profile_generators) y de Airfoil.save_dat
+PROFILE_LINE = " %.6f  %.6f\n"
+AIRFOIL_LINE = "%.6f %.6f\n"
+
+
+def format_dat(name, x, y, line_fmt=PROFILE_LINE):
+    """Texto completo del .dat: cabecera con el nombre y una linea por punto."""
+    xy = np.column_stack((np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+    return f"{name}\n" + (line_fmt * len(xy)) % tuple(xy.ravel().tolist())
+
+
+def _unchanged(path, text):
+    """True si el archivo ya existe con exactamente este contenido."""
+    try:
+        with open(path, "r") as f:
+            return f.read() == text
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def write_dat(path, name, x, y, line_fmt=PROFILE_LINE, skip_unchanged=False):
+    """Escribe un .dat en un solo write. Devuelve False si se omitio por no haber cambios."""
+    text = format_dat(name, x, y, line_fmt)
+    if skip_unchanged and _unchanged(path, text):
+        return False
+    with open(path, "w") as f:
+        f.write(text)
+    return True
+
+
+def write_dat_files(entries, line_fmt=PROFILE_LINE, skip_unchanged=False):
+    """Escribe los .dat de `entries` [(ruta, nombre, x, y)] o [(ruta, nombre, x, y, formato)].
+
+    `line_fmt` es el formato de las entradas que no traen el suyo. Devuelve cuantos se escribieron.
+    """
+    written = 0
+    for path, name, x, y, *fmt in entries:
+        written += write_dat(Path(path), name, x, y, line_fmt=fmt[0] if fmt else line_fmt,
+                             skip_unchanged=skip_unchanged)
+    return written
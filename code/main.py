@@ -3,34 +3,21 @@ import itertools
 import json
 import os
 from pathlib import Path
-import csv
 
 from Airfoil_Generator import Airfoil
 import pipeline
+import scheduler
+import result_cache
+import surrogate
 import su2_runner
 import airfoil_comparison
+import dat_writer
 import profile_generators
+import profile_store
+import result_export
 
-try:
-    import aerosandbox as asb
-    import aerosandbox.numpy as np
-except ImportError:
-    asb = None
-    np = None
-
-
-def _to_scalar(val):
-    """Best-effort conversion of aerosandbox outputs (could be numpy arrays) to float."""
-    try:
-        if np is not None:
-            # Flatten in case we get a 1-element array
-            return float(np.asarray(val).reshape(-1)[0])
-        return float(val)
-    except Exception:
-        try:
-            return float(val.item())
-        except Exception as e:
-            raise TypeError(f"No se pudo convertir {val!r} a float") from e
+# Candidatos que pasan a SU2 en modo --funnel si no se indica --funnel-top-k ni --funnel-tol
+FUNNEL_TOP_K = 10
 
 
 def _parse_num_list(raw: str, default):
@@ -44,69 +31,109 @@ def _parse_num_list(raw: str, default):
         return default
 
 
-def generate_airfoils(t_list, c_list, normalize=True, output_folder="generated_profiles"):
+def _airfoil_key(t_rel, c, normalize):
+    thickness_str = f"{int(t_rel * 100):02d}"
+    return f"NACA00{thickness_str}_c{c:.1f}m" + ("_nd" if normalize else "")
+
+
+def generate_airfoils(t_list, c_list, normalize=True, output_folder="generated_profiles", skip_unchanged=False):
     os.makedirs(output_folder, exist_ok=True)
     airfoil_dict = {}
     for t_rel in t_list:
         for c in c_list:
             foil = Airfoil.naca00xx(t_rel=t_rel, c=c, normalize=normalize)
-            thickness_str = f"{int(t_rel * 100):02d}"
-            key = f"NACA00{thickness_str}_c{c:.1f}m" + ("_nd" if normalize else "")
+            key = _airfoil_key(t_rel, c, normalize)
             filename = f"{key}.dat"
             filepath = os.path.join(output_folder, filename)
-            foil.save_dat(filepath, non_dim=normalize)
+            foil.save_dat(filepath, non_dim=normalize, skip_unchanged=skip_unchanged)
             airfoil_dict[key] = {"foil": foil, "dat": filepath}
             print(f"[OK] Generado: {filepath}")
     return airfoil_dict
 
 
+def iter_airfoils(t_list, c_list, normalize=True):
+    """Version perezosa de `generate_airfoils`: NACA 00xx en memoria, sin escribir el .dat."""
+    for t_rel in t_list:
+        for c in c_list:
+            foil = Airfoil.naca00xx(t_rel=t_rel, c=c, normalize=normalize)
+            # misma cabecera y formato de linea que foil.save_dat
+            yield profile_generators.ProfileShape(name=_airfoil_key(t_rel, c, normalize), x=foil.x_nd, y=foil.y_nd,
+                                                  family="naca", header=foil.name,
+                                                  line_fmt=dat_writer.AIRFOIL_LINE)
+
+
 def analyze_su2(airfoil_dict, aoa=0.0, mach=0.15, Re=1e6, max_iter=None, aoa_list=None, mach_list=None,
-                Re_list=None, retries=0, strict=False, add_ts=False, cfl=None, incompressible=True, mesh_file=None):
-    results = []
+                Re_list=None, retries=0, strict=False, add_ts=False, cfl=None, incompressible=True, mesh_file=None,
+                jobs=1, mpi_ranks=1, cores=None, early_stop_tol=None, early_stop_window=100, warm_start=False,
+                on_result=None):
     aoa_list = aoa_list or [aoa]
     mach_list = mach_list or [mach]
     Re_list = Re_list or [Re]
+    n_cases = len(airfoil_dict) * len(aoa_list) * len(mach_list) * len(Re_list)
+    jobs, mpi_ranks = scheduler.plan_resources(n_cases, jobs=jobs, mpi_ranks=mpi_ranks, cores=cores)
+    if mpi_ranks > 1 or jobs > 1:
+        print(f"[SCHED] {jobs} casos simultáneos x {mpi_ranks} procesos MPI por caso")
+    cases = []
     for key, info in airfoil_dict.items():
         dat_path = info["dat"]
         for a, m, r in itertools.product(aoa_list, mach_list, Re_list):
             case_name = pipeline.generate_case_name(key, a, m, r, add_ts=add_ts)
             print(f"\n[SU2] {case_name} -> {dat_path}")
-            res = pipeline.run_case(dat_path, case_name, aoa=a, mach=m, Re=r, max_iter=max_iter,
-                                    retries=retries, strict=strict, cfl=cfl, incompressible=incompressible,
-                                    mesh_override=mesh_file)
-            results.append(res)
-    return results
+            cases.append(dict(dat_file=dat_path, case_name=case_name, aoa=a, mach=m, Re=r, max_iter=max_iter,
+                              retries=retries, strict=strict, cfl=cfl, incompressible=incompressible,
+                              mesh_override=mesh_file, mpi_ranks=mpi_ranks,
+                              early_stop_tol=early_stop_tol, early_stop_window=early_stop_window))
+    return scheduler.run_cases(cases, jobs=jobs, warm_start=warm_start, on_result=on_result)
 
 
 def analyze_aerosandbox(dat_path, alpha_list, Re, mach):
-    if asb is None:
-        raise RuntimeError("Aerosandbox no está instalado. Instala con 'pip install aerosandbox'.")
-    # Carga .dat (salta cabecera si la hay)
-    try:
-        coords = np.loadtxt(dat_path)
-    except Exception:
-        coords = np.loadtxt(dat_path, skiprows=1)
-    airfoil = asb.Airfoil(name=Path(dat_path).stem, coordinates=coords)
-    fn = getattr(airfoil, "get_aero_from_neuralfoil", None)
-    if fn is None:
-        raise AttributeError("Esta versión de aerosandbox no tiene get_aero_from_neuralfoil.")
-    rows = []
-    airfoil_name = Path(dat_path).stem
-    for alpha in alpha_list:
-        aero = fn(alpha=alpha, Re=Re, mach=mach, n_crit=9.0, include_360_deg_effects=True)
-        rows.append({
-            "solver": "aerosandbox-neuralfoil",
-            "airfoil": airfoil_name,
-            "mach": mach,
-            "Re": Re,
-            "alpha": alpha,
-            "CL": _to_scalar(aero["CL"]),
-            "CD": _to_scalar(aero["CD"]),
-            "CM": _to_scalar(aero.get("CM", aero.get("CMm", 0.0)))
-        })
-        print(f"[AeroSB] {Path(dat_path).name} AoA={alpha}° -> CL={rows[-1]['CL']:.5f} "
-              f"CD={rows[-1]['CD']:.6f} CM={rows[-1]['CM']:.5f}")
-    return rows
+    """NeuralFoil para un Re y un Mach (todas las alphas en una llamada)."""
+    return surrogate.evaluate_airfoil(dat_path, alpha_list, [Re], [mach], verbose=True)
+
+
+def analyze_aerosandbox_grid(dat_path, alpha_list, Re_list, mach_list):
+    """NeuralFoil sobre la grilla alpha x Re x Mach completa del perfil en una sola llamada batch."""
+    return surrogate.evaluate_airfoil(dat_path, alpha_list, Re_list, mach_list, verbose=True)
+
+
+def _funnel_metric(args):
+    return args.comparison_metric.split(",")[0].strip()
+
+
+def _funnel_ranker(args):
+    """Acumulados por perfil del cribado NeuralFoil (solo lo que necesita el embudo, no las filas)."""
+    return airfoil_comparison.StreamingRanker([_funnel_metric(args)], solver=surrogate.SOLVER_NAME,
+                                              aoa_min=args.comparison_aoa_min, aoa_max=args.comparison_aoa_max)
+
+
+def funnel_profiles(profiles, args, ranker=None):
+    """Embudo surrogate -> CFD: rankea el cribado NeuralFoil y deja solo los candidatos para SU2.
+
+    Con `ranker` (un `_funnel_ranker` alimentado durante el cribado) no se relee el CSV de cribado.
+    """
+    metric = _funnel_metric(args)
+    if ranker is None:
+        ranking = airfoil_comparison.compute_ranking(
+            Path(args.surrogate_csv),
+            metric=metric,
+            solver=surrogate.SOLVER_NAME,
+            aoa_min=args.comparison_aoa_min,
+            aoa_max=args.comparison_aoa_max,
+        )
+    else:
+        ranking = ranker.rankings()[metric]
+    # el CSV de cribado puede conservar perfiles de corridas previas (--surrogate-resume)
+    by_stem = {profile_store.profile_name(info["dat"]): key for key, info in profiles.items()}
+    ranking = [r for r in ranking if r["airfoil"] in by_stem]
+    top_k = args.funnel_top_k
+    if top_k is None and args.funnel_tol is None:
+        top_k = FUNNEL_TOP_K
+    selected = airfoil_comparison.select_candidates(ranking, top_k=top_k, tol=args.funnel_tol)
+    print(f"[FUNNEL] {len(selected)}/{len(profiles)} perfiles pasan a SU2 ({metric}):")
+    for r in selected:
+        print(f"         {r['airfoil']}: {r['value']:.6g}")
+    keys = {by_stem[r["airfoil"]] for r in selected}
+    return {key: info for key, info in profiles.items() if key in keys}
 
 
 def extract_su2_row(case_name, incompressible=True):
@@ -132,17 +159,8 @@ def extract_su2_row(case_name, incompressible=True):
 
 
 def export_csv(rows, out_path="results/combined_results.csv"):
-    if not rows:
-        print("[CSV] No hay datos para exportar.")
-        return
-    os.makedirs(Path(out_path).parent, exist_ok=True)
-    fieldnames = ["solver", "airfoil", "alpha", "Re", "mach", "CL", "CD", "CM"]
-    with open(out_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows:
-            writer.writerow({k: r.get(k, "") for k in fieldnames})
-    print(f"[CSV] Exportado a {out_path}")
+    with result_export.CSVTee([out_path]) as out:
+        out.write(rows)
 
 
 def validate_exports(results_list: list, incompressible=True):
@@ -211,6 +229,11 @@ def build_arg_parser():
                         help="Tipos de perfiles: naca,naca_antenna,rotodomo,bezier o all (separados por coma)")
     parser.add_argument("--profiles-output", type=str, default="generated_profiles",
                         help="Carpeta donde guardar los .dat e imágenes de perfiles")
+    parser.add_argument("--profile-store", action="store_true",
+                        help="Empaqueta los perfiles en un único profiles.npy (memory-mapped) en lugar de un .dat "
+                             "por perfil")
+    parser.add_argument("--skip-unchanged-profiles", action="store_true",
+                        help="No reescribe los .dat cuyo contenido no cambió (regenerar una familia casi no cuesta)")
     parser.add_argument("--save-profile-plots", action="store_true",
                         help="Guardar PNG de los perfiles si matplotlib está disponible")
     parser.add_argument("--antenna-length", type=float, default=4.5, help="Longitud de la antena (m)")
@@ -226,6 +249,8 @@ def build_arg_parser():
     parser.add_argument("--rotodomo-c-step", type=float, default=0.1, help="Paso de cuerda para rotodomo")
     parser.add_argument("--rotodomo-t-min", type=float, default=0.05, help="Espesor mínimo (relativo) para rotodomo")
     parser.add_argument("--rotodomo-t-max", type=float, default=0.45, help="Espesor máximo (relativo) para rotodomo")
+    parser.add_argument("--rotodomo-continuous", action="store_true",
+                        help="Rotodomo con el espesor mínimo exacto (forma cerrada) en lugar de pasos de 0.01")
     parser.add_argument("--bezier-c-start", type=float, default=6.0, help="Cuerda inicial para perfil Bézier simétrico")
     parser.add_argument("--bezier-c-end", type=float, default=10.0, help="Cuerda final para perfil Bézier simétrico")
     parser.add_argument("--bezier-c-step", type=float, default=0.5, help="Paso de cuerda para perfil Bézier")
@@ -238,16 +263,58 @@ def build_arg_parser():
     parser.add_argument("--cfl", type=float, default=None, help="CFL for SU2")
     parser.add_argument("--compressible", action="store_true", help="Run SU2 compresible (inv+visc). Default incompressible viscous only.")
     parser.add_argument("--mesh-file", type=str, default=None, help="Use an existing SU2 mesh instead of generating with Gmsh")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Casos SU2 simultáneos (pool de procesos, default 1; 0 = auto según núcleos)")
+    parser.add_argument("--mpi-ranks", type=int, default=1,
+                        help="Procesos MPI por caso SU2 (mpirun -n K, default 1; 0 = auto según núcleos y --jobs)")
+    parser.add_argument("--cores", type=int, default=None,
+                        help="Núcleos a repartir entre --jobs y --mpi-ranks (default: todos los de la máquina)")
+    parser.add_argument("--early-stop-tol", type=float, default=None,
+                        help="Corta SU2 cuando CL y CD varían menos que esta tolerancia relativa (p.ej. 1e-5); "
+                             "la salida de SU2 se lee en streaming")
+    parser.add_argument("--early-stop-window", type=int, default=100,
+                        help="Iteraciones consecutivas en las que CL/CD deben mantenerse estables (default 100)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Continuación: cada punto del barrido arranca desde el restart del punto vecino "
+                             "ya resuelto con la misma malla")
+    parser.add_argument("--mesh-cache-max-mb", type=float, default=None,
+                        help="Tamaño máximo del cache de mallas meshes/_cache en MB (default 2048; 0 = sin cache)")
+    parser.add_argument("--no-result-cache", action="store_true",
+                        help="Vuelve a resolver todos los casos aunque ya estén convergidos en results/_cache")
+    parser.add_argument("--su2-backend", type=str, default=None, choices=["auto", "wsl", "native"],
+                        help="Cómo lanzar SU2_CFD: wsl (Windows), native (Linux) o auto (default)")
+    parser.add_argument("--refresh-su2-cache", action="store_true",
+                        help="Invalida el cache de la ruta de SU2_CFD y vuelve a sondear WSL")
     parser.add_argument("--skip-su2", action="store_true", help="Skip SU2 analysis")
+    parser.add_argument("--stream-profiles", action="store_true",
+                        help="Genera los perfiles en memoria de a uno y los pasa a NeuralFoil/SU2 sin escribir "
+                             "antes todos los .dat (el .dat se escribe solo para SU2)")
+    parser.add_argument("--surrogate-jobs", type=int, default=1,
+                        help="Procesos para el cribado NeuralFoil de muchos perfiles (default 1; 0 = todos los núcleos)")
+    parser.add_argument("--surrogate-chunk", type=int, default=32,
+                        help="Perfiles por tarea del pool de cribado (default 32)")
+    parser.add_argument("--surrogate-csv", type=str, default=surrogate.SCREENING_CSV,
+                        help="CSV incremental del cribado NeuralFoil (default results/surrogate_screening.csv)")
+    parser.add_argument("--surrogate-resume", action="store_true",
+                        help="Retoma un cribado interrumpido: no re-evalúa perfiles completos en --surrogate-csv")
+    parser.add_argument("--funnel", action="store_true",
+                        help="Embudo: NeuralFoil para todos los perfiles, ranking (--comparison-metric) y SU2 solo "
+                             "para los mejores")
+    parser.add_argument("--funnel-top-k", type=int, default=None,
+                        help="Perfiles del ranking NeuralFoil que pasan a SU2 (default 10 si no se da --funnel-tol)")
+    parser.add_argument("--funnel-tol", type=float, default=None,
+                        help="Pasan a SU2 los perfiles a menos de esta fracción del mejor valor (p.ej. 0.05)")
     parser.add_argument("--skip-aerosb", action="store_true", help="Skip Aerosandbox analysis")
     parser.add_argument("--export-csv", type=str, default="results/combined_results.csv",
-                        help="Ruta del CSV combinado (AeroSandbox/NeuralFoil y SU2)")
+                        help="Ruta del CSV combinado (AeroSandbox/NeuralFoil y SU2); "
+                             "con extension .parquet/.arrow se escribe en formato columnar (requiere pyarrow)")
     parser.add_argument("--comparison-csv", type=str, default="results/simulations_clcdcm.csv",
-                        help="Ruta adicional para exportar CL/CD/CM de NeuralFoil y SU2")
+                        help="Ruta adicional para exportar CL/CD/CM de NeuralFoil y SU2 (.csv, .parquet o .arrow)")
     parser.add_argument("--run-comparison", action="store_true",
                         help="Ejecuta ranking de perfiles tras generar el CSV")
     parser.add_argument("--comparison-metric", type=str, default="cd_mean",
-                        help="Métrica de ranking: cd_mean, cd_min, cl_mean, clcd_mean, clcd_max")
+                        help="Métrica de ranking: cd_mean, cd_min, cl_mean, clcd_mean, clcd_max "
+                             "(varias separadas por coma; el embudo usa la primera)")
     parser.add_argument("--comparison-solver", type=str, default=None,
                         help="Filtrar por solver en el ranking (e.g. su2-incomp)")
     parser.add_argument("--comparison-aoa-min", type=float, default=None, help="Ángulo mínimo para ranking")
@@ -257,103 +324,272 @@ def build_arg_parser():
     parser.add_argument("--plot-comparison", action="store_true", help="Generar PNG de ranking y polar")
     parser.add_argument("--plot-dir", type=str, default=None, help="Carpeta donde guardar las gráficas")
     parser.add_argument("--plot-top-n", type=int, default=10, help="Top-N para la barra de ranking")
+    parser.add_argument("--comparison-stream", action="store_true",
+                        help="Ranking incremental con memoria acotada por perfil, actualizado a medida que "
+                             "llegan resultados (sin polar)")
     return parser
 
 
-def run_pipeline(args):
-
+def _profile_options(args):
+    """(tipos de perfil, espesores NACA, cuerdas NACA, sharpness Bezier) pedidos en la linea de comandos."""
     t_list = _parse_num_list(args.t_list, [0.06])
     c_list = _parse_num_list(args.c_list, [1.0])
     bezier_sharpness = _parse_num_list(args.bezier_sharpness, [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7])
     profile_types = [p.strip().lower() for p in (args.profile_types or "naca").split(",") if p.strip()]
     if "all" in profile_types:
         profile_types = ["naca", "naca_antenna", "rotodomo", "bezier"]
-
+    return profile_types, t_list, c_list, bezier_sharpness
+
+
+def _generator_kwargs(args, profile_type, bezier_sharpness):
+    """Argumentos comunes de `profile_generators` (version eager o iterador) para un tipo de perfil."""
+    common = dict(antenna_length=args.antenna_length, antenna_height=args.antenna_height)
+    if profile_type == "naca_antenna":
+        return dict(common, chord_start=args.naca_ant_c_start, chord_end=args.naca_ant_c_end,
+                    chord_step=args.naca_ant_c_step, thickness_min=args.naca_ant_t_min,
+                    thickness_max=args.naca_ant_t_max, positions_count=args.naca_ant_pos_count)
+    if profile_type == "rotodomo":
+        return dict(common, chord_start=args.rotodomo_c_start, chord_end=args.rotodomo_c_end,
+                    chord_step=args.rotodomo_c_step, thickness_min=args.rotodomo_t_min,
+                    thickness_max=args.rotodomo_t_max, continuous=args.rotodomo_continuous)
+    return dict(common, chord_start=args.bezier_c_start, chord_end=args.bezier_c_end,
+                chord_step=args.bezier_c_step, thickness_min=args.bezier_t_min, thickness_max=args.bezier_t_max,
+                sharpness_list=bezier_sharpness)
+
+
+def generate_profiles(args):
+    """Genera todos los perfiles pedidos y escribe sus .dat. Devuelve {nombre: {"dat": ruta, ...}}.
+
+    Con --profile-store los perfiles se empaquetan en un unico .npy y "dat" es la referencia al almacen.
+    """
+    if args.profile_store:
+        if args.save_profile_plots:
+            print("[WARN] --profile-store no guarda imágenes de perfiles")
+        return profile_store.write_store(iter_profiles(args), Path(args.profiles_output) / profile_store.STORE_NAME)
+    profile_types, t_list, c_list, bezier_sharpness = _profile_options(args)
     profiles = {}
     if "naca" in profile_types:
         profiles.update(generate_airfoils(t_list, c_list, normalize=args.normalize_profiles,
-                                          output_folder=args.profiles_output))
-    if "naca_antenna" in profile_types:
-        profiles.update(profile_generators.generate_naca_antenna_profiles(
-            chord_start=args.naca_ant_c_start,
-            chord_end=args.naca_ant_c_end,
-            chord_step=args.naca_ant_c_step,
-            thickness_min=args.naca_ant_t_min,
-            thickness_max=args.naca_ant_t_max,
-            positions_count=args.naca_ant_pos_count,
-            antenna_length=args.antenna_length,
-            antenna_height=args.antenna_height,
-            output_dir=args.profiles_output,
-            save_plots=args.save_profile_plots,
-        ))
-    if "rotodomo" in profile_types:
-        profiles.update(profile_generators.generate_rotodomo_profiles(
-            chord_start=args.rotodomo_c_start,
-            chord_end=args.rotodomo_c_end,
-            chord_step=args.rotodomo_c_step,
-            thickness_min=args.rotodomo_t_min,
-            thickness_max=args.rotodomo_t_max,
-            antenna_length=args.antenna_length,
-            antenna_height=args.antenna_height,
-            output_dir=args.profiles_output,
-            save_plots=args.save_profile_plots,
-        ))
-    if "bezier" in profile_types:
-        profiles.update(profile_generators.generate_bezier_profiles(
-            chord_start=args.bezier_c_start,
-            chord_end=args.bezier_c_end,
-            chord_step=args.bezier_c_step,
-            thickness_min=args.bezier_t_min,
-            thickness_max=args.bezier_t_max,
-            sharpness_list=bezier_sharpness,
-            antenna_length=args.antenna_length,
-            antenna_height=args.antenna_height,
-            output_dir=args.profiles_output,
-            save_plots=args.save_profile_plots,
-        ))
+                                          output_folder=args.profiles_output,
+                                          skip_unchanged=args.skip_unchanged_profiles))
+    generators = {
+        "naca_antenna": profile_generators.generate_naca_antenna_profiles,
+        "rotodomo": profile_generators.generate_rotodomo_profiles,
+        "bezier": profile_generators.generate_bezier_profiles,
+    }
+    for profile_type, generate in generators.items():
+        if profile_type in profile_types:
+            profiles.update(generate(output_dir=args.profiles_output, save_plots=args.save_profile_plots,
+                                     skip_unchanged=args.skip_unchanged_profiles,
+                                     **_generator_kwargs(args, profile_type, bezier_sharpness)))
+    return profiles
+
+
+def iter_profiles(args):
+    """Mismos perfiles que `generate_profiles`, pero en memoria y de a uno (`ProfileShape`, sin .dat)."""
+    profile_types, t_list, c_list, bezier_sharpness = _profile_options(args)
+    if "naca" in profile_types:
+        yield from iter_airfoils(t_list, c_list, normalize=args.normalize_profiles)
+    generators = {
+        "naca_antenna": profile_generators.iter_naca_antenna_profiles,
+        "rotodomo": profile_generators.iter_rotodomo_profiles,
+        "bezier": profile_generators.iter_bezier_profiles,
+    }
+    for profile_type, iterate in generators.items():
+        if profile_type in profile_types:
+            yield from iterate(**_generator_kwargs(args, profile_type, bezier_sharpness))
+
+
+def _prepare_su2(args):
+    """Configura el entorno que heredan los workers de SU2; devuelve si SU2 esta disponible."""
+    if args.su2_backend:
+        # via entorno para que lo hereden los workers del scheduler
+        os.environ["SU2_BACKEND"] = args.su2_backend
+    if args.mesh_cache_max_mb is not None:
+        os.environ["MESH_CACHE_MAX_MB"] = str(args.mesh_cache_max_mb)
+    if args.no_result_cache:
+        os.environ.pop("SU2_RESULT_CACHE", None)
+    else:
+        os.environ.setdefault("SU2_RESULT_CACHE", os.path.abspath(result_cache.RESULT_CACHE_DIR))
+    if args.refresh_su2_cache:
+        su2_runner.clear_su2_cache()
+    su2_ok = su2_runner.is_su2_available()
+    if not su2_ok:
+        print("[WARN] SU2 no disponible en WSL; se omite análisis SU2.")
+    return su2_ok
+
+
+def _run_su2_stage(profiles, args, aoa_list, mach_list, re_list, out=None):
+    """Corre SU2 sobre `profiles` y devuelve cuantas filas salieron para el CSV combinado.
+
+    Cada fila se entrega a `out` (CSVTee) apenas termina su caso, no al final del barrido.
+    """
+    n_rows = 0
+
+    def collect(res):
+        nonlocal n_rows
+        case = res.get("case") if isinstance(res, dict) else None
+        row = extract_su2_row(case, incompressible=not args.compressible) if case else None
+        if row:
+            n_rows += 1
+            if out is not None:
+                out.write([row])
+
+    results = analyze_su2(profiles, aoa=args.aoa, mach=args.mach, Re=args.Re, max_iter=args.max_iter,
+                          aoa_list=aoa_list, mach_list=mach_list, Re_list=re_list, retries=args.retries,
+                          strict=False, add_ts=False, cfl=args.cfl, incompressible=not args.compressible,
+                          mesh_file=args.mesh_file, jobs=args.jobs, mpi_ranks=args.mpi_ranks,
+                          cores=args.cores, early_stop_tol=args.early_stop_tol,
+                          early_stop_window=args.early_stop_window, warm_start=args.warm_start,
+                          on_result=collect)
+    validate_exports(results, incompressible=not args.compressible)
+    return n_rows
+
+
+def stream_profiles(args, aoa_list, mach_list, re_list, out=None):
+    """--stream-profiles: cada perfil pasa por NeuralFoil apenas se genera.
+
+    NeuralFoil trabaja con las coordenadas en memoria; el .dat se escribe solo si el perfil va a SU2.
+    Los casos SU2 de todos los perfiles van juntos a una sola etapa al final (un solo `run_cases`): asi
+    se reparte `--jobs` entre todos y el resumen y la validacion se hacen una vez.
+    Las filas van a `out` (CSVTee) a medida que salen y no se acumulan. Devuelve cuantos perfiles salieron.
+    """
+    su2_ok = not args.skip_su2 and _prepare_su2(args)
+    su2_profiles = {}
+    n_profiles = 0
+    for shape in iter_profiles(args):
+        n_profiles += 1
+        print(f"[STREAM] Perfil {n_profiles}: {shape.name}")
+        if not args.skip_aerosb:
+            try:
+                rows = surrogate.evaluate_airfoil(shape.name, aoa_list or [args.aoa], re_list, mach_list,
+                                                  coords=shape.coords, name=shape.name, verbose=True)
+            except Exception as e:
+                print(f"[ERROR] NeuralFoil falló en {shape.name}: {e}")
+            else:
+                if out is not None:
+                    out.write(rows)
+        if su2_ok:
+            su2_profiles[shape.name] = {"dat": shape.write_dat(args.profiles_output)}
+    if not n_profiles:
+        print("[WARN] No se generaron perfiles.")
+    if su2_profiles:
+        _run_su2_stage(su2_profiles, args, aoa_list, mach_list, re_list, out=out)
+    return n_profiles
+
+
+def run_pipeline(args):
+    """Corrida completa: perfiles, NeuralFoil/SU2, CSV combinado y ranking.
+
+    Devuelve el numero de filas escritas en el CSV combinado (None si no se generaron perfiles o con
+    --generate-only). Antes devolvia la lista de filas; ya no se guardan en memoria, se leen de `args.export_csv`.
+    """
+    aoa_list = _parse_num_list(args.aoa_list, None)
+    mach_list = _parse_num_list(args.mach_list, [args.mach])
+    re_list = _parse_num_list(args.Re_list, [args.Re])
+
+    if args.stream_profiles and not args.generate_only:
+        if args.funnel:
+            print("[WARN] --funnel necesita rankear todos los perfiles antes de SU2; se ignora --stream-profiles")
+        else:
+            ranker = _comparison_ranker(args)
+            with _open_export(args, ranker) as out:
+                stream_profiles(args, aoa_list, mach_list, re_list, out=out)
+            export_results(args, ranker)
+            return out.count
 
+    profiles = generate_profiles(args)
     if not profiles:
         print("[WARN] No se generaron perfiles.")
         return
     if args.generate_only:
         return
 
-    aoa_list = _parse_num_list(args.aoa_list, None)
-    mach_list = _parse_num_list(args.mach_list, [args.mach])
-    re_list = _parse_num_list(args.Re_list, [args.Re])
+    if args.funnel and args.skip_aerosb:
+        print("[WARN] --funnel necesita la etapa NeuralFoil; se ignora --skip-aerosb")
+        args.skip_aerosb = False
+
+    # el CSV combinado se escribe a medida que terminan los casos y las filas no se guardan en memoria;
+    # se cierra antes del ranking final
+    ranker = _comparison_ranker(args)
+    with _open_export(args, ranker) as out:
+        screened = _funnel_ranker(args) if args.funnel else None
+        if not args.skip_aerosb:
+            dat_paths = [info["dat"] for info in profiles.values()]
+            if not _use_screening(args):
+                for dat_path in dat_paths:
+                    out.write(analyze_aerosandbox_grid(dat_path, aoa_list or [args.aoa], re_list, mach_list))
+            else:
+                def on_rows(rows):
+                    out.write(rows)
+                    if screened is not None:
+                        screened.update(rows)
+
+                surrogate.screen_profiles(
+                    dat_paths, aoa_list or [args.aoa], re_list, mach_list,
+                    out_csv=args.surrogate_csv, jobs=args.surrogate_jobs, chunk_size=args.surrogate_chunk,
+                    resume=args.surrogate_resume, on_rows=on_rows,
+                )
+
+        su2_profiles = profiles
+        if args.funnel and not args.skip_su2:
+            su2_profiles = funnel_profiles(profiles, args, ranker=screened)
+
+        if not args.skip_su2 and su2_profiles and _prepare_su2(args):
+            _run_su2_stage(su2_profiles, args, aoa_list, mach_list, re_list, out=out)
+
+    export_results(args, ranker)
+    return out.count
+
+
+def _use_screening(args):
+    """El cribado por bloques (pool + results/surrogate_screening.csv) solo se usa si se pide."""
+    # --surrogate-jobs 0 = un proceso por nucleo
+    return args.surrogate_jobs != 1 or args.surrogate_resume or args.funnel
+
+
+def _comparison_ranker(args):
+    """StreamingRanker para --comparison-stream (None si no se pide)."""
+    if not (args.run_comparison and args.comparison_stream):
+        return None
+    metrics = [m.strip() for m in args.comparison_metric.split(",") if m.strip()]
+    return airfoil_comparison.StreamingRanker(metrics, solver=args.comparison_solver,
+                                              aoa_min=args.comparison_aoa_min, aoa_max=args.comparison_aoa_max)
 
-    aero_rows = []
-    if not args.skip_aerosb:
-        for key, info in profiles.items():
-            for Re in re_list:
-                for mach in mach_list:
-                    aero_rows.extend(analyze_aerosandbox(info["dat"], aoa_list or [args.aoa], Re, mach))
-
-    su2_rows = []
-    if not args.skip_su2:
-        su2_ok = su2_runner.is_su2_available()
-        if not su2_ok:
-            print("[WARN] SU2 no disponible en WSL; se omite análisis SU2.")
-        else:
-            results = analyze_su2(profiles, aoa=args.aoa, mach=args.mach, Re=args.Re, max_iter=args.max_iter,
-                                  aoa_list=aoa_list, mach_list=mach_list, Re_list=re_list, retries=args.retries,
-                                  strict=False, add_ts=False, cfl=args.cfl, incompressible=not args.compressible,
-                                  mesh_file=args.mesh_file)
-            validate_exports(results, incompressible=not args.compressible)
-            for res in results:
-                case = res.get("case") if isinstance(res, dict) else None
-                if case:
-                    row = extract_su2_row(case, incompressible=not args.compressible)
-                    if row:
-                        su2_rows.append(row)
-
-    export_rows = aero_rows + su2_rows
-    export_csv(export_rows, out_path=args.export_csv)
-    # Exportar también a un archivo adicional si se solicita (por defecto, results/simulations_clcdcm.csv)
-    if args.comparison_csv and Path(args.comparison_csv) != Path(args.export_csv):
-        export_csv(export_rows, out_path=args.comparison_csv)
+
+def _live_ranking(ranker):
+    """Listener del CSV combinado: actualiza el ranking con cada entrega y avisa cuando cambia el lider."""
+    leader = [None]
+
+    def listen(rows):
+        ranker.update(rows)
+        best = ranker.top(1)
+        if best and best[0]["airfoil"] != leader[0]:
+            leader[0] = best[0]["airfoil"]
+            print(f"[RANK] Líder parcial ({best[0]['metric']}): {leader[0]} = {best[0]['value']:.6g} "
+                  f"({ranker.rows} filas)")
+
+    return listen
+
+
+def _open_export(args, ranker=None):
+    """CSV combinado y, si se pide, la copia para comparacion (por defecto results/simulations_clcdcm.csv),
+    alimentados por el mismo flujo de filas. Con `ranker` el ranking se actualiza con cada entrega."""
+    listeners = [_live_ranking(ranker)] if ranker is not None else []
+    return result_export.CSVTee([args.export_csv, args.comparison_csv], listeners=listeners)
+
+
+def export_results(args, ranker=None):
+    """Ranking final de la corrida.
+
+    Con `ranker` (--comparison-stream) se usa lo que ya acumulo durante la corrida, sin filas en memoria;
+    si no, se lee una vez el CSV combinado que escribio `_open_export` (solo las columnas que hacen falta).
+    """
     if args.run_comparison:
-        airfoil_comparison.run_comparison(
+        if ranker is None and not (args.export_csv and Path(args.export_csv).exists()):
+            print(f"[WARN] No existe {args.export_csv}; no hay resultados para rankear")
+            return None
+        return airfoil_comparison.run_comparison(
             csv_in=Path(args.export_csv),
             csv_out=Path(args.comparison_output),
             metric=args.comparison_metric,
@@ -363,8 +599,9 @@ def run_pipeline(args):
             plot=args.plot_comparison,
             plot_dir=Path(args.plot_dir) if args.plot_dir else None,
             top_n=args.plot_top_n,
+            ranker=ranker,
         )
-    return export_rows
+    return None
 
 
 def main(argv=None):
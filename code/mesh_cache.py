@@ -0,0 +1,167 @@
+"""
+Cache de mallas direccionado por contenido.
+La malla depende solo de la geometria (puntos ya limpios del .dat) y de los parametros de
+`write_geo`, no de AoA/Mach/Re: la clave es un sha256 de ambos. Cada malla se genera una vez en
+`meshes/_cache/<clave>.su2` y los casos la enlazan (hard link; si no se puede, copia).
+
+Limpieza: el numero de hard links hace de contador de referencias. Cuando el cache supera
+MESH_CACHE_MAX_MB se borran, de la menos a la mas recientemente usada, las mallas que ningun caso
+enlaza. MESH_CACHE_MAX_MB=0 desactiva el cache (se malla cada caso como antes).
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+from mesh_generator import MESH_PARAMS, generate_su2_mesh, prepare_airfoil_points
+
+MESH_CACHE_DIR = "meshes/_cache"
+# Version del esquema de la clave; subirla invalida todas las mallas cacheadas
+KEY_VERSION = 1
+# Sufijo de las mallas en construccion; la limpieza solo borra temporales (*.part.*) de mas de PART_MAX_AGE s,
+# que quedan de procesos interrumpidos
+PART_SUFFIX = ".part.su2"
+PART_MAX_AGE = 3600
+
+
+def cache_limit_bytes():
+    """Limite de tamano del cache (MESH_CACHE_MAX_MB, default 2048 MB); 0 = cache desactivado."""
+    return int(float(os.environ.get("MESH_CACHE_MAX_MB", 2048)) * 1024 * 1024)
+
+
+def mesh_key(pts, params=None):
+    """sha256 de los puntos limpios y de los parametros de mallado."""
+    pts = np.ascontiguousarray(pts, dtype=np.float64)
+    h = hashlib.sha256()
+    h.update(f"v{KEY_VERSION}|{pts.shape}|".encode())
+    h.update(pts.tobytes())
+    h.update(json.dumps(dict(MESH_PARAMS, **(params or {})), sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def link_mesh(cached, mesh_out):
+    """Enlaza la malla cacheada en la ruta del caso. Devuelve 'hardlink' o 'copy'.
+
+    Sin symlink: no sube el nlink de la entrada, asi que `evict` podria borrarla con un caso apuntandola.
+    """
+    if os.path.lexists(mesh_out):
+        os.remove(mesh_out)
+    try:
+        os.link(cached, mesh_out)
+        return "hardlink"
+    except OSError:
+        shutil.copyfile(cached, mesh_out)
+        return "copy"
+
+
+def _sweep_parts(cache_dir, max_age=PART_MAX_AGE):
+    """Borra temporales (*.part.su2, *.part.geo) viejos que dejo un mallado interrumpido."""
+    now = time.time()
+    removed = []
+    for path in Path(cache_dir).glob("*.part.*"):
+        try:
+            if now - path.stat().st_mtime > max_age:
+                path.unlink()
+                removed.append(path.name)
+        except OSError:
+            continue
+    return removed
+
+
+def evict(cache_dir, max_bytes=None):
+    """Borra mallas sin casos que las enlacen (nlink == 1), LRU primero, hasta bajar del limite.
+
+    Antes barre los temporales viejos de mallados interrumpidos (`_sweep_parts`).
+    """
+    max_bytes = cache_limit_bytes() if max_bytes is None else max_bytes
+    parts = _sweep_parts(cache_dir)
+    if parts:
+        print(f"[MESH] Cache: {len(parts)} temporales huerfanos eliminados")
+    entries = []
+    for path in Path(cache_dir).glob("*.su2"):
+        if ".part." in path.name:
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, st.st_nlink, path))
+    total = sum(e[1] for e in entries)
+    removed = []
+    for _mtime, size, nlink, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if nlink > 1:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed.append(path.name)
+    if removed:
+        print(f"[MESH] Cache: {len(removed)} mallas sin uso eliminadas")
+    return removed
+
+
+def cached_mesh(dat_file, cache_dir=MESH_CACHE_DIR, params=None):
+    """Ruta de la malla cacheada de `dat_file` sin generarla; None si no esta o el cache esta desactivado."""
+    if cache_limit_bytes() <= 0:
+        return None
+    try:
+        key = mesh_key(prepare_airfoil_points(dat_file), params)
+    except Exception:
+        return None
+    cached = os.path.join(cache_dir, f"{key}.su2")
+    return cached if os.path.exists(cached) else None
+
+
+def get_or_create_mesh(dat_file, mesh_out, cache_dir=MESH_CACHE_DIR, generate=None, params=None):
+    """Deja en `mesh_out` la malla de `dat_file`, generandola solo si no esta en el cache.
+
+    `generate(dat_file, mesh_file)` es el mallador (por defecto `generate_su2_mesh`); si hay `params`
+    se le pasan como `params=`, los mismos que entran en la clave.
+    Devuelve True si la malla salio del cache.
+    """
+    generate = generate or generate_su2_mesh
+    if params:
+        generate = functools.partial(generate, params=params)
+    max_bytes = cache_limit_bytes()
+    if max_bytes <= 0:
+        generate(dat_file, mesh_out)
+        return False
+    try:
+        key = mesh_key(prepare_airfoil_points(dat_file), params)
+    except Exception as e:
+        print(f"[WARN] No se pudo calcular la clave de malla para {dat_file} ({e}); se malla sin cache")
+        generate(dat_file, mesh_out)
+        return False
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cached = os.path.join(cache_dir, f"{key}.su2")
+    hit = os.path.exists(cached)
+    if hit:
+        print(f"[MESH] Reutilizando malla cacheada {key[:12]} para {os.path.basename(mesh_out)}")
+    else:
+        # se malla en un temporal y se publica con os.replace: otro proceso nunca ve una malla a medias
+        tmp = os.path.join(cache_dir, f"{key}.{os.getpid()}{PART_SUFFIX}")
+        try:
+            generate(dat_file, tmp)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        if not os.path.exists(tmp):
+            print(f"[ERROR] Gmsh no generó la malla para {dat_file}")
+            return False
+        os.replace(tmp, cached)
+    os.utime(cached)  # marca de uso para el LRU
+    link_mesh(cached, mesh_out)
+    evict(cache_dir, max_bytes)
+    return hit
@@ -2,6 +2,9 @@ import os
 import shutil
 import numpy as np
 import subprocess
+import threading
+
+import profile_store
 
 
 def _resolve_gmsh():
@@ -31,7 +34,18 @@ def _resolve_gmsh():
     raise FileNotFoundError("No se encontró gmsh. Define la variable GMSH_CMD o añade gmsh al PATH.")
 
 
-GMSH_CMD = _resolve_gmsh()
+try:
+    GMSH_CMD = _resolve_gmsh()
+except FileNotFoundError:
+    # el ejecutable solo hace falta si no esta disponible la API de Python (backend "cli")
+    GMSH_CMD = None
+
+# Backend de mallado: "api" (modulo gmsh en memoria), "cli" (.geo + ejecutable) o "auto"
+MESH_BACKEND = os.environ.get("MESH_BACKEND", "auto")
+
+# La API de gmsh guarda estado global por proceso: un mallado a la vez y un initialize por pid
+_gmsh_lock = threading.Lock()
+_gmsh_pid = None
 
 
 # ============================================================
@@ -41,7 +55,10 @@ GMSH_CMD = _resolve_gmsh()
 def load_airfoil_points(dat_file):
     """
     Carga puntos desde .dat ignorando cabecera si la hay.
+    Una referencia "<almacen.npy>#<nombre>" se lee del almacen binario (vista mapeada, sin copia).
     """
+    if profile_store.is_ref(dat_file):
+        return profile_store.load_points(dat_file)
     try:
         return np.loadtxt(dat_file)
     except Exception:
@@ -115,14 +132,43 @@ def clean_and_order_airfoil(pts):
     return ordered
 
 
+def prepare_airfoil_points(dat_file):
+    """
+    Pasos 1-3: cargar, reparar TE y ordenar. Estos puntos (junto con MESH_PARAMS)
+    determinan la malla por completo.
+    """
+    pts = load_airfoil_points(dat_file)
+    pts = fix_trailing_edge(pts)
+    return clean_and_order_airfoil(pts)
+
+
 # ============================================================
 # 4. GENERATE .GEO FILE
 # ============================================================
 
-def write_geo(pts, geo_file, mesh_file):
+# Parametros de mallado que usa write_geo (forman parte de la clave del cache de mallas)
+MESH_PARAMS = {
+    "lc_airfoil": 0.01,         # tamano de elemento en los puntos del perfil
+    "farfield": 20,             # semilado del dominio exterior (en cuerdas)
+    "lc_farfield": 3.0,
+    "lc_min": 5e-5,
+    "lc_max": 3.0,
+    "bl_hwall_n": 5e-5,         # capa limite: primera celda, espesor y crecimiento
+    "bl_thickness": 0.2,
+    "bl_ratio": 1.15,
+    "thr_lc_min": 0.005,        # refinamiento por distancia al perfil
+    "thr_lc_max": 2.0,
+    "thr_dist_min": 0.2,
+    "thr_dist_max": 5.0,
+}
+
+
+def write_geo(pts, geo_file, mesh_file, params=None):
     """
     Crea el archivo .geo que Gmsh usara para generar el mallado.
     """
+    p = dict(MESH_PARAMS, **(params or {}))
+    r, lcf = p["farfield"], p["lc_farfield"]
 
     pts = np.asarray(pts)
 
@@ -135,7 +181,7 @@ def write_geo(pts, geo_file, mesh_file):
 
         # puntos del perfil
         for i, (x, y) in enumerate(pts):
-            f.write(f"Point({i+1}) = {{{x}, {y}, 0, 0.01}};\n")
+            f.write(f"Point({i+1}) = {{{x}, {y}, 0, {p['lc_airfoil']}}};\n")
 
         # spline del perfil (cerrando explicitamente sobre el primer nodo)
         indices_list = [str(i + 1) for i in range(len(pts))]
@@ -144,14 +190,14 @@ def write_geo(pts, geo_file, mesh_file):
         f.write(f"Spline(1) = {{{indices}}};\n")
 
         # dominio exterior (farfield a 20c)
-        f.write("Point(1001) = {-20, -20, 0, 3.0};\n")
-        f.write("Point(1002) = { 20, -20, 0, 3.0};\n")
-        f.write("Point(1003) = { 20,  20, 0, 3.0};\n")
-        f.write("Point(1004) = {-20,  20, 0, 3.0};\n")
+        f.write(f"Point(1001) = {{-{r}, -{r}, 0, {lcf}}};\n")
+        f.write(f"Point(1002) = {{ {r}, -{r}, 0, {lcf}}};\n")
+        f.write(f"Point(1003) = {{ {r},  {r}, 0, {lcf}}};\n")
+        f.write(f"Point(1004) = {{-{r},  {r}, 0, {lcf}}};\n")
 
         # control global de tamano de elemento (refinado cerca del perfil)
-        f.write("Mesh.CharacteristicLengthMin = 5e-5;\n")
-        f.write("Mesh.CharacteristicLengthMax = 3.0;\n")
+        f.write(f"Mesh.CharacteristicLengthMin = {p['lc_min']};\n")
+        f.write(f"Mesh.CharacteristicLengthMax = {p['lc_max']};\n")
 
         f.write("Line(1001) = {1001, 1002};\n")
         f.write("Line(1002) = {1002, 1003};\n")
@@ -174,53 +220,185 @@ def write_geo(pts, geo_file, mesh_file):
         # campo de capa limite alrededor del airfoil (malla cuadriculada)
         f.write("Field[1] = BoundaryLayer;\n")
         f.write("Field[1].EdgesList = {1};\n")
-        f.write("Field[1].hwall_n = 5e-5;\n")
-        f.write("Field[1].thickness = 0.2;\n")
-        f.write("Field[1].ratio = 1.15;\n")
+        f.write(f"Field[1].hwall_n = {p['bl_hwall_n']};\n")
+        f.write(f"Field[1].thickness = {p['bl_thickness']};\n")
+        f.write(f"Field[1].ratio = {p['bl_ratio']};\n")
         f.write("Field[1].Quads = 1;\n")
         f.write("Field[1].IntersectMetrics = 1;\n")
         f.write("Field[2] = Distance;\n")
         f.write("Field[2].EdgesList = {1};\n")
         f.write("Field[3] = Threshold;\n")
         f.write("Field[3].IField = 2;\n")
-        f.write("Field[3].LcMin = 0.005;\n")
-        f.write("Field[3].LcMax = 2.0;\n")
-        f.write("Field[3].DistMin = 0.2;\n")
-        f.write("Field[3].DistMax = 5.0;\n")
+        f.write(f"Field[3].LcMin = {p['thr_lc_min']};\n")
+        f.write(f"Field[3].LcMax = {p['thr_lc_max']};\n")
+        f.write(f"Field[3].DistMin = {p['thr_dist_min']};\n")
+        f.write(f"Field[3].DistMax = {p['thr_dist_max']};\n")
         f.write("Background Field = 3;\n")
 
 
 # ============================================================
-# 5. GENERATE SU2 MESH
+# 5. MESH IN MEMORY (GMSH PYTHON API)
 # ============================================================
 
-def generate_su2_mesh(dat_file, mesh_file="NACA0012.su2"):
+def _import_gmsh():
+    """Modulo gmsh o None (no instalado o sin sus librerias nativas)."""
+    try:
+        import gmsh
+    except (ImportError, OSError):
+        return None
+    return gmsh
+
+
+def _gmsh_initialize(gmsh):
+    """initialize una vez por proceso (los workers de un pool hacen fork con el estado del padre)."""
+    global _gmsh_pid
+    if _gmsh_pid == os.getpid():
+        return
+    if _gmsh_pid is not None:
+        # estado heredado del padre por fork: se descarta y se arranca limpio en este proceso
+        try:
+            gmsh.finalize()
+        except Exception:
+            pass
+    try:
+        # sin manejador de SIGINT: initialize puede llamarse desde hilos que no son el principal
+        gmsh.initialize(interruptible=False)
+    except TypeError:
+        gmsh.initialize()
+    gmsh.option.setNumber("General.Terminal", 1)
+    _gmsh_pid = os.getpid()
+
+
+def _set_field(field, tag, names, value):
+    """Opcion de un campo probando el nombre actual y luego el antiguo (el que usa write_geo)."""
+    setter = field.setNumbers if isinstance(value, list) else field.setNumber
+    for name in names[:-1]:
+        try:
+            setter(tag, name, value)
+            return
+        except Exception:
+            continue
+    setter(tag, names[-1], value)
+
+
+def mesh_with_api(pts, mesh_file, params=None):
     """
-    Paso completo: cargar, reparar, ordenar y mallar.
+    Misma geometria, campos y grupos fisicos que write_geo, construidos con la API de gmsh
+    y escritos directamente a .su2 (sin .geo intermedio ni proceso externo).
     """
+    gmsh = _import_gmsh()
+    if gmsh is None:
+        raise RuntimeError("El modulo gmsh no esta disponible")
+    p = dict(MESH_PARAMS, **(params or {}))
+    r, lcf = p["farfield"], p["lc_farfield"]
 
-    # 1. cargar .dat
-    pts = load_airfoil_points(dat_file)
+    pts = np.asarray(pts)
+    if np.linalg.norm(pts[0] - pts[-1]) < 1e-12:
+        pts = pts[:-1]
 
-    # 2. limpiar borde de salida
-    pts = fix_trailing_edge(pts)
+    with _gmsh_lock:
+        _gmsh_initialize(gmsh)
+        gmsh.model.add(os.path.basename(mesh_file))
+        try:
+            geo = gmsh.model.geo
+            for i, (x, y) in enumerate(pts):
+                geo.addPoint(float(x), float(y), 0, p["lc_airfoil"], i + 1)
+            geo.addSpline(list(range(1, len(pts) + 1)) + [1], 1)
+
+            for tag, (x, y) in zip((1001, 1002, 1003, 1004), ((-r, -r), (r, -r), (r, r), (-r, r))):
+                geo.addPoint(x, y, 0, lcf, tag)
+            gmsh.option.setNumber("Mesh.CharacteristicLengthMin", p["lc_min"])
+            gmsh.option.setNumber("Mesh.CharacteristicLengthMax", p["lc_max"])
+            for tag, (a, b) in zip((1001, 1002, 1003, 1004), ((1001, 1002), (1002, 1003), (1003, 1004), (1004, 1001))):
+                geo.addLine(a, b, tag)
+
+            geo.addCurveLoop([1], 1)
+            geo.addCurveLoop([1001, 1002, 1003, 1004], 2)
+            geo.addPlaneSurface([2, 1], 10)
+            geo.mesh.setRecombine(2, 10)
+            geo.synchronize()
+
+            for dim, tags, name in ((2, [10], "fluid"), (1, [1001, 1002, 1003, 1004], "farfield"), (1, [1], "airfoil")):
+                gmsh.model.setPhysicalName(dim, gmsh.model.addPhysicalGroup(dim, tags), name)
+
+            field = gmsh.model.mesh.field
+            field.add("BoundaryLayer", 1)
+            _set_field(field, 1, ("CurvesList", "EdgesList"), [1])
+            _set_field(field, 1, ("Size", "hwall_n"), p["bl_hwall_n"])
+            _set_field(field, 1, ("Thickness", "thickness"), p["bl_thickness"])
+            _set_field(field, 1, ("Ratio", "ratio"), p["bl_ratio"])
+            _set_field(field, 1, ("Quads",), 1)
+            _set_field(field, 1, ("IntersectMetrics",), 1)
+            field.add("Distance", 2)
+            _set_field(field, 2, ("CurvesList", "EdgesList"), [1])
+            field.add("Threshold", 3)
+            _set_field(field, 3, ("InField", "IField"), 2)
+            _set_field(field, 3, ("SizeMin", "LcMin"), p["thr_lc_min"])
+            _set_field(field, 3, ("SizeMax", "LcMax"), p["thr_lc_max"])
+            _set_field(field, 3, ("DistMin",), p["thr_dist_min"])
+            _set_field(field, 3, ("DistMax",), p["thr_dist_max"])
+            field.setAsBackgroundMesh(3)
+
+            gmsh.model.mesh.generate(2)
+            gmsh.write(mesh_file)
+        finally:
+            gmsh.model.remove()
+
+
+# ============================================================
+# 6. GENERATE SU2 MESH
+# ============================================================
+
+def _mesh_with_cli(pts, mesh_file, params=None):
+    """Camino historico: .geo + ejecutable gmsh.
 
-    # 3. ordenar para Gmsh
-    pts = clean_and_order_airfoil(pts)
+    El .geo va junto a la malla (no a un temp.geo compartido) y se borra al terminar, haya salido o no la malla.
+    """
+    if GMSH_CMD is None:
+        raise FileNotFoundError("No se encontró gmsh. Define la variable GMSH_CMD o añade gmsh al PATH.")
+    geo_file = os.path.splitext(mesh_file)[0] + ".geo"
+    try:
+        write_geo(pts, geo_file, mesh_file, params)
+        print("[INFO] Ejecutando Gmsh...")
+        subprocess.run([GMSH_CMD, geo_file, "-2", "-o", mesh_file, "-format", "su2"], check=False)
+    finally:
+        if os.path.exists(geo_file):
+            os.remove(geo_file)
 
-    # 4. escribir geo
-    geo_file = "temp.geo"
-    write_geo(pts, geo_file, mesh_file)
 
-    # 5. ejecutar Gmsh
-    print("[INFO] Ejecutando Gmsh...")
-    subprocess.run([GMSH_CMD, geo_file, "-2", "-o", mesh_file, "-format", "su2"], check=False)
+def generate_su2_mesh(dat_file, mesh_file="NACA0012.su2", backend=None, params=None):
+    """
+    Paso completo: cargar, reparar, ordenar y mallar.
+    `backend` (o MESH_BACKEND): "api", "cli" o "auto" (API si el modulo gmsh carga, si no CLI).
+    `params` sobreescribe claves de MESH_PARAMS para esta malla.
+    """
+
+    # 1-3. cargar .dat, limpiar borde de salida y ordenar para Gmsh
+    pts = prepare_airfoil_points(dat_file)
+
+    # 4-5. mallar
+    backend = (backend or MESH_BACKEND).lower()
+    if backend not in ("auto", "api", "cli"):
+        raise ValueError(f"Backend de mallado desconocido: {backend} (opciones: auto, api, cli)")
+    if backend == "auto":
+        backend = "api" if _import_gmsh() is not None else "cli"
+    if backend == "api":
+        try:
+            print("[INFO] Mallando con la API de Gmsh...")
+            mesh_with_api(pts, mesh_file, params)
+        except Exception as e:
+            if GMSH_CMD is None:
+                raise
+            print(f"[WARN] Falló el mallado con la API de Gmsh ({e}); se usa el ejecutable")
+            _mesh_with_cli(pts, mesh_file, params)
+    else:
+        _mesh_with_cli(pts, mesh_file, params)
 
     print(f"[OK] Malla SU2 generada: {mesh_file}")
 
 
 # ============================================================
-# 6. SOLO PARA DEBUG DIRECTO
+# 7. SOLO PARA DEBUG DIRECTO
 # ============================================================
 
 if __name__ == "__main__":
@@ -2,9 +2,11 @@ import os
 from pathlib import Path
 from Airfoil_Generator import Airfoil
 from mesh_generator import generate_su2_mesh
-from su2_runner import run_su2
+import mesh_cache
+import result_cache
+import results_db
+from su2_runner import cached_result_key, run_su2
 from datetime import datetime
-import csv
 
 # ------------------------------
 # CONFIGURACION DEL PIPELINE
@@ -30,6 +32,12 @@ SU2_RESULTS_DIR = f"{RESULTS_DIR}/su2"
 MESH_OUT = f"{MESH_DIR}/airfoil_mesh.su2"
 
 
+def export_summary(root_dir=None):
+    """Exporta results/summary.csv desde results/summary.sqlite (ver results_db)."""
+    root = Path(root_dir) if root_dir else Path()
+    return results_db.export_csv(root / RESULTS_DIR / results_db.DB_NAME, root / RESULTS_DIR / results_db.CSV_NAME)
+
+
 def main():
     # ------------------------------
     # 1. GENERAR PERFIL
@@ -133,13 +141,23 @@ if __name__ == "__main__":
     main()
 
 
-def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH, Re: float = RE, max_iter: int = None, retries: int = 1, strict: bool = False, cfl: float = None, incompressible: bool = False, mesh_override: str = None):
+def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH, Re: float = RE, max_iter: int = None, retries: int = 1, strict: bool = False, cfl: float = None, incompressible: bool = False, mesh_override: str = None, root_dir: str = None, mpi_ranks: int = 1, early_stop_tol: float = None, early_stop_window: int = 100, warm_start: bool = False, restart_from: str = None):
     """Run a full pipeline for a given DAT airfoil file and case name.
     This will produce a mesh under meshes/{case_name}/ and su2 results under results/su2/{case_name}/inviscid and /viscous
+    `root_dir` anchors meshes/ and results/ when the caller runs from another cwd (see scheduler.py).
+    `mpi_ranks` > 1 launches each SU2 run with `mpirun -n mpi_ranks`.
+    `early_stop_tol` streams SU2 output and stops a run once CL/CD plateau over `early_stop_window` iterations.
+    `warm_start` makes each SU2 run keep an ASCII restart; `restart_from` (results dir of a neighbouring case
+    on the same mesh) seeds the runs from that case's restarts (see scheduler.plan_chains).
     Returns a dict with results for inviscid and viscous runs.
     """
+    root = Path(root_dir) if root_dir else Path()
+    # casos ya resueltos: se buscan en el cache de resultados antes de borrar directorios o mallar
+    cached = _cached_runs(dat_file, root, aoa, mach, Re, max_iter, cfl, incompressible, mesh_override,
+                          early_stop_tol, early_stop_window)
+
     # mesh output inside a case subdirectory (overwrite if already exists)
-    mesh_case_dir = Path(MESH_DIR) / case_name
+    mesh_case_dir = root / MESH_DIR / case_name
     if mesh_case_dir.exists():
         # Remove previous mesh files so gmsh generates fresh output
         import shutil
@@ -152,7 +170,7 @@ def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH
 
     # results directories
     # results directories (overwrite contents if they exist)
-    results_case_dir = Path(SU2_RESULTS_DIR) / case_name
+    results_case_dir = root / SU2_RESULTS_DIR / case_name
     if results_case_dir.exists():
         import shutil
         try:
@@ -164,6 +182,12 @@ def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH
     os.makedirs(inv_out_dir, exist_ok=True)
     os.makedirs(visc_out_dir, exist_ok=True)
 
+    if cached:
+        restored = _restore_runs(cached, mesh_out, {"inviscid": inv_out_dir, "viscous": visc_out_dir})
+        if restored:
+            print(f"[CACHE] {case_name}: resultados reutilizados del cache; no se malla ni se lanza SU2")
+            return _record_case(root, case_name, dat_file, aoa, mach, Re, *restored)
+
     # generate or reuse mesh for this case
     if mesh_override:
         # copiar la malla provista al directorio del caso
@@ -176,7 +200,26 @@ def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH
         except Exception as e:
             raise RuntimeError(f"No se pudo copiar la malla provista {mesh_override}: {e}")
     else:
-        generate_su2_mesh(dat_file, mesh_out)
+        # la malla solo depende de la geometria: se reutiliza entre puntos AoA/Mach/Re
+        mesh_cache.get_or_create_mesh(dat_file, mesh_out, cache_dir=str(root / mesh_cache.MESH_CACHE_DIR),
+                                      generate=generate_su2_mesh)
+
+    # opciones de ejecucion de SU2; solo se pasan las que difieren del default
+    solver_opts = {}
+    if mpi_ranks and mpi_ranks > 1:
+        solver_opts["mpi_ranks"] = int(mpi_ranks)
+    if early_stop_tol:
+        solver_opts["early_stop_tol"] = float(early_stop_tol)
+        solver_opts["early_stop_window"] = int(early_stop_window)
+
+    def _warm(sub):
+        # donor de la misma subcorrida (inviscid/viscous); run_su2 valida la huella de malla
+        if not warm_start:
+            return {}
+        opts = {"warm_start": True}
+        if restart_from:
+            opts["restart_from"] = str(Path(restart_from) / sub)
+        return opts
 
     if incompressible:
         # Solo una corrida incomprensible (usa plantilla INC)
@@ -194,6 +237,8 @@ def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH
             cfl=cfl,
             output_dir=visc_out_dir,
             incompressible=True,
+            **solver_opts,
+            **_warm("viscous"),
         )
     else:
         # run inviscid (compresible)
@@ -209,6 +254,8 @@ def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH
             strict=strict,
             cfl=cfl,
             output_dir=inv_out_dir,
+            **solver_opts,
+            **_warm("inviscid"),
         )
 
         # run viscous (RANS compresible)
@@ -224,15 +271,57 @@ def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH
             strict=strict,
             cfl=cfl,
             output_dir=visc_out_dir,
+            **solver_opts,
+            **_warm("viscous"),
         )
 
-    # record to summary CSV (overwrite previous entry for the same case)
-    summary_file = Path(RESULTS_DIR) / "summary.csv"
-    headers = [
-        "timestamp", "case", "dat_file", "aoa", "mach", "Re",
-        "CL_inv", "CD_inv", "CM_inv", "INV_converged", "INV_final_iter", "INV_final_rms",
-        "CL_visc", "CD_visc", "CM_visc", "VIS_converged", "VIS_final_iter", "VIS_final_rms",
-    ]
+    return _record_case(root, case_name, dat_file, aoa, mach, Re, inv, visc)
+
+
+def _cached_runs(dat_file, root, aoa, mach, Re, max_iter, cfl, incompressible, mesh_override, early_stop_tol,
+                 early_stop_window):
+    """(malla, {subcorrida: clave}) si todas las corridas del caso estan en el cache de resultados, si no None.
+
+    La malla es la provista o la del cache de mallas; si no existe todavia, el caso no puede estar cacheado
+    sin mallar primero y se sigue el camino normal (run_su2 vuelve a mirar el cache tras mallar).
+    """
+    if not result_cache.cache_dir_from_env():
+        return None
+    if mesh_override:
+        mesh = mesh_override if os.path.exists(mesh_override) else None
+    else:
+        mesh = mesh_cache.cached_mesh(dat_file, cache_dir=str(root / mesh_cache.MESH_CACHE_DIR))
+    if mesh is None:
+        return None
+    runs = [("viscous", CFG_INCOMP, True)] if incompressible else [("inviscid", CFG_INVISCID, False),
+                                                                     ("viscous", CFG_VISCOUS, True)]
+    keys = {}
+    for sub, cfg_template, viscous in runs:
+        key = cached_result_key(mesh, cfg_template, aoa=aoa, mach=mach, Re=Re, viscous=viscous, max_iter=max_iter,
+                                cfl=cfl, incompressible=incompressible, early_stop_tol=early_stop_tol,
+                                early_stop_window=early_stop_window)
+        if key is None:
+            return None
+        keys[sub] = key
+    return mesh, keys
+
+
+def _restore_runs(cached, mesh_out, out_dirs):
+    """Enlaza la malla y copia las corridas cacheadas; (inv, visc) o None si alguna entrada ya no esta."""
+    mesh, keys = cached
+    cache_dir = result_cache.cache_dir_from_env()
+    results = {}
+    for sub, key in keys.items():
+        results[sub] = result_cache.restore(cache_dir, key, out_dirs[sub])
+        if results[sub] is None:
+            # otro proceso pudo limpiar el cache entre la busqueda y la copia
+            return None
+    mesh_cache.link_mesh(mesh, mesh_out)
+    return results.get("inviscid"), results.get("viscous")
+
+
+def _record_case(root, case_name, dat_file, aoa, mach, Re, inv, visc):
+    # registro del caso en results/summary.sqlite (upsert: una corrida nueva reemplaza a la anterior)
     row = [datetime.now().isoformat(), case_name, dat_file, aoa, mach, Re]
     if inv is None:
         row.extend([None, None, None, None, None, None])
@@ -252,35 +341,7 @@ def run_case(dat_file: str, case_name: str, aoa: float = AOA, mach: float = MACH
             row.extend([visc[5], visc[3], visc[4]])
         else:
             row.extend([None, None, None])
-
-    os.makedirs(RESULTS_DIR, exist_ok=True)
-    write_header = not Path(summary_file).exists()
-    # If the file exists, load it and remove previous entries for this case
-    if Path(summary_file).exists():
-        try:
-            with open(summary_file, 'r', newline='') as csvr:
-                reader = list(csv.reader(csvr))
-            # split header and rows
-            header = reader[0] if reader else headers
-            rows = reader[1:] if len(reader) > 1 else []
-            # remove any rows for this case (strip white-space for robustness)
-            prev_rows = [r for r in rows if len(r) < 2 or r[1].strip() != case_name.strip()]
-        except Exception:
-            prev_rows = []
-            header = headers
-        with open(summary_file, 'w', newline='') as csvw:
-            writer = csv.writer(csvw)
-            # Always ensure header present when recreating the file
-            writer.writerow(header)
-            # write previous rows except ones for this case
-            for r in prev_rows:
-                writer.writerow(r)
-            writer.writerow(row)
-    else:
-        with open(summary_file, 'a', newline='') as csvf:
-            writer = csv.writer(csvf)
-            writer.writerow(headers)
-            writer.writerow(row)
+    results_db.record(root / RESULTS_DIR / results_db.DB_NAME, dict(zip(results_db.SUMMARY_FIELDS, row)))
 
     return {"case": case_name, "inviscid": inv, "viscous": visc}
 
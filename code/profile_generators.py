@@ -2,11 +2,21 @@
 Generadores de perfiles adicionales (NACA con antena, Rotodomo elíptico y perfil simétrico Bézier).
 Devuelven un diccionario {nombre: {"dat": ruta_dat, "img": ruta_png_opcional}} listo para usarse en main.py.
 Las gráficas se guardan solo si matplotlib está disponible o si se solicita.
+
+Cada familia tiene ademas un iterador perezoso (`iter_*_profiles`) que produce `ProfileShape` con las
+coordenadas en memoria, sin tocar disco: las etapas siguientes pueden empezar con el primer perfil y
+escribir el .dat (`ProfileShape.write_dat`) solo cuando lo necesitan. `generate_*` consume ese mismo
+iterador y escribe todo de una vez.
 """
 
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
+
 import numpy as np
 
+import dat_writer
+
 try:
     import matplotlib.pyplot as plt
     import matplotlib.patches as patches
@@ -14,6 +24,45 @@ except ImportError:  # pragma: no cover - dependencia opcional
     plt = None
     patches = None
 
+# Estilo de las imagenes por familia: (figsize, color de relleno, alpha relleno, alpha antena, alpha grilla)
+_PLOT_STYLE = {
+    "naca_antenna": ((12, 5), "lightgray", 0.3, 0.4, 0.6),
+    "rotodomo": ((10, 5), "lightgray", 0.3, 0.5, 0.5),
+    "bezier": ((12, 4), "cyan", 0.1, 0.5, 0.5),
+}
+
+
+@dataclass
+class ProfileShape:
+    """Perfil generado en memoria; x, y en el orden del .dat (contorno cerrado).
+
+    `header` (cabecera del .dat, por defecto el nombre) y `line_fmt` reproducen el .dat que escribe el
+    generador de la familia: los NACA de `Airfoil.save_dat` usan otra cabecera y `dat_writer.AIRFOIL_LINE`.
+    """
+    name: str
+    x: np.ndarray
+    y: np.ndarray
+    family: str = ""
+    antenna_x: Optional[float] = None
+    dat: Optional[str] = None
+    header: Optional[str] = None
+    line_fmt: str = dat_writer.PROFILE_LINE
+
+    @property
+    def coords(self):
+        """Array (N, 2) listo para AeroSandbox/NeuralFoil o el mallador."""
+        return np.column_stack((self.x, self.y))
+
+    def write_dat(self, output_dir="generated_profiles"):
+        """Escribe el .dat la primera vez que se pide y devuelve su ruta."""
+        if self.dat is None:
+            out_dir = Path(output_dir)
+            _ensure_dir(out_dir)
+            dat_path = out_dir / f"{self.name}.dat"
+            dat_writer.write_dat(dat_path, self.header or self.name, self.x, self.y, line_fmt=self.line_fmt)
+            self.dat = str(dat_path)
+        return self.dat
+
 
 def _ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
@@ -23,6 +72,13 @@ def _warn_matplotlib():
     print("[WARN] matplotlib no está instalado; se omiten las imágenes de perfiles.")
 
 
+def _first_true(mask):
+    """Indice del primer True en el ultimo eje de `mask` (-1 si no hay ninguno)."""
+    if mask.shape[-1] == 0:
+        return np.full(mask.shape[:-1], -1)
+    return np.where(mask.any(axis=-1), mask.argmax(axis=-1), -1)
+
+
 def _save_png(fig, path: Path):
     _ensure_dir(path.parent)
     fig.savefig(path, dpi=120)
@@ -30,7 +86,57 @@ def _save_png(fig, path: Path):
     return path
 
 
-def generate_naca_antenna_profiles(
+def _plot_profile(shape, img_path, antenna_length, antenna_height):
+    figsize, color, fill_alpha, rect_alpha, grid_alpha = _PLOT_STYLE[shape.family]
+    fig = plt.figure(figsize=figsize)
+    plt.plot(shape.x, shape.y, "k-", linewidth=2)
+    plt.fill(shape.x, shape.y, color=color, alpha=fill_alpha)
+    rect = patches.Rectangle(
+        (shape.antenna_x, -antenna_height / 2),
+        antenna_length,
+        antenna_height,
+        linewidth=2,
+        edgecolor="red",
+        facecolor="red",
+        alpha=rect_alpha,
+    )
+    plt.gca().add_patch(rect)
+    plt.axis("equal")
+    plt.grid(True, linestyle="--", alpha=grid_alpha)
+    _save_png(fig, img_path)
+    return img_path
+
+
+def write_profiles(shapes, output_dir="generated_profiles", save_plots=False, antenna_length=4.5,
+                   antenna_height=0.3, skip_unchanged=False):
+    """Materializa un iterador de `ProfileShape`: todos los .dat en una pasada (y PNG opcionales).
+
+    skip_unchanged: no reescribe los .dat cuyo contenido no cambia (ver `dat_writer`).
+    Devuelve {nombre: {"dat": ruta, "img": ruta_png_opcional}}.
+    """
+    output = {}
+    out_dir = Path(output_dir)
+    _ensure_dir(out_dir)
+    if save_plots and plt is None:
+        _warn_matplotlib()
+        save_plots = False
+    entries = []
+    for shape in shapes:
+        dat_path = out_dir / f"{shape.name}.dat"
+        entries.append((dat_path, shape.header or shape.name, shape.x, shape.y, shape.line_fmt))
+        shape.dat = str(dat_path)
+        info = {"dat": shape.dat}
+        if save_plots:
+            img_path = out_dir / "img" / shape.family / f"{shape.name}.png"
+            info["img"] = str(_plot_profile(shape, img_path, antenna_length, antenna_height))
+        output[shape.name] = info
+    written = dat_writer.write_dat_files(entries, skip_unchanged=skip_unchanged)
+    if written < len(entries):
+        print(f"[OK] {len(entries) - written} .dat sin cambios; no se reescriben.")
+    return output
+
+
+def iter_naca_antenna_profiles(
     chord_start=4.6,
     chord_end=10.0,
     chord_step=0.1,
@@ -40,92 +146,150 @@ def generate_naca_antenna_profiles(
     antenna_length=4.5,
     antenna_height=0.3,
     n_points=200,
-    output_dir="generated_profiles",
-    save_plots=False,
 ):
-    output = {}
-    out_dir = Path(output_dir)
-    img_dir = out_dir / "img" / "naca_antenna"
-    _ensure_dir(out_dir)
-    if save_plots and plt is None:
-        _warn_matplotlib()
-        save_plots = False
+    """NACA 00xx de espesor minimo que aloja la antena, por cuerda y posicion (iterador perezoso)."""
 
-    def naca4_half_upper(chord, thickness_percent):
-        x = np.linspace(0, chord, n_points)
-        t = thickness_percent
-        yt = 5 * t * chord * (
+    def naca4_poly(x, chord):
+        # espesor NACA 00xx sin el factor 5*t*c: yt es lineal en t
+        return (
             0.2969 * np.sqrt(x / chord)
             - 0.1260 * (x / chord)
             - 0.3516 * (x / chord) ** 2
             + 0.2843 * (x / chord) ** 3
             - 0.1015 * (x / chord) ** 4
         )
-        return x, yt
 
-    def check_fit(x_perfil, y_perfil, c, pos_x_inicio):
-        x_end = pos_x_inicio + antenna_length
+    def min_fit_indices(c, posiciones_x):
+        """Indice en thickness_range del menor espesor que aloja la antena en cada posicion (-1 si ninguno).
+
+        Como y = (5*t*c) * poly(x) con factor positivo, min(y) sobre la zona es (5*t*c) * min(poly):
+        basta un minimo por posicion y una comparacion posiciones x espesores, con la misma aritmetica
+        que el chequeo punto a punto.
+        """
+        x = np.linspace(0, c, n_points)
+        poly = naca4_poly(x, c)
+        x_end = posiciones_x + antenna_length
+        zona = (x[None, :] >= posiciones_x[:, None]) & (x[None, :] <= x_end[:, None])
+        poly_min = np.where(zona, poly[None, :], np.inf).min(axis=1)
+        valida = (posiciones_x >= 0) & (x_end <= x[-1]) & zona.any(axis=1)
         h_req = antenna_height / 2
-        if pos_x_inicio < 0 or x_end > x_perfil[-1]:
-            return False
-        indices = (x_perfil >= pos_x_inicio) & (x_perfil <= x_end)
-        y_zona = y_perfil[indices]
-        if len(y_zona) == 0:
-            return False
         margen = 0.005
-        if np.min(y_zona) < (h_req + margen):
-            return False
-        return True
+        fits = ((5 * thickness_range * c)[None, :] * poly_min[:, None]) >= (h_req + margen)
+        fits &= valida[:, None]
+        return _first_true(fits)
 
     chords = np.arange(chord_start, chord_end + 1e-6, chord_step)
     thickness_range = np.arange(thickness_min, thickness_max + 1e-9, 0.01)
-    counter = 0
     for c in chords:
         espacio_libre = c - antenna_length
         if espacio_libre <= 0:
             continue
         posiciones_x = np.linspace(0.05, espacio_libre * 0.9, positions_count)
-        for pos_x in posiciones_x:
-            for t_pct in thickness_range:
-                x, y = naca4_half_upper(c, t_pct)
-                if check_fit(x, y, c, pos_x):
-                    t_pct_int = int(round(t_pct * 100))
-                    name = f"C{c:.1f}_NACA00{t_pct_int:02d}_Pos{pos_x:.2f}m"
-                    dat_path = out_dir / f"{name}.dat"
-                    with dat_path.open("w") as f:
-                        f.write(f"{name}\n")
-                        x_full = np.concatenate((x[::-1], x[1:]))
-                        y_full = np.concatenate((y[::-1], -y[1:]))
-                        for xi, yi in zip(x_full, y_full):
-                            f.write(f" {xi:.6f}  {yi:.6f}\n")
-                    info = {"dat": str(dat_path)}
-                    if save_plots:
-                        fig = plt.figure(figsize=(12, 5))
-                        plt.plot(x, y, "k-", linewidth=2)
-                        plt.plot(x, -y, "k-", linewidth=2)
-                        plt.fill_between(x, y, -y, color="lightgray", alpha=0.3)
-                        rect = patches.Rectangle(
-                            (pos_x, -antenna_height / 2),
-                            antenna_length,
-                            antenna_height,
-                            linewidth=2,
-                            edgecolor="red",
-                            facecolor="red",
-                            alpha=0.4,
-                        )
-                        plt.gca().add_patch(rect)
-                        plt.axis("equal")
-                        plt.grid(True, linestyle="--", alpha=0.6)
-                        img_path = img_dir / f"{name}.png"
-                        _save_png(fig, img_path)
-                        info["img"] = str(img_path)
-                    output[name] = info
-                    counter += 1
-                    break  # espesor mínimo válido para esta posición
-    print(f"[NACA-ANTENA] Generados {counter} perfiles.")
+        x = np.linspace(0, c, n_points)
+        poly = naca4_poly(x, c)
+        for pos_x, idx in zip(posiciones_x, min_fit_indices(c, posiciones_x)):
+            if idx < 0:
+                continue
+            t_pct = thickness_range[idx]
+            y = 5 * t_pct * c * poly
+            t_pct_int = int(round(t_pct * 100))
+            yield ProfileShape(
+                name=f"C{c:.1f}_NACA00{t_pct_int:02d}_Pos{pos_x:.2f}m",
+                x=np.concatenate((x[::-1], x[1:])),
+                y=np.concatenate((y[::-1], -y[1:])),
+                family="naca_antenna",
+                antenna_x=float(pos_x),
+            )
+
+
+def generate_naca_antenna_profiles(
+    chord_start=4.6,
+    chord_end=10.0,
+    chord_step=0.1,
+    thickness_min=0.02,
+    thickness_max=0.5,
+    positions_count=10,
+    antenna_length=4.5,
+    antenna_height=0.3,
+    n_points=200,
+    output_dir="generated_profiles",
+    save_plots=False,
+    skip_unchanged=False,
+):
+    shapes = iter_naca_antenna_profiles(chord_start, chord_end, chord_step, thickness_min, thickness_max,
+                                        positions_count, antenna_length, antenna_height, n_points)
+    output = write_profiles(shapes, output_dir, save_plots, antenna_length, antenna_height, skip_unchanged)
+    print(f"[NACA-ANTENA] Generados {len(output)} perfiles.")
     return output
 
 
+def rotodomo_min_thickness(chords, antenna_length=4.5, antenna_height=0.3, limit=0.99):
+    """Espesor relativo minimo (forma cerrada) de la elipse que contiene la antena centrada, por cuerda.
+
+    Con a = c/2 y la antena centrada, la esquina mas exigente cumple u + py^2/b^2 <= limit con
+    u = ((L/2)/a)^2, de donde b_min = py / sqrt(limit - u) y t_min = 2*b_min/c. NaN si no cabe.
+    """
+    chords = np.asarray(chords, dtype=float)
+    u = (antenna_length / chords) ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b_min = (antenna_height / 2.0) / np.sqrt(limit - u)
+    return np.where(u < limit, 2.0 * b_min / chords, np.nan)
+
+
+def iter_rotodomo_profiles(
+    chord_start=4.6,
+    chord_end=11.0,
+    chord_step=0.1,
+    thickness_min=0.05,
+    thickness_max=0.45,
+    antenna_length=4.5,
+    antenna_height=0.3,
+    n_points=200,
+    continuous=False,
+):
+    """Rotodomos elipticos de espesor minimo para toda la grilla de cuerdas a la vez (iterador perezoso).
+
+    Por defecto el espesor es el primero de la grilla de 0.01 que cumple el chequeo de esquinas;
+    con continuous=True se usa el minimo exacto (acotado a [thickness_min, thickness_max]) y el
+    nombre lleva el espesor con dos decimales en porcentaje.
+    """
+    chords = np.arange(chord_start, chord_end + 1e-6, chord_step)
+    chords = chords[chords - antenna_length > 0]
+    thickness_range = np.arange(thickness_min, thickness_max + 1e-9, 0.01)
+    pos_x = (chords / 2.0) - (antenna_length / 2.0)
+    a = chords / 2.0
+    cx = chords / 2.0
+
+    if continuous:
+        # margen relativo minimo para que el redondeo no deje la esquina justo fuera del limite
+        t_sel = np.maximum(rotodomo_min_thickness(chords, antenna_length, antenna_height) * (1 + 1e-9),
+                           thickness_min)
+        ok = t_sel <= thickness_max
+    else:
+        # chequeo de las cuatro esquinas de la antena para cuerdas x espesores de una vez
+        b = (chords[:, None] * thickness_range[None, :]) / 2.0
+        val = np.full(b.shape, -np.inf)
+        for px in (pos_x, pos_x + antenna_length):
+            for py in (antenna_height / 2.0, -antenna_height / 2.0):
+                val = np.maximum(val, ((px - cx) ** 2 / a**2)[:, None] + (py**2 / b**2))
+        idx = _first_true(val <= 0.99)
+        ok = idx >= 0
+        t_sel = thickness_range[np.maximum(idx, 0)] if thickness_range.size else np.zeros(chords.size)
+
+    chords, pos_x, a, cx, t_sel = chords[ok], pos_x[ok], a[ok], cx[ok], t_sel[ok]
+    b = (chords * t_sel) / 2.0
+    theta = np.linspace(0, 2 * np.pi, n_points)
+    xs = cx[:, None] + a[:, None] * np.cos(theta)[None, :]
+    ys = b[:, None] * np.sin(theta)[None, :]
+
+    for c, t_pct, px, x, y in zip(chords, t_sel, pos_x, xs, ys):
+        if continuous:
+            name = f"ROTO_c{c:.1f}_t{t_pct * 100:.2f}"
+        else:
+            name = f"ROTO_c{c:.1f}_t{int(round(t_pct * 100)):02d}"
+        yield ProfileShape(name=name, x=x, y=y, family="rotodomo", antenna_x=float(px))
+
+
 def generate_rotodomo_profiles(
     chord_start=4.6,
     chord_end=11.0,
@@ -137,77 +301,89 @@ def generate_rotodomo_profiles(
     n_points=200,
     output_dir="generated_profiles",
     save_plots=False,
+    continuous=False,
+    skip_unchanged=False,
 ):
-    output = {}
-    out_dir = Path(output_dir)
-    img_dir = out_dir / "img" / "rotodomo"
-    _ensure_dir(out_dir)
-    if save_plots and plt is None:
-        _warn_matplotlib()
-        save_plots = False
+    """Rotodomos de `iter_rotodomo_profiles`; todos los .dat se escriben en una sola pasada."""
+    shapes = iter_rotodomo_profiles(chord_start, chord_end, chord_step, thickness_min, thickness_max,
+                                    antenna_length, antenna_height, n_points, continuous=continuous)
+    output = write_profiles(shapes, output_dir, save_plots, antenna_length, antenna_height, skip_unchanged)
+    print(f"[ROTODO] Generados {len(output)} perfiles.")
+    return output
+
+
+def bezier_symmetric_family(chords, sharpness, thickness, n_points=200):
+    """Perfiles Bezier simetricos (extrados) para toda la grilla cuerda x sharpness x espesor de una vez.
+
+    Devuelve x con forma (C, S, 1, N) e y con forma (C, 1, T, N): x no depende del espesor ni y del
+    sharpness, asi que la familia completa se obtiene por broadcasting sin repetir curvas.
+    Mismos puntos de control que la curva original: P0=(0,0), P1=(c/2*0.5*s, 0), P2=(0.8*c/2, ymax), P3=(c/2, ymax).
+    """
+    chord = np.asarray(chords, dtype=float)[:, None, None, None]
+    sharp = np.asarray(sharpness, dtype=float)[None, :, None, None]
+    thick = np.asarray(thickness, dtype=float)[None, None, :, None]
+    t = np.linspace(0, 1, n_points // 2)
+    b1 = 3 * (1 - t) ** 2 * t
+    b2 = 3 * (1 - t) * t**2
+    b3 = t**3
+    half_chord = chord / 2.0
+    y_max = (chord * thick) / 2.0
+    # el termino de P0 y las componentes nulas de P1 suman 0.0 exacto
+    x_half = b1 * (half_chord * (0.5 * sharp)) + b2 * (half_chord * (1.0 - 0.2)) + b3 * half_chord
+    y_half = b2 * y_max + b3 * y_max
+    x_back = chord - x_half[..., ::-1]
+    y_back = y_half[..., ::-1]
+    x_total = np.concatenate([x_half, x_back[..., 1:]], axis=-1)
+    y_total = np.concatenate([y_half, y_back[..., 1:]], axis=-1)
+    return x_total, y_total
+
+
+def iter_bezier_profiles(
+    chord_start=6.0,
+    chord_end=10.0,
+    chord_step=0.5,
+    thickness_min=0.05,
+    thickness_max=0.55,
+    sharpness_list=None,
+    antenna_length=4.5,
+    antenna_height=0.3,
+    n_points=200,
+):
+    """Bezier de espesor minimo por (cuerda, sharpness), evaluados de una vez (iterador perezoso)."""
+    if sharpness_list is None:
+        sharpness_list = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
 
     chords = np.arange(chord_start, chord_end + 1e-6, chord_step)
+    sharpness = np.asarray(sharpness_list, dtype=float)
     thickness_range = np.arange(thickness_min, thickness_max + 1e-9, 0.01)
-    counter = 0
-    for c in chords:
-        espacio_libre = c - antenna_length
-        if espacio_libre <= 0:
-            continue
-        pos_x = (c / 2.0) - (antenna_length / 2.0)
-        for t_pct in thickness_range:
-            a = c / 2.0
-            b = (c * t_pct) / 2.0
-            cx = c / 2.0
-            # Chequeo matemático de las esquinas de la antena
-            esquinas = [
-                (pos_x, antenna_height / 2.0),
-                (pos_x + antenna_length, antenna_height / 2.0),
-                (pos_x, -antenna_height / 2.0),
-                (pos_x + antenna_length, -antenna_height / 2.0),
-            ]
-            fits = True
-            for (px, py) in esquinas:
-                val = ((px - cx) ** 2 / a**2) + (py**2 / b**2)
-                if val > 0.99:
-                    fits = False
-                    break
-            if not fits:
+    x, y_top = bezier_symmetric_family(chords, sharpness, thickness_range, n_points=n_points)
+
+    # chequeo de hueco vectorizado: ejes (cuerda, sharpness, espesor, punto)
+    pos_x = (chords / 2.0) - (antenna_length / 2.0)
+    x_end_antena = (pos_x + antenna_length)[:, None, None]
+    pos = pos_x[:, None, None]
+    zona = (x >= pos[..., None]) & (x <= x_end_antena[..., None])
+    valida = (pos >= x[..., 0]) & (x_end_antena <= x[..., -1]) & zona.any(axis=-1)
+    margen = 0.01
+    hueco = y_top - (-y_top)
+    hueco_min = np.where(zona, hueco, np.inf).min(axis=-1)
+    fits = (hueco_min >= (antenna_height + margen)) & valida
+    t_idx = _first_true(fits)
+
+    for i, c in enumerate(chords):
+        for j, sharp in enumerate(sharpness_list):
+            k = t_idx[i, j]
+            if k < 0:
                 continue
-            theta = np.linspace(0, 2 * np.pi, n_points)
-            x = cx + a * np.cos(theta)
-            y = b * np.sin(theta)
-            t_pct_int = int(round(t_pct * 100))
-            name = f"ROTO_c{c:.1f}_t{t_pct_int:02d}"
-            dat_path = out_dir / f"{name}.dat"
-            with dat_path.open("w") as f:
-                f.write(f"{name}\n")
-                for xi, yi in zip(x, y):
-                    f.write(f" {xi:.6f}  {yi:.6f}\n")
-            info = {"dat": str(dat_path)}
-            if save_plots:
-                fig = plt.figure(figsize=(10, 5))
-                plt.plot(x, y, "k-", linewidth=2)
-                plt.fill(x, y, color="lightgray", alpha=0.3)
-                rect = patches.Rectangle(
-                    (pos_x, -antenna_height / 2),
-                    antenna_length,
-                    antenna_height,
-                    linewidth=2,
-                    edgecolor="red",
-                    facecolor="red",
-                    alpha=0.5,
-                )
-                plt.gca().add_patch(rect)
-                plt.axis("equal")
-                plt.grid(True, linestyle="--", alpha=0.5)
-                img_path = img_dir / f"{name}.png"
-                _save_png(fig, img_path)
-                info["img"] = str(img_path)
-            output[name] = info
-            counter += 1
-            break  # espesor mínimo válido para este diámetro
-    print(f"[ROTODO] Generados {counter} perfiles.")
-    return output
+            t_pct_int = int(round(thickness_range[k] * 100))
+            xs, ys = x[i, j, 0], y_top[i, 0, k]
+            yield ProfileShape(
+                name=f"SYM_c{c:.1f}_s{int(sharp*10)}_t{t_pct_int:02d}",
+                x=np.concatenate((xs, xs[::-1])),
+                y=np.concatenate((ys, -ys[::-1])),
+                family="bezier",
+                antenna_x=float(pos_x[i]),
+            )
 
 
 def generate_bezier_profiles(
@@ -222,97 +398,10 @@ def generate_bezier_profiles(
     n_points=200,
     output_dir="generated_profiles",
     save_plots=False,
+    skip_unchanged=False,
 ):
-    output = {}
-    out_dir = Path(output_dir)
-    img_dir = out_dir / "img" / "bezier"
-    _ensure_dir(out_dir)
-    if save_plots and plt is None:
-        _warn_matplotlib()
-        save_plots = False
-    if sharpness_list is None:
-        sharpness_list = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
-
-    def bezier_symmetric_profile(chord, thickness_percent, sharpness=0.5):
-        half_chord = chord / 2.0
-        y_max = (chord * thickness_percent) / 2.0
-        P0 = np.array([0.0, 0.0])
-        P3 = np.array([half_chord, y_max])
-        P1 = np.array([half_chord * (0.5 * sharpness), 0.0])
-        P2 = np.array([half_chord * (1.0 - 0.2), y_max])
-        t = np.linspace(0, 1, n_points // 2)
-        curve_half = (
-            np.outer((1 - t) ** 3, P0)
-            + np.outer(3 * (1 - t) ** 2 * t, P1)
-            + np.outer(3 * (1 - t) * t**2, P2)
-            + np.outer(t**3, P3)
-        )
-        x_half = curve_half[:, 0]
-        y_half = curve_half[:, 1]
-        x_back = chord - x_half[::-1]
-        y_back = y_half[::-1]
-        x_total = np.concatenate([x_half, x_back[1:]])
-        y_total = np.concatenate([y_half, y_back[1:]])
-        return x_total, y_total
-
-    def check_fit(x_perfil, y_top, y_bot, pos_x_inicio):
-        x_end_antena = pos_x_inicio + antenna_length
-        if pos_x_inicio < x_perfil[0] or x_end_antena > x_perfil[-1]:
-            return False
-        indices = (x_perfil >= pos_x_inicio) & (x_perfil <= x_end_antena)
-        y_techo_zona = y_top[indices]
-        y_suelo_zona = y_bot[indices]
-        if len(y_techo_zona) == 0:
-            return False
-        margen = 0.01
-        hueco = y_techo_zona - y_suelo_zona
-        if np.min(hueco) < (antenna_height + margen):
-            return False
-        return True
-
-    chords = np.arange(chord_start, chord_end + 1e-6, chord_step)
-    thickness_range = np.arange(thickness_min, thickness_max + 1e-9, 0.01)
-    counter = 0
-    for c in chords:
-        pos_x = (c / 2.0) - (antenna_length / 2.0)
-        for sharp in sharpness_list:
-            for t_pct in thickness_range:
-                x, y_top = bezier_symmetric_profile(c, t_pct, sharpness=sharp)
-                y_bot = -y_top
-                if not check_fit(x, y_top, y_bot, pos_x):
-                    continue
-                t_pct_int = int(round(t_pct * 100))
-                name = f"SYM_c{c:.1f}_s{int(sharp*10)}_t{t_pct_int:02d}"
-                dat_path = out_dir / f"{name}.dat"
-                with dat_path.open("w") as f:
-                    f.write(f"{name}\n")
-                    for xi, yi in zip(x, y_top):
-                        f.write(f" {xi:.6f}  {yi:.6f}\n")
-                    for xi, yi in zip(x[::-1], y_bot[::-1]):
-                        f.write(f" {xi:.6f}  {yi:.6f}\n")
-                info = {"dat": str(dat_path)}
-                if save_plots:
-                    fig = plt.figure(figsize=(12, 4))
-                    plt.plot(x, y_top, "k-", linewidth=2)
-                    plt.plot(x, y_bot, "k-", linewidth=2)
-                    plt.fill_between(x, y_top, y_bot, color="cyan", alpha=0.1)
-                    rect = patches.Rectangle(
-                        (pos_x, -antenna_height / 2),
-                        antenna_length,
-                        antenna_height,
-                        linewidth=2,
-                        edgecolor="red",
-                        facecolor="red",
-                        alpha=0.5,
-                    )
-                    plt.gca().add_patch(rect)
-                    plt.axis("equal")
-                    plt.grid(True, linestyle="--", alpha=0.5)
-                    img_path = img_dir / f"{name}.png"
-                    _save_png(fig, img_path)
-                    info["img"] = str(img_path)
-                output[name] = info
-                counter += 1
-                break  # espesor mínimo para este sharpness
-    print(f"[BEZIER] Generados {counter} perfiles.")
+    shapes = iter_bezier_profiles(chord_start, chord_end, chord_step, thickness_min, thickness_max,
+                                  sharpness_list, antenna_length, antenna_height, n_points)
+    output = write_profiles(shapes, output_dir, save_plots, antenna_length, antenna_height, skip_unchanged)
+    print(f"[BEZIER] Generados {len(output)} perfiles.")
     return output
@@ -0,0 +1,142 @@
+"""
+Almacen binario de perfiles.
+Todas las coordenadas van a un unico `.npy` (float64, forma (N_total, 2)) con un indice JSON al lado
+({nombre: [inicio, n_puntos, formato_de_linea, cabecera]}; los almacenes viejos solo tienen las dos
+primeras). Se abre con np.load(mmap_mode="r"), asi que cada perfil es una vista del archivo mapeado: ni
+se parsea texto ni se copian datos.
+
+Un perfil del almacen se referencia como "<ruta.npy>#<nombre>" en cualquier sitio donde antes iba la
+ruta del .dat (`mesh_generator.load_airfoil_points`, `surrogate.load_coordinates`, `Airfoil.from_store`).
+Si alguna herramienta externa necesita el texto, `export_dat` escribe los .dat bajo demanda.
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+import dat_writer
+
+STORE_NAME = "profiles.npy"
+INDEX_SUFFIX = ".index.json"
+REF_SEP = "#"
+
+# almacenes abiertos: ruta -> (mtime, datos mapeados, indice)
+_stores = {}
+
+
+def index_path(store_path):
+    """Ruta del indice JSON que acompana al .npy."""
+    store_path = str(store_path)
+    return (store_path[:-4] if store_path.endswith(".npy") else store_path) + INDEX_SUFFIX
+
+
+def make_ref(store_path, name):
+    return f"{store_path}{REF_SEP}{name}"
+
+
+def is_ref(path):
+    """True si `path` apunta a un perfil dentro de un almacen ("<ruta.npy>#<nombre>")."""
+    store, sep, name = str(path).rpartition(REF_SEP)
+    return bool(sep and name and store.endswith(".npy"))
+
+
+def split_ref(ref):
+    store, _, name = str(ref).rpartition(REF_SEP)
+    return store, name
+
+
+def profile_name(path):
+    """Nombre del perfil: el de la referencia al almacen o el del .dat sin extension."""
+    return split_ref(path)[1] if is_ref(path) else Path(path).stem
+
+
+def write_store(shapes, store_path):
+    """Empaqueta perfiles (objetos con name, x, y, p.ej. `ProfileShape`) en un .npy + indice.
+
+    Devuelve {nombre: {"dat": referencia}} con la misma forma que los generadores.
+    """
+    store_path = Path(store_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    blocks, index, offset = [], {}, 0
+    for shape in shapes:
+        coords = np.column_stack((shape.x, shape.y)).astype(np.float64, copy=False)
+        # formato y cabecera del .dat de la familia, para que export_dat lo reproduzca byte a byte
+        index[shape.name] = [offset, len(coords), getattr(shape, "line_fmt", dat_writer.PROFILE_LINE),
+                             getattr(shape, "header", None) or shape.name]
+        blocks.append(coords)
+        offset += len(coords)
+    data = np.concatenate(blocks) if blocks else np.empty((0, 2))
+
+    # publicacion atomica: primero los datos, despues el indice que los describe
+    tmp = f"{store_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, data)
+    os.replace(tmp, store_path)
+    tmp_index = f"{index_path(store_path)}.{os.getpid()}.tmp"
+    Path(tmp_index).write_text(json.dumps(index), encoding="utf-8")
+    os.replace(tmp_index, index_path(store_path))
+    _stores.pop(str(store_path), None)
+    print(f"[STORE] {len(index)} perfiles empaquetados en {store_path}")
+    return {name: {"dat": make_ref(store_path, name)} for name in index}
+
+
+def open_store(store_path):
+    """(datos mapeados en memoria, indice) del almacen; se reabre solo si el archivo cambio."""
+    key = str(store_path)
+    mtime = os.path.getmtime(key)
+    cached = _stores.get(key)
+    if cached is None or cached[0] != mtime:
+        data = np.load(key, mmap_mode="r")
+        index = json.loads(Path(index_path(key)).read_text(encoding="utf-8"))
+        cached = _stores[key] = (mtime, data, index)
+    return cached[1], cached[2]
+
+
+def list_profiles(store_path):
+    return list(open_store(store_path)[1])
+
+
+def load_points(ref):
+    """Coordenadas (N, 2) de un perfil del almacen, como vista de solo lectura sobre el archivo."""
+    store_path, name = split_ref(ref)
+    data, index = open_store(store_path)
+    try:
+        start, count = index[name][:2]
+    except KeyError:
+        raise KeyError(f"El perfil {name} no está en {store_path}") from None
+    return data[start:start + count]
+
+
+def export_dat(store_path, output_dir, names=None, skip_unchanged=True):
+    """Escribe los .dat de los perfiles pedidos (todos por defecto). Devuelve {nombre: {"dat": ruta}}."""
+    data, index = open_store(store_path)
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    entries, output = [], {}
+    for name in (names if names is not None else index):
+        start, count, line_fmt, header = (index[name] + [dat_writer.PROFILE_LINE, name])[:4]
+        pts = data[start:start + count]
+        dat_path = out_dir / f"{name}.dat"
+        entries.append((dat_path, header, pts[:, 0], pts[:, 1], line_fmt))
+        output[name] = {"dat": str(dat_path)}
+    dat_writer.write_dat_files(entries, skip_unchanged=skip_unchanged)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta a .dat perfiles de un almacen profiles.npy")
+    parser.add_argument("store", type=Path, help="Ruta del almacen (.npy)")
+    parser.add_argument("--output-dir", type=Path, default=Path("generated_profiles"), help="Carpeta de los .dat")
+    parser.add_argument("--names", type=str, default=None, help="Perfiles a exportar, separados por coma (default: todos)")
+    args = parser.parse_args(argv)
+    names = [n.strip() for n in args.names.split(",") if n.strip()] if args.names else None
+    out = export_dat(args.store, args.output_dir, names)
+    print(f"[STORE] {len(out)} perfiles exportados a {args.output_dir}")
+    return out
+
+
+if __name__ == "__main__":
+    main()
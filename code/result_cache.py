@@ -0,0 +1,102 @@
+"""
+Cache persistente de resultados de SU2.
+Clave: sha256 de la malla + config renderizada (normalizada) + huella del solver (backend, binario,
+mtime:tamano). Solo se guardan corridas convergidas; al volver a pedir el mismo punto, `run_su2`
+restaura sus archivos en el output_dir y devuelve los coeficientes sin lanzar SU2.
+
+Se activa con la variable SU2_RESULT_CACHE (directorio); `main.py` la define en results/_cache
+salvo con --no-result-cache. Asi los workers del scheduler la heredan aunque cambien de cwd.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+RESULT_CACHE_DIR = "results/_cache"
+RESULT_FILE = "result.json"
+# Version del esquema de la clave; subirla invalida todo el cache
+KEY_VERSION = 1
+
+# Claves del .cfg que no cambian la solucion: rutas (la malla entra por su hash),
+# arranque desde restart (la solucion convergida no depende del punto de partida) y salidas
+VOLATILE_KEYS = {
+    "MESH_FILENAME", "BREAKDOWN_FILENAME", "RESTART_FILENAME", "SOLUTION_FILENAME",
+    "RESTART_SOL", "READ_BINARY_RESTART", "OUTPUT_FILES", "OUTPUT_WRT_FREQ",
+    "CONV_FILENAME", "VOLUME_FILENAME", "SURFACE_FILENAME",
+}
+
+
+def cache_dir_from_env():
+    """Directorio del cache (SU2_RESULT_CACHE) o None si esta desactivado."""
+    return os.environ.get("SU2_RESULT_CACHE") or None
+
+
+def normalized_config(cfg_file):
+    """Lineas KEY=valor del .cfg sin comentarios, espacios ni claves volatiles, ordenadas."""
+    entries = []
+    with open(cfg_file, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.split("%", 1)[0].strip()
+            if "=" not in line:
+                continue
+            key, value = (p.strip() for p in line.split("=", 1))
+            key = key.upper()
+            if key in VOLATILE_KEYS:
+                continue
+            entries.append(f"{key}={' '.join(value.split())}")
+    return "\n".join(sorted(entries))
+
+
+def result_key(mesh_hash, cfg_file, solver_stamp, extra=None):
+    """Clave del caso: malla + config normalizada + solver (+ opciones que alteran el resultado)."""
+    h = hashlib.sha256()
+    h.update(f"v{KEY_VERSION}\n{mesh_hash}\n{solver_stamp}\n".encode())
+    h.update(normalized_config(cfg_file).encode())
+    if extra:
+        h.update(json.dumps(extra, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def contains(cache_dir, key):
+    """True si `key` esta publicada en el cache."""
+    return (Path(cache_dir) / key / RESULT_FILE).is_file()
+
+
+def restore(cache_dir, key, output_dir):
+    """Copia al output_dir los archivos de una corrida cacheada. Devuelve la tupla de run_su2 o None."""
+    entry = Path(cache_dir) / key
+    try:
+        data = json.loads((entry / RESULT_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    for path in entry.iterdir():
+        if path.name != RESULT_FILE and path.is_file():
+            shutil.copy2(path, os.path.join(output_dir, path.name))
+    return tuple(data["result"])
+
+
+def store(cache_dir, key, output_dir, result, skip=()):
+    """Guarda los archivos del output_dir y la tupla `result` bajo `key` (publicacion atomica)."""
+    entry = Path(cache_dir) / key
+    if entry.exists():
+        return
+    tmp = Path(cache_dir) / f".{key}.{uuid.uuid4().hex}.tmp"
+    try:
+        tmp.mkdir(parents=True)
+        for name in os.listdir(output_dir):
+            src = os.path.join(output_dir, name)
+            if name in skip or not os.path.isfile(src):
+                continue
+            shutil.copy2(src, tmp / name)
+        (tmp / RESULT_FILE).write_text(json.dumps({"result": list(result)}), encoding="utf-8")
+        os.replace(tmp, entry)
+    except OSError as e:
+        # otro proceso pudo publicar la misma clave primero; el cache nunca debe tumbar la corrida
+        if not entry.exists():
+            print(f"[WARN] No se pudo guardar el resultado en el cache {entry}: {e}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
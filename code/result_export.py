@@ -0,0 +1,179 @@
+"""
+Exportacion incremental del CSV combinado (NeuralFoil + SU2).
+Las filas se agregan a medida que termina cada caso SU2 o cada bloque de NeuralFoil y el archivo se
+vacia a disco tras cada entrega: si un barrido largo se corta, el CSV ya tiene todo lo terminado.
+Las copias secundarias (p.ej. results/simulations_clcdcm.csv) salen del mismo flujo (tee), sin una
+segunda escritura completa al final y sin acumular las filas en memoria.
+
+Un destino con extension .parquet, .arrow o .feather se escribe en formato columnar (pyarrow, opcional)
+en lotes de BATCH_ROWS filas: `airfoil_comparison` lo lee leyendo solo las columnas necesarias y filtrando
+solver/alpha en la lectura. A diferencia del CSV, el archivo columnar solo es legible una vez cerrado.
+"""
+
+import csv
+import os
+from pathlib import Path
+
+try:  # pyarrow es opcional: solo hace falta para destinos .parquet/.arrow
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FIELDNAMES = ["solver", "airfoil", "alpha", "Re", "mach", "CL", "CD", "CM"]
+TEXT_FIELDS = ("solver", "airfoil")
+# extension -> formato columnar
+COLUMNAR_FORMATS = {".parquet": "parquet", ".arrow": "ipc", ".feather": "ipc"}
+# filas por row group (Parquet) o record batch (Arrow)
+BATCH_ROWS = 65536
+
+
+def columnar_format(path):
+    """"parquet", "ipc" o None segun la extension del archivo."""
+    return COLUMNAR_FORMATS.get(Path(path).suffix.lower())
+
+
+def _require_pyarrow(path):
+    if pa is None:
+        raise ImportError(f"pyarrow no está instalado; no se puede escribir/leer {path} (pip install pyarrow)")
+
+
+def _number(value):
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ColumnarWriter:
+    """Destino Parquet o Arrow IPC: acumula hasta `batch_rows` filas y escribe un row group por lote."""
+
+    def __init__(self, path, fieldnames=FIELDNAMES, batch_rows=BATCH_ROWS):
+        _require_pyarrow(path)
+        self.path = str(path)
+        self.format = columnar_format(path) or "parquet"
+        self.fieldnames = list(fieldnames)
+        self.batch_rows = batch_rows
+        self.schema = pa.schema([(k, pa.string() if k in TEXT_FIELDS else pa.float64()) for k in self.fieldnames])
+        self._columns = {k: [] for k in self.fieldnames}
+        self._pending = 0
+        self._sink = None
+        self._writer = None
+
+    def write(self, rows):
+        for r in rows:
+            for k in self.fieldnames:
+                value = r.get(k)
+                self._columns[k].append(("" if value is None else str(value)) if k in TEXT_FIELDS else _number(value))
+            self._pending += 1
+            if self._pending >= self.batch_rows:
+                self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self.schema)
+        if self._writer is None:
+            os.makedirs(Path(self.path).parent, exist_ok=True)
+            if self.format == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self._sink = pa.OSFile(self.path, "wb")
+                self._writer = pa.ipc.new_file(self._sink, self.schema)
+        self._writer.write_table(table)
+        self._columns = {k: [] for k in self.fieldnames}
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+class CSVWriter:
+    """Destino CSV: cabecera al abrir y flush tras cada entrega."""
+
+    def __init__(self, path, fieldnames=FIELDNAMES):
+        self.path = str(path)
+        self.fieldnames = list(fieldnames)
+        os.makedirs(Path(self.path).parent, exist_ok=True)
+        self._file = open(self.path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def open_writer(path, fieldnames=FIELDNAMES):
+    """CSVWriter o ColumnarWriter segun la extension de `path`."""
+    if columnar_format(path):
+        return ColumnarWriter(path, fieldnames)
+    return CSVWriter(path, fieldnames)
+
+
+class CSVTee:
+    """Escribe las mismas filas en uno o varios CSV a medida que llegan.
+
+    Los archivos se crean con la primera fila (sin filas no se toca nada, como el export historico).
+    Las rutas .parquet/.arrow/.feather se escriben en formato columnar (`ColumnarWriter`).
+    `listeners` reciben cada entrega de filas despues de escribirla (p.ej. un ranking en vivo).
+    Uso: `with CSVTee([ruta, copia]) as out: out.write(filas)`.
+    """
+
+    def __init__(self, paths, fieldnames=FIELDNAMES, listeners=()):
+        self.paths = []
+        for path in paths:
+            if path and all(Path(path) != Path(p) for p in self.paths):
+                self.paths.append(str(path))
+        if pa is None:
+            # fallar al inicio y no al final de una corrida larga
+            for path in self.paths:
+                if columnar_format(path):
+                    _require_pyarrow(path)
+        self.fieldnames = list(fieldnames)
+        self.listeners = list(listeners)
+        self.count = 0
+        self.closed = False
+        self._writers = []
+
+    def write(self, rows):
+        """Agrega filas (dicts) a todos los destinos y las deja en disco."""
+        rows = [{k: r.get(k, "") for k in self.fieldnames} for r in rows]
+        if not rows:
+            return
+        if not self._writers:
+            self._writers = [open_writer(path, self.fieldnames) for path in self.paths]
+        for writer in self._writers:
+            writer.write(rows)
+        self.count += len(rows)
+        for listener in self.listeners:
+            listener(rows)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if not self._writers:
+            print("[CSV] No hay datos para exportar.")
+            return
+        for writer in self._writers:
+            writer.close()
+        for path in self.paths:
+            print(f"[CSV] Exportado a {path} ({self.count} filas)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
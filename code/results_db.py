@@ -0,0 +1,119 @@
+"""
+Resumen de casos SU2 en SQLite (results/summary.sqlite) en lugar de reescribir summary.csv.
+Cada caso se registra con un upsert por nombre de caso: coste constante por caso y sin carreras entre
+procesos (modo WAL + busy timeout, SQLite serializa a los escritores). `summary.csv` se exporta desde la
+base cuando se pide (al final de cada barrido de `scheduler.run_cases`) con las mismas columnas y el mismo
+orden de filas que antes: la ultima corrida de un caso queda al final.
+"""
+
+import csv
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+DB_NAME = "summary.sqlite"
+CSV_NAME = "summary.csv"
+SUMMARY_FIELDS = [
+    "timestamp", "case", "dat_file", "aoa", "mach", "Re",
+    "CL_inv", "CD_inv", "CM_inv", "INV_converged", "INV_final_iter", "INV_final_rms",
+    "CL_visc", "CD_visc", "CM_visc", "VIS_converged", "VIS_final_iter", "VIS_final_rms",
+]
+# Espera maxima (s) por el lock de escritura cuando varios workers registran a la vez
+BUSY_TIMEOUT = 60.0
+
+_COLUMNS = ", ".join(f'"{f}"' for f in SUMMARY_FIELDS)
+
+
+def _sql_value(value):
+    """Valor tal cual lo escribia csv.writer: None vacio, bool como 'True'/'False', numpy a Python."""
+    if isinstance(value, (bool, np.bool_)):
+        return str(bool(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def connect(db_path):
+    """Abre (y crea si hace falta) la base; al crearla importa un summary.csv previo si lo hay."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if not _has_table(conn):
+        # se vuelve a mirar con el lock de escritura: solo un proceso crea la tabla e importa el CSV
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not _has_table(conn):
+                conn.execute(f'CREATE TABLE summary ({_COLUMNS}, PRIMARY KEY ("case"))')
+                _import_csv(conn, db_path.parent / CSV_NAME)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            conn.close()
+            raise
+    return conn
+
+
+def _has_table(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='summary'").fetchone() is not None
+
+
+def _import_csv(conn, csv_path):
+    """Migra las filas de un summary.csv escrito por versiones anteriores."""
+    try:
+        with open(csv_path, "r", newline="") as f:
+            prev = list(csv.DictReader(f))
+    except OSError:
+        return
+    for row in prev:
+        if row.get("case"):
+            _upsert(conn, {k: (row.get(k) or None) for k in SUMMARY_FIELDS})
+
+
+def _upsert(conn, row):
+    # INSERT OR REPLACE borra la fila previa del caso: la nueva queda al final, como en el CSV historico
+    conn.execute(
+        f"INSERT OR REPLACE INTO summary ({_COLUMNS}) VALUES ({', '.join('?' * len(SUMMARY_FIELDS))})",
+        [_sql_value(row.get(k)) for k in SUMMARY_FIELDS],
+    )
+
+
+def record(db_path, row):
+    """Registra (o reemplaza) la fila de un caso; `row` es un dict con las claves de SUMMARY_FIELDS."""
+    conn = connect(db_path)
+    try:
+        with conn:
+            _upsert(conn, row)
+    finally:
+        conn.close()
+
+
+def rows(db_path):
+    """Filas del resumen como dicts, en orden de registro."""
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(f"SELECT {_COLUMNS} FROM summary ORDER BY rowid")
+        return [dict(zip(SUMMARY_FIELDS, r)) for r in cur]
+    finally:
+        conn.close()
+
+
+def export_csv(db_path, csv_path=None):
+    """Escribe summary.csv desde la base (publicacion atomica). Devuelve la ruta o None si no hay base."""
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return None
+    csv_path = Path(csv_path) if csv_path else db_path.parent / CSV_NAME
+    tmp = f"{csv_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_FIELDS)
+        for row in rows(db_path):
+            writer.writerow([row[k] for k in SUMMARY_FIELDS])
+    os.replace(tmp, csv_path)
+    return csv_path
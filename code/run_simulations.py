@@ -10,9 +10,18 @@ MAX_ITER = 1000
 CFL = None  # e.g. 2.0
 MESH_FILE = None  # e.g. "meshes/n0012_897-257.su2"
 RETRIES = 0
+JOBS = 1  # casos SU2 simultaneos (0 = auto)
+MPI_RANKS = 1  # procesos MPI por caso (0 = auto segun nucleos y JOBS)
+EARLY_STOP_TOL = None  # p.ej. 1e-5: corta SU2 cuando CL/CD se estabilizan
+WARM_START = False  # cada punto del barrido arranca desde el restart del vecino (misma malla)
 COMPRESSIBLE = False
 SKIP_SU2 = True
 SKIP_AEROSB = True
+SURROGATE_JOBS = 1  # procesos para el cribado NeuralFoil (0 = todos los nucleos)
+SURROGATE_RESUME = False  # retoma un cribado interrumpido desde results/surrogate_screening.csv
+FUNNEL_TOP_K = None  # p.ej. 10: NeuralFoil para todos y SU2 solo para los mejores (modo embudo)
+PROFILE_STORE = False  # empaqueta los perfiles en generated_profiles/profiles.npy en vez de miles de .dat
+STREAM_PROFILES = False  # perfiles en memoria de a uno: NeuralFoil/SU2 arrancan sin escribir antes todos los .dat
 EXPORT_CSV = "results/combined_results.csv"
 PROFILE_TYPES = ["rotodomo"]  # opciones: naca,naca_antenna,rotodomo,bezier,all
 PROFILES_OUTPUT = "generated_profiles"
@@ -31,7 +40,7 @@ BEZ_C_RANGE = (6.0, 7.3, 0.1)
 BEZ_T_RANGE = (0.05, 0.55)
 BEZ_SHARPNESS = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
 RUN_COMPARISON = True
-COMPARISON_METRIC = "cd_mean"  # cd_mean, cd_min, cl_mean, clcd_mean, clcd_max
+COMPARISON_METRIC = "cd_mean"  # cd_mean, cd_min, cl_mean, clcd_mean, clcd_max (varias separadas por coma)
 COMPARISON_SOLVER = None  # e.g. "su2-incomp" o "aerosandbox-neuralfoil"
 COMPARISON_AOA_MIN = None
 COMPARISON_AOA_MAX = None
@@ -39,6 +48,7 @@ COMPARISON_OUTPUT = "results/airfoil_rankings.csv"
 PLOT_COMPARISON = True
 PLOT_DIR = None  # usa default si None
 PLOT_TOP_N = 20
+COMPARISON_STREAM = False  # ranking incremental con memoria acotada (sin polar)
 # --- Fin config editable ---
 
 
@@ -123,6 +133,8 @@ def build_cmd():
             cmd.append("--plot-comparison")
         if PLOT_DIR:
             cmd += ["--plot-dir", PLOT_DIR]
+        if COMPARISON_STREAM:
+            cmd.append("--comparison-stream")
     if CFL is not None:
         cmd += ["--cfl", str(CFL)]
     if MESH_FILE:
@@ -133,8 +145,26 @@ def build_cmd():
         cmd.append("--skip-su2")
     if SKIP_AEROSB:
         cmd.append("--skip-aerosb")
+    if SURROGATE_JOBS != 1:
+        cmd += ["--surrogate-jobs", str(SURROGATE_JOBS)]
+    if SURROGATE_RESUME:
+        cmd.append("--surrogate-resume")
+    if FUNNEL_TOP_K:
+        cmd += ["--funnel", "--funnel-top-k", str(FUNNEL_TOP_K)]
+    if STREAM_PROFILES:
+        cmd.append("--stream-profiles")
+    if PROFILE_STORE:
+        cmd.append("--profile-store")
     if RETRIES:
         cmd += ["--retries", str(RETRIES)]
+    if JOBS != 1:
+        cmd += ["--jobs", str(JOBS)]
+    if MPI_RANKS != 1:
+        cmd += ["--mpi-ranks", str(MPI_RANKS)]
+    if EARLY_STOP_TOL:
+        cmd += ["--early-stop-tol", str(EARLY_STOP_TOL)]
+    if WARM_START:
+        cmd.append("--warm-start")
     if NORMALIZE_PROFILES:
         cmd.append("--normalize-profiles")
     if SAVE_PROFILE_PLOTS:
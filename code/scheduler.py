@@ -0,0 +1,202 @@
+"""
+Planificador de casos SU2 con un pool de procesos acotado.
+Cada caso (perfil x AoA x Mach x Re) se ejecuta en su propio directorio de trabajo
+(`work/<caso>`) para que los archivos temporales de Gmsh/SU2 no se pisen entre casos.
+Los resultados se devuelven en el mismo orden en que se enviaron los casos.
+`plan_resources` reparte los nucleos de la maquina entre casos simultaneos y procesos MPI por caso.
+Con `warm_start` los casos que comparten malla forman una cadena (`plan_chains`) que corre en serie
+dentro de un mismo worker: cada punto arranca desde el restart del punto completado mas cercano.
+"""
+
+import math
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pipeline
+
+WORK_DIR = "work"
+
+
+def plan_resources(n_cases, jobs=None, mpi_ranks=None, cores=None):
+    """Decide (jobs, mpi_ranks) para no sobresuscribir el nodo.
+
+    jobs / mpi_ranks en None o 0 significan "auto":
+    - ambos fijos: se respetan (aviso si jobs*ranks supera los nucleos).
+    - solo jobs fijo: ranks = nucleos // jobs  (p.ej. 4 casos x 8 ranks en 32 nucleos).
+    - solo ranks fijo: jobs = nucleos // ranks (sin superar el numero de casos).
+    - ambos auto: un caso por nucleo y, si sobran nucleos, se reparten como ranks MPI.
+    """
+    cores = int(cores or os.cpu_count() or 1)
+    n_cases = max(1, int(n_cases))
+    jobs = int(jobs) if jobs else 0
+    mpi_ranks = int(mpi_ranks) if mpi_ranks else 0
+    if jobs and mpi_ranks:
+        if jobs * mpi_ranks > cores:
+            print(f"[WARN] {jobs} casos x {mpi_ranks} ranks MPI superan los {cores} nucleos disponibles")
+        return jobs, mpi_ranks
+    if jobs:
+        return jobs, max(1, cores // min(jobs, n_cases))
+    if mpi_ranks:
+        return max(1, min(n_cases, cores // mpi_ranks)), mpi_ranks
+    jobs = min(n_cases, cores)
+    return jobs, max(1, cores // jobs)
+
+
+def _run_case_isolated(root_dir, case):
+    """Ejecuta un caso con cwd = root/work/<caso>; las salidas siguen yendo a root/meshes y root/results."""
+    work_dir = Path(root_dir) / WORK_DIR / case["case_name"]
+    work_dir.mkdir(parents=True, exist_ok=True)
+    prev_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        res = pipeline.run_case(root_dir=root_dir, **case)
+    finally:
+        os.chdir(prev_cwd)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return res
+
+
+def _absolute_case(case):
+    """Las rutas relativas dejan de valer al cambiar de cwd dentro del worker."""
+    case = dict(case)
+    case["dat_file"] = os.path.abspath(case["dat_file"])
+    if case.get("mesh_override"):
+        case["mesh_override"] = os.path.abspath(case["mesh_override"])
+    return case
+
+
+def plan_chains(cases):
+    """Agrupa los casos que comparten malla (mismo perfil o malla provista y mismo solver).
+
+    Devuelve listas de indices de `cases`, cada una ordenada por (Re, Mach, AoA) para que
+    los puntos consecutivos de una polar queden uno al lado del otro.
+    """
+    chains = {}
+    for i, case in enumerate(cases):
+        key = (os.path.abspath(case["dat_file"]), case.get("mesh_override"), bool(case.get("incompressible")))
+        chains.setdefault(key, []).append(i)
+    return [
+        sorted(idx, key=lambda i: (cases[i].get("Re", 0.0), cases[i].get("mach", 0.0), cases[i].get("aoa", 0.0)))
+        for idx in chains.values()
+    ]
+
+
+def _condition_distance(a, b):
+    """Distancia entre condiciones de vuelo: 2 grados de AoA ~ 0.05 de Mach ~ una decada de Re."""
+    d = abs(a.get("aoa", 0.0) - b.get("aoa", 0.0)) / 2.0
+    d += abs(a.get("mach", 0.0) - b.get("mach", 0.0)) / 0.05
+    re_a, re_b = a.get("Re") or 1.0, b.get("Re") or 1.0
+    return d + abs(math.log10(re_a) - math.log10(re_b))
+
+
+def _run_chain(root_dir, chain, isolated=True):
+    """Corre una cadena de casos en serie; cada caso toma como donor el completado mas cercano.
+
+    En modo aislado (worker del pool) un caso que falla no corta la cadena.
+    """
+    results = []
+    done = []  # (caso, directorio de resultados) de los casos con solucion
+    for case in chain:
+        case = dict(case, warm_start=True)
+        if done:
+            donor_case, donor_dir = min(done, key=lambda d: _condition_distance(d[0], case))
+            case["restart_from"] = donor_dir
+            print(f"[SCHED] {case['case_name']} arranca desde {donor_case['case_name']}")
+        if isolated:
+            try:
+                res = _run_case_isolated(root_dir, case)
+            except Exception as e:
+                print(f"[ERROR] Caso {case['case_name']} falló: {e}")
+                res = {"case": case["case_name"], "inviscid": None, "viscous": None, "error": str(e)}
+        else:
+            res = pipeline.run_case(**case)
+        results.append(res)
+        if isinstance(res, dict) and (res.get("viscous") or res.get("inviscid")):
+            done.append((case, str(Path(root_dir) / pipeline.SU2_RESULTS_DIR / case["case_name"])))
+    return results
+
+
+def _run_chains(cases, jobs, on_result):
+    """Variante de `run_cases` con continuacion: la unidad de trabajo es la cadena, no el caso."""
+    root_dir = os.getcwd()
+    chains = plan_chains(cases)
+    results = [None] * len(cases)
+    workers = min(int(jobs or 1), len(chains))
+    if workers <= 1:
+        for idx in chains:
+            for i, res in zip(idx, _run_chain(root_dir, [cases[i] for i in idx], isolated=False)):
+                results[i] = res
+                on_result(res)
+        return results
+
+    print(f"[SCHED] {len(cases)} casos en {len(chains)} cadenas de continuación con {workers} procesos")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_chain, root_dir, [_absolute_case(cases[i]) for i in idx]): idx
+            for idx in chains
+        }
+        for fut in as_completed(futures):
+            idx = futures[fut]
+            try:
+                chain_results = fut.result()
+            except Exception as e:
+                print(f"[ERROR] Cadena de {cases[idx[0]]['dat_file']} falló: {e}")
+                chain_results = [
+                    {"case": cases[i]["case_name"], "inviscid": None, "viscous": None, "error": str(e)} for i in idx
+                ]
+            for i, res in zip(idx, chain_results):
+                results[i] = res
+                on_result(res)
+            print(f"[SCHED] Completada cadena: {', '.join(cases[i]['case_name'] for i in idx)}")
+    return results
+
+
+def run_cases(cases, jobs=1, warm_start=False, on_result=None):
+    """Ejecuta una lista de casos (dicts con los argumentos de `pipeline.run_case`).
+
+    - jobs <= 1: ejecucion secuencial en el proceso actual (comportamiento historico).
+    - jobs > 1: hasta `jobs` casos simultaneos; mallado y SU2 de casos distintos se solapan.
+    - warm_start: los casos con la misma malla corren encadenados (ver `plan_chains`).
+    - on_result(res): se llama con cada resultado apenas termina su caso (orden de finalizacion).
+    Al terminar se exporta results/summary.csv desde la base de resultados (`pipeline.export_summary`).
+    Devuelve la lista de resultados en el orden de `cases`.
+    """
+    cases = list(cases)
+    on_result = on_result or (lambda res: None)
+    if warm_start:
+        results = _run_chains(cases, jobs, on_result)
+    elif jobs is None or jobs <= 1 or len(cases) <= 1:
+        results = []
+        for case in cases:
+            results.append(pipeline.run_case(**case))
+            on_result(results[-1])
+    else:
+        results = _run_pool(cases, jobs, on_result)
+    pipeline.export_summary(os.getcwd())
+    return results
+
+
+def _run_pool(cases, jobs, on_result):
+    """Un caso por tarea del pool; cada worker trabaja en su propio directorio (ver `_run_case_isolated`)."""
+    root_dir = os.getcwd()
+    workers = min(int(jobs), len(cases))
+    print(f"[SCHED] {len(cases)} casos con {workers} procesos en paralelo")
+    results = [None] * len(cases)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_case_isolated, root_dir, _absolute_case(case)): i
+            for i, case in enumerate(cases)
+        }
+        for fut in as_completed(futures):
+            i = futures[fut]
+            case_name = cases[i]["case_name"]
+            try:
+                results[i] = fut.result()
+                print(f"[SCHED] Completado: {case_name}")
+            except Exception as e:
+                print(f"[ERROR] Caso {case_name} falló: {e}")
+                results[i] = {"case": case_name, "inviscid": None, "viscous": None, "error": str(e)}
+            on_result(results[i])
+    return results
@@ -0,0 +1,185 @@
+"""
+Backends de ejecucion de SU2.
+- `WSLBackend`: corre SU2_CFD dentro de WSL desde Windows (`wsl bash -lc ...`, rutas /mnt/<unidad>/...).
+- `NativeBackend`: llama al binario directamente (Linux/nodos de calculo) con un entorno preparado,
+  sin shells de login ni conversion de rutas.
+`get_backend()` elige automaticamente segun la plataforma; `SU2_BACKEND=wsl|native` lo fuerza.
+Con `mpi_ranks > 1` el binario se lanza con `mpirun -n K` (lanzador configurable con SU2_MPIRUN).
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+from pathlib import Path
+
+CONDA_BASES = ("miniconda3", "anaconda3", "miniforge3")
+
+# Lanzador MPI (p.ej. "mpiexec" o "srun"); recibe `-n K` antes del binario
+SU2_MPIRUN = os.environ.get("SU2_MPIRUN", "mpirun")
+
+
+def mpi_prefix(mpi_ranks):
+    """Argumentos a anteponer al binario de SU2 para una corrida con `mpi_ranks` procesos."""
+    if not mpi_ranks or int(mpi_ranks) <= 1:
+        return []
+    return [SU2_MPIRUN, "-n", str(int(mpi_ranks))]
+
+
+def to_wsl(path):
+    r"""
+    Convierte rutas de Windows a rutas WSL:
+    C:\Users\Axel\file -> /mnt/c/Users/Axel/file
+    """
+    path = path.replace("\\", "/")
+    if ":" in path:
+        return "/mnt/" + path[0].lower() + path[2:]
+    return path
+
+
+class WSLBackend:
+    """SU2 instalado dentro de WSL; cada llamada pasa por `wsl bash -lc`."""
+
+    name = "wsl"
+
+    def to_path(self, path):
+        return to_wsl(os.path.abspath(path))
+
+    def resolve(self, candidates, conda_env):
+        """Busca el binario probando cada candidato y luego el env conda (shell de login en WSL)."""
+        base_setup = "source ~/.bashrc 2>/dev/null; source ~/.profile 2>/dev/null;"
+        conda_setup = (
+            "source ~/miniconda3/etc/profile.d/conda.sh 2>/dev/null || true; "
+            "source ~/anaconda3/etc/profile.d/conda.sh 2>/dev/null || true; "
+        )
+        cmds = [f"{base_setup} command -v {shlex.quote(cand)}" for cand in candidates]
+        cmds.append(
+            f"{base_setup} {conda_setup} conda activate {shlex.quote(conda_env)} 2>/dev/null && "
+            f"command -v SU2_CFD"
+        )
+        for cmd in cmds:
+            result = subprocess.run(
+                ["wsl", "bash", "-lc", cmd],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            path = result.stdout.strip()
+            if result.returncode == 0 and path:
+                return path
+        return None
+
+    def conda_env_mtime(self, conda_env):
+        """mtime del env conda dentro de WSL ('' si no existe). Usa `sh -c` sin shell de login."""
+        envs = " ".join(f"~/{base}/envs/{shlex.quote(conda_env)}" for base in CONDA_BASES)
+        try:
+            result = subprocess.run(
+                ["wsl", "sh", "-c", f"stat -c %Y {envs} 2>/dev/null | head -n 1"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except OSError:
+            return ""
+        return result.stdout.strip()
+
+    def binary_stamp(self, su2_bin):
+        """mtime:tamano del binario dentro de WSL ('' si no se puede leer); identifica la version instalada."""
+        try:
+            result = subprocess.run(
+                ["wsl", "sh", "-c", f"stat -L -c %Y:%s {shlex.quote(su2_bin)} 2>/dev/null"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except OSError:
+            return ""
+        return result.stdout.strip()
+
+    def build_command(self, su2_bin, cfg_path, workdir, mpi_ranks=1):
+        """Devuelve (argv, kwargs extra para subprocess)."""
+        solver = " ".join(shlex.quote(a) for a in mpi_prefix(mpi_ranks) + [su2_bin, self.to_path(cfg_path)])
+        run_cmd = (
+            f"source ~/.bashrc 2>/dev/null; "
+            f"source ~/.profile 2>/dev/null; "
+            f"cd {shlex.quote(self.to_path(workdir))} && "
+            f"{solver}"
+        )
+        return ["wsl", "bash", "-lc", run_cmd], {}
+
+
+class NativeBackend:
+    """SU2 en el mismo sistema que Python; se invoca el binario sin intermediarios."""
+
+    name = "native"
+
+    def to_path(self, path):
+        return os.path.abspath(path)
+
+    def _conda_env_dirs(self, conda_env):
+        dirs = []
+        prefix = os.environ.get("CONDA_PREFIX")
+        if prefix and Path(prefix).name == conda_env:
+            dirs.append(Path(prefix))
+        home = Path.home()
+        dirs.extend(home / base / "envs" / conda_env for base in CONDA_BASES)
+        return dirs
+
+    def resolve(self, candidates, conda_env):
+        for cand in candidates:
+            if os.path.dirname(cand):
+                if os.path.isfile(cand) and os.access(cand, os.X_OK):
+                    return os.path.abspath(cand)
+                continue
+            path = shutil.which(cand)
+            if path:
+                return path
+        for env_dir in self._conda_env_dirs(conda_env):
+            path = env_dir / "bin" / "SU2_CFD"
+            if path.is_file() and os.access(path, os.X_OK):
+                return str(path)
+        return None
+
+    def conda_env_mtime(self, conda_env):
+        for env_dir in self._conda_env_dirs(conda_env):
+            try:
+                return str(int(env_dir.stat().st_mtime))
+            except OSError:
+                continue
+        return ""
+
+    def binary_stamp(self, su2_bin):
+        try:
+            st = os.stat(su2_bin)
+        except OSError:
+            return ""
+        return f"{int(st.st_mtime)}:{st.st_size}"
+
+    def environment(self, su2_bin):
+        """Entorno del proceso SU2: bin/ y lib/ de la instalacion delante en PATH/LD_LIBRARY_PATH."""
+        env = os.environ.copy()
+        bin_dir = os.path.dirname(os.path.abspath(su2_bin))
+        lib_dir = os.path.join(os.path.dirname(bin_dir), "lib")
+        env["PATH"] = os.pathsep.join(p for p in (bin_dir, env.get("PATH")) if p)
+        if os.path.isdir(lib_dir):
+            env["LD_LIBRARY_PATH"] = os.pathsep.join(p for p in (lib_dir, env.get("LD_LIBRARY_PATH")) if p)
+        env.setdefault("SU2_RUN", bin_dir)
+        return env
+
+    def build_command(self, su2_bin, cfg_path, workdir, mpi_ranks=1):
+        # el PATH del entorno preparado tambien resuelve el mpirun de la instalacion (p.ej. env conda)
+        args = mpi_prefix(mpi_ranks) + [su2_bin, self.to_path(cfg_path)]
+        return args, {"cwd": self.to_path(workdir), "env": self.environment(su2_bin)}
+
+
+BACKENDS = {"wsl": WSLBackend, "native": NativeBackend}
+
+
+def get_backend(name=None):
+    """Devuelve el backend pedido (`name` o SU2_BACKEND) o el automatico: WSL en Windows, nativo en el resto."""
+    name = (name or os.environ.get("SU2_BACKEND", "auto")).lower()
+    if name == "auto":
+        name = "wsl" if os.name == "nt" else "native"
+    if name not in BACKENDS:
+        raise ValueError(f"Backend SU2 desconocido: {name} (opciones: auto, {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
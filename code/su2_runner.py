@@ -1,90 +1,141 @@
 import subprocess
 import shutil
 import os
-import shlex
+import json
+import hashlib
+import threading
+import time
+from collections import deque
 import su2_configurator
+import su2_backends
+import result_cache
+from su2_backends import to_wsl  # noqa: F401 (re-export historico)
 from pathlib import Path
 
-# Permite sobreescribir el ejecutable de SU2 dentro de WSL (por ejemplo /usr/local/bin/SU2_CFD)
+# Permite sobreescribir el ejecutable de SU2 (ruta en WSL o nativa, por ejemplo /usr/local/bin/SU2_CFD)
 SU2_CMD = os.environ.get("SU2_CMD", "SU2_CFD")
 
+# Archivos por corrida, siempre dentro del output_dir de cada caso
+CONFIG_TMP_NAME = "config_tmp.cfg"
+DEBUG_LOG_NAME = "su2_runner_debug.log"
 
-def to_wsl(path):
-    r"""
-    Convierte rutas de Windows a rutas WSL:
-    C:\Users\Axel\file -> /mnt/c/Users/Axel/file
-    """
-    path = path.replace("\\", "/")
-    if ":" in path:
-        return "/mnt/" + path[0].lower() + path[2:]
-    return path
+# Cache persistente de la resolucion del binario (evita los sondeos `wsl bash -lc` en cada corrida)
+SU2_CACHE_FILE = Path(os.environ.get("SU2_CACHE_FILE", Path.home() / ".cache" / "draghunter" / "su2_resolution.json"))
+CONDA_ENV_NAME = "su2env"
 
+# Continuacion (warm start): restart ASCII que deja cada corrida y metadatos para validar su reuso
+RESTART_NAME = "restart_flow.csv"
+SOLUTION_NAME = "solution_flow.csv"
+RESTART_META_NAME = "restart_meta.json"
 
-def _check_su2_available():
+# Lineas finales de stdout que se conservan en modo streaming (para el diagnostico de convergencia)
+STREAM_TAIL_LINES = 200
+
+# Resolucion ya calculada en este proceso: {(backend, SU2_CMD): ruta}
+_resolved_in_process = {}
+# Huella del binario de SU2 para el cache de resultados: {(backend, ruta): "mtime:tamano"}
+_solver_stamps = {}
+
+
+def _probe_su2(backend):
     """
-    Resuelve el binario de SU2 dentro de WSL.
+    Resuelve el binario de SU2 con el backend activo (WSL o nativo).
     Estrategia:
       1) Si SU2_CMD está seteado, probar ese valor.
       2) Probar SU2_CFD en PATH.
-      3) Probar activar conda env su2env y buscar SU2_CFD.
+      3) Probar el env conda su2env y buscar SU2_CFD.
     Devuelve la ruta encontrada (string) o None si no se halló.
     """
-
-    # comandos de setup habituales
-    base_setup = "source ~/.bashrc 2>/dev/null; source ~/.profile 2>/dev/null;"
-    conda_setup = (
-        "source ~/miniconda3/etc/profile.d/conda.sh 2>/dev/null || true; "
-        "source ~/anaconda3/etc/profile.d/conda.sh 2>/dev/null || true; "
-    )
-
     candidates = []
-
     # 1) valor explícito (puede ser ruta absoluta o nombre)
     if SU2_CMD:
         candidates.append(SU2_CMD)
-
     # 2) nombre estándar
-    candidates.append("SU2_CFD")
+    if "SU2_CFD" not in candidates:
+        candidates.append("SU2_CFD")
+    return backend.resolve(candidates, CONDA_ENV_NAME)
 
-    # 3) conda env su2env
-    candidates.append("conda:su2env:SU2_CFD")
 
-    for cand in candidates:
-        if cand.startswith("conda:"):
-            _, env_name, bin_name = cand.split(":")
-            cmd = (
-                f"{base_setup} {conda_setup} conda activate {shlex.quote(env_name)} 2>/dev/null && "
-                f"command -v {shlex.quote(bin_name)}"
-            )
-        else:
-            cmd = f"{base_setup} command -v {shlex.quote(cand)}"
+def _su2_cache_key(backend):
+    """Clave del cache en disco: backend + valor de SU2_CMD + mtime del env conda."""
+    return f"{backend.name}|{SU2_CMD}|{backend.conda_env_mtime(CONDA_ENV_NAME)}"
 
-        result = subprocess.run(
-            ["wsl", "bash", "-lc", cmd],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
 
-        path = result.stdout.strip()
-        if result.returncode == 0 and path:
-            return path
+def _load_su2_cache():
+    try:
+        return json.loads(SU2_CACHE_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
 
-    print(f"[ERROR] No se encontró SU2_CFD en WSL.")
+
+def _save_su2_cache(cache: dict):
+    try:
+        SU2_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # escritura atomica: varios procesos del pool pueden guardar a la vez
+        tmp = SU2_CACHE_FILE.with_name(f"{SU2_CACHE_FILE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+        os.replace(tmp, SU2_CACHE_FILE)
+    except Exception as e:
+        print(f"[WARN] No se pudo guardar el cache de SU2 en {SU2_CACHE_FILE}: {e}")
+
+
+def clear_su2_cache():
+    """Invalida la resolucion de SU2 en memoria y en disco (fuerza un nuevo sondeo)."""
+    _resolved_in_process.clear()
+    try:
+        SU2_CACHE_FILE.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _solver_stamp(backend, su2_bin):
+    """Identifica la instalacion de SU2 (backend, ruta y mtime:tamano del binario) para el cache de resultados."""
+    key = (backend.name, su2_bin)
+    if key not in _solver_stamps:
+        _solver_stamps[key] = f"{backend.name}|{su2_bin}|{backend.binary_stamp(su2_bin)}"
+    return _solver_stamps[key]
+
+
+def _check_su2_available():
+    """
+    Devuelve la ruta del binario SU2 (WSL o nativo, segun `su2_backends.get_backend()`) o None.
+    Se resuelve una sola vez por proceso; entre procesos se reutiliza el cache en disco
+    (SU2_CACHE_FILE) mientras no cambien backend, SU2_CMD ni el env conda. Solo se cachean éxitos.
+    """
+    backend = su2_backends.get_backend()
+    path = _resolved_in_process.get((backend.name, SU2_CMD))
+    if path:
+        return path
+
+    key = _su2_cache_key(backend)
+    cache = _load_su2_cache()
+    path = cache.get(key)
+    if not path:
+        path = _probe_su2(backend)
+        if path:
+            cache[key] = path
+            _save_su2_cache(cache)
+    if path:
+        _resolved_in_process[(backend.name, SU2_CMD)] = path
+        return path
+
+    where = "en WSL" if backend.name == "wsl" else "en este sistema"
+    print(f"[ERROR] No se encontró SU2_CFD {where} (backend {backend.name}).")
     print("        Opciones:")
-    print("        - Instala SU2 dentro de WSL y agrega SU2_CFD al PATH.")
-    print("        - Exporta la variable de entorno SU2_CMD con la ruta absoluta en WSL.")
-    print("        - O instala/activa el entorno conda 'su2env' que contenga SU2_CFD.")
+    print(f"        - Instala SU2 {where} y agrega SU2_CFD al PATH.")
+    print(f"        - Exporta la variable de entorno SU2_CMD con la ruta absoluta {where}.")
+    print(f"        - O instala/activa el entorno conda '{CONDA_ENV_NAME}' que contenga SU2_CFD.")
+    print(f"        - Si cambiaste la instalación, borra el cache: {SU2_CACHE_FILE}")
     return None
 
 
 def is_su2_available():
-    """Public wrapper to quickly test whether SU2 is available through WSL (True/False)."""
+    """Public wrapper to quickly test whether SU2 is available through the active backend (True/False)."""
     return _check_su2_available() is not None
 
 
 def get_su2_resolved_path():
-    """Return the resolved path in WSL to the SU2 binary if available, or None.
+    """Return the resolved path (WSL or native) to the SU2 binary if available, or None.
     Use for detailed diagnostics from callers.
     """
     return _check_su2_available()
@@ -153,42 +204,166 @@ def parse_forces_file(forces_path: str):
     return CL, CD, CM
 
 
-def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False, max_iter=None, output_dir=None, retries: int = 1, strict: bool = False, cfl: float = None, incompressible: bool = False):
-    su2_cmd_resolved = _check_su2_available()
-    if su2_cmd_resolved is None:
-        return None
+def mesh_fingerprint(mesh_file):
+    """sha256 del contenido de la malla; un restart solo es reutilizable sobre la misma malla."""
+    h = hashlib.sha256()
+    with open(mesh_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-    cfg_tmp = "config_tmp.cfg"
-    # debug file for troubleshooting in tests
-    def _debug(msg):
-        try:
-            with open('su2_runner_debug.log', 'a', encoding='utf-8') as df:
-                df.write(msg + '\n')
-        except Exception:
-            pass
-    _debug(f"run_su2 start: mesh_file={mesh_file}, cfg_template={cfg_template}, output_dir={output_dir}")
 
-    # ----- Rutas absolutas -----
-    mesh_wsl = to_wsl(os.path.abspath(mesh_file))
+def _restart_donor(restart_from, mesh_hash, cfg_template):
+    """Ruta del restart de `restart_from` si es compatible (misma malla y plantilla); si no (None, motivo)."""
+    try:
+        with open(os.path.join(restart_from, RESTART_META_NAME), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None, "sin restart_meta.json"
+    if meta.get("mesh_sha256") != mesh_hash:
+        return None, "la huella de la malla no coincide"
+    if meta.get("template") != os.path.basename(cfg_template):
+        return None, "otra plantilla de solver"
+    restart = os.path.join(restart_from, meta.get("restart_file", RESTART_NAME))
+    if not os.path.isfile(restart):
+        return None, "no hay archivo de restart"
+    return restart, ""
+
+
+def _output_files_with_restart(cfg_template):
+    """OUTPUT_FILES de la plantilla con RESTART_ASCII agregado (para que la corrida deje su restart)."""
+    import re
+    files = []
+    try:
+        with open(cfg_template, "r", encoding="utf-8", errors="ignore") as f:
+            for l in f:
+                m = re.match(r"^\s*OUTPUT_FILES\s*=\s*\((.*)\)", l)
+                if m:
+                    files = [x.strip() for x in m.group(1).split(",") if x.strip()]
+                    break
+    except OSError:
+        pass
+    if "RESTART_ASCII" not in (x.upper() for x in files):
+        files.insert(0, "RESTART_ASCII")
+    return "( " + ", ".join(files) + " )"
 
-    # If no output_dir specified, default into results/su2/(inviscid|viscous)
-    if output_dir is None:
-        default_sub = "viscous" if viscous else "inviscid"
-        output_dir = os.path.join("results", "su2", default_sub)
 
-    os.makedirs(output_dir, exist_ok=True)
+class ConvergenceMonitor:
+    """Sigue la tabla de pantalla de SU2 linea a linea y detecta cuando CL y CD dejan de cambiar.
 
-    def _is_converged(text: str) -> bool:
-        t = text.lower()
-        if "maximum number of iterations reached" in t:
+    La tabla tiene la forma `|  Inner_Iter|  rms[Rho]| ... |   CL|   CD|  CMz|`; se considera
+    meseta cuando, en las ultimas `window` iteraciones, la variacion (max - min) de CL y de CD
+    es menor que `tol * max(|media|, 1e-2)` (relativa, con piso para CL ~ 0 en perfiles simetricos).
+    """
+
+    VALUE_FLOOR = 1e-2
+
+    def __init__(self, tol=1e-5, window=100, min_iter=0):
+        self.tol = float(tol)
+        self.window = max(2, int(window))
+        self.min_iter = int(min_iter)
+        self.columns = None
+        self.iteration = None
+        self.CL = None
+        self.CD = None
+        self.CM = None
+        self._history = deque(maxlen=self.window)
+
+    @staticmethod
+    def _fields(line):
+        line = line.strip()
+        if not (line.startswith("|") and line.endswith("|")):
+            return None
+        return [f.strip() for f in line.strip("|").split("|")]
+
+    def _index(self, *names):
+        for name in names:
+            for i, col in enumerate(self.columns):
+                if col.lower() == name.lower():
+                    return i
+        return None
+
+    def feed(self, line) -> bool:
+        """Procesa una linea de stdout; devuelve True cuando CL/CD estan en meseta."""
+        fields = self._fields(line)
+        if not fields:
             return False
-        if "non-physical" in t:
+        try:
+            values = [float(f) for f in fields]
+        except ValueError:
+            # cabecera de la tabla (se repite cada cierto numero de iteraciones)
+            if any(f.upper() in ("CL", "CD") for f in fields):
+                self.columns = fields
             return False
-        if "converged" in t and ("yes" in t or "converged |   yes" in t):
-            return True
-        # If no explicit signal, treat as not converged so we don’t keep looping silently
-        return False
+        if self.columns is None or len(values) != len(self.columns):
+            return False
+        i_iter = next((i for i, c in enumerate(self.columns) if "iter" in c.lower()), 0)
+        i_cl, i_cd, i_cm = self._index("CL"), self._index("CD"), self._index("CMz", "CM")
+        if i_cl is None or i_cd is None:
+            return False
+        self.iteration = int(values[i_iter])
+        self.CL, self.CD = values[i_cl], values[i_cd]
+        self.CM = values[i_cm] if i_cm is not None else None
+        self._history.append((self.CL, self.CD))
+        return self.settled()
+
+    def settled(self) -> bool:
+        if len(self._history) < self.window or (self.iteration or 0) < self.min_iter:
+            return False
+        for series in zip(*self._history):
+            mean = sum(series) / len(series)
+            if max(series) - min(series) > self.tol * max(abs(mean), self.VALUE_FLOOR):
+                return False
+        return True
 
+
+def _stream_solver(run_args, run_kwargs, output_dir, monitor):
+    """Lanza SU2 leyendo stdout en streaming (sin acumularlo en memoria) y lo detiene si `monitor`
+    detecta meseta de CL/CD. Devuelve (ultimas lineas de stdout, stderr, early_stopped).
+    En WSL se termina `wsl.exe`; SU2 muere al perder la tuberia de salida.
+    """
+    stdout_path = os.path.join(output_dir, 'su2_stdout.log')
+    stderr_path = os.path.join(output_dir, 'su2_stderr.log')
+    proc = subprocess.Popen(run_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                            errors="ignore", bufsize=1, **run_kwargs)
+    stderr_parts = []
+    drain = threading.Thread(target=lambda: stderr_parts.append(proc.stderr.read()), daemon=True)
+    drain.start()
+
+    tail = deque(maxlen=STREAM_TAIL_LINES)
+    early_stopped = False
+    with open(stdout_path, 'a', encoding='utf-8', errors='ignore') as sf:
+        for line in proc.stdout:
+            sf.write(line)
+            print(line, end="")
+            tail.append(line)
+            if monitor.feed(line):
+                early_stopped = True
+                print(f"[INFO] CL/CD estables durante {monitor.window} iteraciones (tol={monitor.tol:g}); "
+                      f"deteniendo SU2 en la iteración {monitor.iteration}")
+                break
+    if early_stopped:
+        proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    proc.stdout.close()
+    drain.join(timeout=5)
+    stderr_text = "".join(stderr_parts)
+    try:
+        with open(stderr_path, 'a', encoding='utf-8', errors='ignore') as ef:
+            ef.write(stderr_text + "\n")
+    except Exception:
+        pass
+    if stderr_text:
+        print(stderr_text)
+    return "".join(tail), stderr_text, early_stopped
+
+
+def _initial_settings(cfg_template, cfl=None, max_iter=None):
+    """(CFL, ITER) del primer intento: los pedidos o, si no, el CFL de la plantilla (0.2) y 100 iteraciones."""
     # Parse initial CFL (if present in template) so we can adjust it across retries
     import re
     initial_cfl = None
@@ -212,15 +387,146 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
         current_cfl = initial_cfl if initial_cfl is not None else 0.2
     # default iteration budget
     current_iter = int(max_iter) if max_iter is not None else 100
+    return current_cfl, current_iter
+
+
+def _case_extra(aoa, viscous=False, incompressible=False):
+    """Claves extra del .cfg que dependen del caso (ej. incomprensible)."""
+    extra = {}
+    if viscous and incompressible:
+        # Constantes del tutorial SU2 NACA0012 Re=6e6 (densidad, viscosidad, velocidad)
+        import math
+        rho = 2.13163
+        mu = 1.853e-5
+        u = 52.157 * math.cos(math.radians(aoa))
+        v = 52.157 * math.sin(math.radians(aoa))
+        extra.update({
+            'INC_DENSITY_INIT': rho,
+            'INC_DENSITY_REF': 1.0,
+            'INC_VELOCITY_REF': 1.0,
+            'INC_NONDIM': 'INITIAL_VALUES',
+            'INC_VELOCITY_INIT': f"( {u}, {v}, 0.0 )",
+            'VISCOSITY_MODEL': 'CONSTANT_VISCOSITY',
+            'MU_CONSTANT': mu,
+        })
+    return extra
+
+
+def _cache_extra(early_stop_tol=None, early_stop_window=100):
+    # opciones que no estan en el .cfg pero cambian el resultado devuelto
+    return {"early_stop": [early_stop_tol, early_stop_window]} if early_stop_tol else None
+
+
+def cached_result_key(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False, max_iter=None, cfl=None, incompressible=False, early_stop_tol=None, early_stop_window=100):
+    """Clave de `result_cache` de la corrida que haria `run_su2` con estos argumentos, si ya esta cacheada.
+
+    No toca ningun output_dir: la config del primer intento se renderiza en un temporal. Devuelve None si el
+    cache esta desactivado, SU2 no esta disponible o el punto no esta cacheado. Las claves de warm start
+    (restart, salidas) son volatiles y no entran en la clave, asi que no hacen falta aqui.
+    """
+    cache_dir = result_cache.cache_dir_from_env()
+    if not cache_dir:
+        return None
+    su2_cmd_resolved = _check_su2_available()
+    if su2_cmd_resolved is None:
+        return None
+    backend = su2_backends.get_backend()
+    current_cfl, current_iter = _initial_settings(cfg_template, cfl, max_iter)
+    import tempfile
+    tmp_dir = tempfile.mkdtemp(prefix="su2_key_")
+    try:
+        cfg_tmp = os.path.join(tmp_dir, CONFIG_TMP_NAME)
+        su2_configurator.create_config_for_case(
+            cfg_template, cfg_tmp,
+            mesh_wsl=backend.to_path(mesh_file), aoa=aoa, mach=mach, Re=Re,
+            iter_val=current_iter, cfl=current_cfl,
+            breakdown_wsl=backend.to_path(os.path.join(tmp_dir, "forces_breakdown.dat")),
+            extra=_case_extra(aoa, viscous, incompressible)
+        )
+        key = result_cache.result_key(mesh_fingerprint(mesh_file), cfg_tmp, _solver_stamp(backend, su2_cmd_resolved),
+                                      extra=_cache_extra(early_stop_tol, early_stop_window))
+    except Exception as e:
+        print(f"[WARN] No se pudo calcular la clave del cache de resultados ({e})")
+        return None
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return key if result_cache.contains(cache_dir, key) else None
+
+
+def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False, max_iter=None, output_dir=None, retries: int = 1, strict: bool = False, cfl: float = None, incompressible: bool = False, mpi_ranks: int = 1, early_stop_tol: float = None, early_stop_window: int = 100, warm_start: bool = False, restart_from: str = None):
+    su2_cmd_resolved = _check_su2_available()
+    if su2_cmd_resolved is None:
+        return None
+
+    # If no output_dir specified, default into results/su2/(inviscid|viscous)
+    if output_dir is None:
+        default_sub = "viscous" if viscous else "inviscid"
+        output_dir = os.path.join("results", "su2", default_sub)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Config, debug log and SU2 logs live in output_dir so concurrent runs never share files
+    cfg_tmp = os.path.join(output_dir, CONFIG_TMP_NAME)
+    debug_log = os.path.join(output_dir, DEBUG_LOG_NAME)
+
+    # debug file for troubleshooting in tests
+    def _debug(msg):
+        try:
+            with open(debug_log, 'a', encoding='utf-8') as df:
+                df.write(msg + '\n')
+        except Exception:
+            pass
+    _debug(f"run_su2 start: mesh_file={mesh_file}, cfg_template={cfg_template}, output_dir={output_dir}")
+
+    # ----- Rutas absolutas (en el formato que espera el backend: /mnt/... en WSL) -----
+    backend = su2_backends.get_backend()
+    mesh_wsl = backend.to_path(mesh_file)
+
+    # ----- Continuacion: arrancar desde el restart de un punto vecino (misma malla) -----
+    warm_start = bool(warm_start or restart_from)
+    results_cache_dir = result_cache.cache_dir_from_env()
+    mesh_hash = None
+    solution_local = None
+    if warm_start or results_cache_dir:
+        try:
+            mesh_hash = mesh_fingerprint(mesh_file)
+        except OSError as e:
+            print(f"[WARN] No se pudo leer la malla ({e}); sin warm start ni cache de resultados")
+            warm_start = False
+            results_cache_dir = None
+    if warm_start and restart_from:
+        donor, why = _restart_donor(restart_from, mesh_hash, cfg_template)
+        if donor:
+            solution_local = os.path.join(output_dir, SOLUTION_NAME)
+            shutil.copyfile(donor, solution_local)
+            print(f"[INFO] Warm start desde {restart_from}")
+        else:
+            print(f"[WARN] Restart de {restart_from} descartado ({why}); se arranca desde flujo libre")
+        _debug(f"warm start donor={restart_from} ok={bool(donor)} reason={why}")
+
+    def _is_converged(text: str) -> bool:
+        t = text.lower()
+        if "maximum number of iterations reached" in t:
+            return False
+        if "non-physical" in t:
+            return False
+        if "converged" in t and ("yes" in t or "converged |   yes" in t):
+            return True
+        # If no explicit signal, treat as not converged so we don’t keep looping silently
+        return False
+
+    current_cfl, current_iter = _initial_settings(cfg_template, cfl, max_iter)
 
     attempt = 0
     last_error = None
+    cache_key = None
+    cache_extra = _cache_extra(early_stop_tol, early_stop_window)
     while attempt <= retries:
         attempt += 1
         # Create template with per-case replacements using su2_configurator
         try:
             # Create breakdown filename for this run
-            breakdown_wsl = to_wsl(os.path.abspath(os.path.join(output_dir, "forces_breakdown.dat")))
+            breakdown_wsl = backend.to_path(os.path.join(output_dir, "forces_breakdown.dat"))
             # Build replacement map
             replacements = {
                 'MESH_FILENAME': mesh_wsl,
@@ -239,22 +545,16 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
             print(f"[DEBUG] Replacements: mesh_wsl={mesh_wsl}, aoa={aoa}, mach={mach}, Re={Re}, iter={current_iter}, cfl={current_cfl}, breakdown={breakdown_wsl}")
             _debug(f"calling create_config_for_case with mesh_wsl={mesh_wsl}, aoa={aoa}, mach={mach}, Re={Re}, iter={current_iter}, cfl={current_cfl}, breakdown_wsl={breakdown_wsl}")
             # Extra claves específicas (ej. incomprensible)
-            extra = {}
-            if viscous and incompressible:
-                # Constantes del tutorial SU2 NACA0012 Re=6e6 (densidad, viscosidad, velocidad)
-                import math
-                rho = 2.13163
-                mu = 1.853e-5
-                u = 52.157 * math.cos(math.radians(aoa))
-                v = 52.157 * math.sin(math.radians(aoa))
+            extra = _case_extra(aoa, viscous, incompressible)
+            if warm_start:
+                extra['OUTPUT_FILES'] = _output_files_with_restart(cfg_template)
+                extra['RESTART_FILENAME'] = backend.to_path(os.path.join(output_dir, RESTART_NAME))
+            # Solo el primer intento parte del donor; los reintentos vuelven a flujo libre
+            if solution_local and attempt == 1:
                 extra.update({
-                    'INC_DENSITY_INIT': rho,
-                    'INC_DENSITY_REF': 1.0,
-                    'INC_VELOCITY_REF': 1.0,
-                    'INC_NONDIM': 'INITIAL_VALUES',
-                    'INC_VELOCITY_INIT': f"( {u}, {v}, 0.0 )",
-                    'VISCOSITY_MODEL': 'CONSTANT_VISCOSITY',
-                    'MU_CONSTANT': mu,
+                    'RESTART_SOL': 'YES',
+                    'READ_BINARY_RESTART': 'NO',
+                    'SOLUTION_FILENAME': backend.to_path(solution_local),
                 })
             su2_configurator.create_config_for_case(
                 cfg_template, cfg_tmp,
@@ -264,6 +564,15 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
                 extra=extra
             )
             _debug(f"config_tmp created, exists? {os.path.exists(cfg_tmp)}")
+            if results_cache_dir and attempt == 1:
+                # la clave sale de la config pedida (intento 1), la misma que renderiza una re-ejecucion
+                cache_key = result_cache.result_key(mesh_hash, cfg_tmp, _solver_stamp(backend, su2_cmd_resolved),
+                                                    extra=cache_extra)
+                cached = result_cache.restore(results_cache_dir, cache_key, output_dir)
+                if cached is not None:
+                    print(f"[CACHE] Resultado reutilizado ({cache_key[:12]}): CL={cached[0]:.4f}, CD={cached[1]:.5f}")
+                    _debug(f"result cache hit {cache_key}")
+                    return cached
         except Exception as e:
             import traceback
             err_msg = f"[ERROR] No se pudo generar el archivo de configuración {cfg_tmp} desde plantilla {cfg_template}: {e}"
@@ -271,53 +580,50 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
             _debug(err_msg)
             # write full traceback to debug file
             try:
-                with open('su2_runner_debug.log', 'a', encoding='utf-8') as df:
+                with open(debug_log, 'a', encoding='utf-8') as df:
                     traceback.print_exc(file=df)
             except Exception:
                 pass
             traceback.print_exc()
             return None
 
-        cfg_wsl = to_wsl(os.path.abspath(cfg_tmp))
-
-        # No restart copying: avoids mesh/solution mismatch crashes when cases differ
+        # El restart de otro caso solo se usa con warm start y tras validar la huella de malla
 
-        print(f"[INFO] Ejecutando SU2 dentro de WSL... (attempt {attempt}/{retries+1})")
-
-        wsl_workdir = to_wsl(os.path.abspath(output_dir))
-        run_cmd = (
-            f"source ~/.bashrc 2>/dev/null; "
-            f"source ~/.profile 2>/dev/null; "
-            f"cd {shlex.quote(wsl_workdir)} && "
-            f"{shlex.quote(su2_cmd_resolved)} {shlex.quote(cfg_wsl)}"
-        )
+        where = "dentro de WSL" if backend.name == "wsl" else "(nativo)"
+        ranks = f", {int(mpi_ranks)} procesos MPI" if mpi_ranks and int(mpi_ranks) > 1 else ""
+        print(f"[INFO] Ejecutando SU2 {where}{ranks}... (attempt {attempt}/{retries+1})")
 
-        result = subprocess.run([
-            "wsl",
-            "bash",
-            "-lc",
-            run_cmd,
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        run_args, run_kwargs = backend.build_command(su2_cmd_resolved, cfg_tmp, output_dir, mpi_ranks=mpi_ranks)
+        run_started = time.time()
+        monitor = None
+        early_stopped = False
+        if early_stop_tol:
+            # Streaming: se parsean CL/CD en vivo y se corta SU2 cuando se estabilizan
+            monitor = ConvergenceMonitor(tol=early_stop_tol, window=early_stop_window)
+            stdout_text, stderr_text, early_stopped = _stream_solver(run_args, run_kwargs, output_dir, monitor)
+        else:
+            result = subprocess.run(run_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **run_kwargs)
+            stdout_text, stderr_text = result.stdout, result.stderr
 
-        # Always write SU2 stdout/stderr to files in output_dir for debugging
-        try:
-            stdout_path = os.path.join(output_dir, 'su2_stdout.log')
-            stderr_path = os.path.join(output_dir, 'su2_stderr.log')
-            with open(stdout_path, 'a', encoding='utf-8', errors='ignore') as sf:
-                sf.write(result.stdout + "\n")
-            with open(stderr_path, 'a', encoding='utf-8', errors='ignore') as ef:
-                ef.write(result.stderr + "\n")
-        except Exception:
-            # Don't fail on log write issues; keep running
-            pass
+            # Always write SU2 stdout/stderr to files in output_dir for debugging
+            try:
+                stdout_path = os.path.join(output_dir, 'su2_stdout.log')
+                stderr_path = os.path.join(output_dir, 'su2_stderr.log')
+                with open(stdout_path, 'a', encoding='utf-8', errors='ignore') as sf:
+                    sf.write(result.stdout + "\n")
+                with open(stderr_path, 'a', encoding='utf-8', errors='ignore') as ef:
+                    ef.write(result.stderr + "\n")
+            except Exception:
+                # Don't fail on log write issues; keep running
+                pass
 
-        # Also print the logs to the terminal for immediate feedback
-        print(result.stdout)
-        print(result.stderr)
+            # Also print the logs to the terminal for immediate feedback
+            print(result.stdout)
+            print(result.stderr)
 
-        soutext = result.stdout + "\n" + result.stderr
-        _debug(f"SU2 run complete: stdout_len={len(result.stdout)} stderr_len={len(result.stderr)}")
-        converged = _is_converged(soutext)
+        soutext = stdout_text + "\n" + stderr_text
+        _debug(f"SU2 run complete: stdout_len={len(stdout_text)} stderr_len={len(stderr_text)} early_stopped={early_stopped}")
+        converged = early_stopped or _is_converged(soutext)
         if not converged:
             print("[WARN] SU2 no convergió (max iterations reached o no convergió). Revisa salida de SU2 para más detalles.")
             last_error = soutext
@@ -334,7 +640,15 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
         # -------- Localizar resultado de fuerzas (intentar incluso si no convergió) --------
         forces_local = os.path.join(output_dir, "forces_breakdown.dat")
         _debug(f"forces_local path (Windows): {forces_local}, exists={os.path.exists(forces_local)}")
-        if not os.path.exists(forces_local):
+        # Tras un corte anticipado el breakdown puede no existir o ser de una corrida previa
+        forces_stale = early_stopped and (
+            not os.path.exists(forces_local) or os.path.getmtime(forces_local) < run_started - 1.0
+        )
+        if forces_stale and monitor.CL is not None:
+            print("[INFO] SU2 detenido antes de escribir forces_breakdown.dat; se usan CL/CD/CM del monitor")
+            CL, CD = monitor.CL, monitor.CD
+            CM = monitor.CM if monitor.CM is not None else float("nan")
+        elif not os.path.exists(forces_local):
             print(f"[ERROR] No se encontró {forces_local}")
             try:
                 print(f"cfg_tmp exists: {os.path.exists(cfg_tmp)}")
@@ -346,12 +660,12 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
                 pass
             print("         SU2 probablemente no llegó a calcular fuerzas.")
             return None
-
-        try:
-            CL, CD, CM = parse_forces_file(forces_local)
-        except Exception as e:
-            print(f"[ERROR] Parser de fuerzas fallo: {e}")
-            raise
+        else:
+            try:
+                CL, CD, CM = parse_forces_file(forces_local)
+            except Exception as e:
+                print(f"[ERROR] Parser de fuerzas fallo: {e}")
+                raise
 
         print(f"[OK] CL={CL:.4f}, CD={CD:.5f}, CM={CM:.5f}")
 
@@ -392,6 +706,8 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
                 except Exception:
                     pass
                 break
+        if final_iter is None and monitor is not None:
+            final_iter = monitor.iteration
 
         # Save a small JSON summary into the output_dir
         try:
@@ -403,13 +719,33 @@ def run_su2(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False,
                 'final_rms': final_rms,
                 'attempts': attempt,
                 'final_CFL': current_cfl,
-                'final_ITER': current_iter
+                'final_ITER': current_iter,
+                'early_stopped': early_stopped
             }
             with open(os.path.join(output_dir, 'run_summary.json'), 'w', encoding='utf-8') as jf:
                 json.dump(summary, jf)
         except Exception:
             pass
 
+        if warm_start and mesh_hash:
+            try:
+                meta = {
+                    'mesh_sha256': mesh_hash,
+                    'template': os.path.basename(cfg_template),
+                    'restart_file': RESTART_NAME,
+                    'aoa': aoa, 'mach': mach, 'Re': Re,
+                    'warm_started': bool(solution_local and attempt == 1),
+                }
+                with open(os.path.join(output_dir, RESTART_META_NAME), 'w', encoding='utf-8') as mf:
+                    json.dump(meta, mf)
+            except OSError:
+                pass
+
+        if cache_key and converged:
+            result_cache.store(results_cache_dir, cache_key, output_dir,
+                               (CL, CD, CM, final_iter, final_rms, converged),
+                               skip=(CONFIG_TMP_NAME, DEBUG_LOG_NAME, SOLUTION_NAME))
+
         return CL, CD, CM, final_iter, final_rms, converged
 
     # If we somehow reach here and didn't return with CL/CD/CM
@@ -0,0 +1,243 @@
+"""
+Evaluacion vectorizada con NeuralFoil (via aerosandbox).
+Cada perfil se normaliza y se ajusta a Kulfan una sola vez y toda la grilla alpha x Re x Mach se
+evalua en una unica llamada con arrays, en lugar de una llamada por alpha.
+Las filas salen en el mismo orden que el bucle historico (Re, Mach, alpha).
+
+`screen_profiles` reparte familias grandes de perfiles en un pool de procesos por bloques
+(`chunk_size` perfiles por tarea) y agrega cada bloque terminado a un CSV, de modo que un
+cribado interrumpido se puede retomar (`resume=True`) sin repetir los perfiles ya evaluados.
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+
+import profile_store
+
+try:
+    import aerosandbox as asb
+except ImportError:
+    asb = None
+
+SOLVER_NAME = "aerosandbox-neuralfoil"
+SCREENING_CSV = "results/surrogate_screening.csv"
+FIELDNAMES = ["solver", "airfoil", "alpha", "Re", "mach", "CL", "CD", "CM"]
+# fallas del entorno (falta aerosandbox, archivos, memoria): fallarian igual en todos los perfiles,
+# asi que cortan el cribado en lugar de registrarse como error de un perfil
+ENV_ERRORS = (ImportError, OSError, MemoryError, BrokenProcessPool)
+
+
+def load_coordinates(dat_path):
+    """Coordenadas del .dat (salta la cabecera si la hay) o del almacen binario ("<almacen.npy>#<nombre>")."""
+    if profile_store.is_ref(dat_path):
+        return profile_store.load_points(dat_path)
+    try:
+        return np.loadtxt(dat_path)
+    except Exception:
+        return np.loadtxt(dat_path, skiprows=1)
+
+
+def condition_grid(alpha_list, Re_list, mach_list):
+    """Arrays planos (alpha, Re, mach) con Re como bucle externo y alpha como interno."""
+    R, M, A = np.meshgrid(
+        np.asarray(Re_list, dtype=float),
+        np.asarray(mach_list, dtype=float),
+        np.asarray(alpha_list, dtype=float),
+        indexing="ij",
+    )
+    return A.ravel(), R.ravel(), M.ravel()
+
+
+def evaluate_airfoil(dat_path, alpha_list, Re_list, mach_list, n_crit=9.0, coords=None, verbose=False, name=None):
+    """Evalua un perfil sobre toda la grilla en una llamada. Devuelve filas para export_csv.
+
+    Con `coords` (perfil en memoria) no se lee el .dat; `name` sustituye al nombre derivado de la ruta.
+    """
+    if asb is None:
+        raise ImportError("Aerosandbox no está instalado. Instala con 'pip install aerosandbox'.")
+    name = name or profile_store.profile_name(dat_path)
+    if coords is None:
+        coords = load_coordinates(dat_path)
+    airfoil = asb.Airfoil(name=name, coordinates=coords)
+    fn = getattr(airfoil, "get_aero_from_neuralfoil", None)
+    if fn is None:
+        raise ImportError("Esta versión de aerosandbox no tiene get_aero_from_neuralfoil.")
+
+    alpha, Re, mach = condition_grid(alpha_list, Re_list, mach_list)
+    aero = fn(alpha=alpha, Re=Re, mach=mach, n_crit=n_crit, include_360_deg_effects=True)
+    n = alpha.size
+    CL = np.broadcast_to(np.asarray(aero["CL"], dtype=float).reshape(-1), (n,))
+    CD = np.broadcast_to(np.asarray(aero["CD"], dtype=float).reshape(-1), (n,))
+    CM = np.broadcast_to(np.asarray(aero.get("CM", aero.get("CMm", 0.0)), dtype=float).reshape(-1), (n,))
+
+    rows = []
+    for i in range(n):
+        rows.append({
+            "solver": SOLVER_NAME,
+            "airfoil": name,
+            "mach": float(mach[i]),
+            "Re": float(Re[i]),
+            "alpha": float(alpha[i]),
+            "CL": float(CL[i]),
+            "CD": float(CD[i]),
+            "CM": float(CM[i]),
+        })
+        if verbose:
+            print(f"[AeroSB] {name} AoA={alpha[i]:g}° Re={Re[i]:.3g} M={mach[i]:.2f} -> "
+                  f"CL={CL[i]:.5f} CD={CD[i]:.6f} CM={CM[i]:.5f}")
+    return rows
+
+
+def _screen_chunk(dat_paths, alpha_list, Re_list, mach_list, n_crit):
+    """Unidad de trabajo del pool: evalua un bloque de perfiles.
+
+    Un perfil con geometria o resultado invalido no tumba el bloque (queda en `errors`); las fallas del
+    entorno (ENV_ERRORS) se propagan.
+    """
+    rows, errors = [], []
+    for dat_path in dat_paths:
+        try:
+            rows.extend(evaluate_airfoil(dat_path, alpha_list, Re_list, mach_list, n_crit=n_crit))
+        except ENV_ERRORS:
+            raise
+        except Exception as e:
+            errors.append((str(dat_path), str(e)))
+    return rows, errors
+
+
+def _load_completed(out_csv, grid):
+    """{perfil: n_filas} de los perfiles ya evaluados sobre toda la grilla (los incompletos se descartan).
+
+    No guarda las filas: por perfil solo que puntos de la grilla ya tiene.
+    """
+    slots = {point: i for i, point in enumerate(grid)}
+    hits, counts, invalid = {}, {}, set()
+    try:
+        with open(out_csv, "r", newline="") as f:
+            for r in csv.DictReader(f):
+                name = r["airfoil"]
+                try:
+                    slot = slots.get((float(r["Re"]), float(r["mach"]), float(r["alpha"])))
+                except (KeyError, TypeError, ValueError):
+                    slot = None
+                if slot is None:
+                    invalid.add(name)
+                    continue
+                hits.setdefault(name, bytearray(len(grid)))[slot] = 1
+                counts[name] = counts.get(name, 0) + 1
+    except (OSError, KeyError, csv.Error):
+        return {}
+    return {name: n for name, n in counts.items()
+            if name not in invalid and n == len(grid) and all(hits[name])}
+
+
+def _copy_completed(out_csv, done, wanted, writer, on_rows, batch):
+    """Copia del CSV previo las filas de los perfiles de `done`; a `on_rows` (en lotes) solo van las de `wanted`.
+
+    Los perfiles completos de corridas anteriores que no se pidieron ahora siguen en el CSV (una proxima
+    corrida que los pida los retoma), pero no llegan al CSV combinado ni al ranking de esta corrida.
+    """
+    rows = []
+    with open(out_csv, "r", newline="") as f:
+        for r in csv.DictReader(f):
+            if r["airfoil"] not in done:
+                continue
+            if r["airfoil"] not in wanted:
+                writer.writerow(r)
+                continue
+            row = dict(r, **{k: float(r[k]) for k in ("alpha", "Re", "mach", "CL", "CD", "CM")})
+            rows.append(row)
+            if len(rows) >= batch:
+                writer.writerows(rows)
+                on_rows(rows)
+                rows = []
+    if rows:
+        writer.writerows(rows)
+        on_rows(rows)
+
+
+def screen_profiles(dat_paths, alpha_list, Re_list, mach_list, out_csv=SCREENING_CSV, jobs=1, chunk_size=32,
+                    resume=False, n_crit=9.0, on_rows=None):
+    """Cribado NeuralFoil de muchos perfiles con un pool de procesos y escritura incremental.
+
+    - jobs <= 1: en el proceso actual; jobs = 0/None: un proceso por nucleo.
+    - resume: conserva del CSV previo los perfiles completos sobre la misma grilla y solo evalua el resto.
+      Los completos que no estan en `dat_paths` quedan en el CSV pero no se entregan a `on_rows`.
+    - on_rows(filas): se llama con las filas retomadas de `dat_paths` y luego con las de cada bloque que termina.
+    Las filas no se acumulan: van al CSV y a `on_rows` y se sueltan. Devuelve {perfil: n_filas} (previas +
+    nuevas) en el orden de `dat_paths`; los perfiles que fallaron no aparecen.
+    """
+    dat_paths = [str(p) for p in dat_paths]
+    alpha, Re, mach = condition_grid(alpha_list, Re_list, mach_list)
+    grid = set(zip(Re.tolist(), mach.tolist(), alpha.tolist()))
+    names = [profile_store.profile_name(p) for p in dat_paths]
+    wanted = set(names)
+    done = _load_completed(out_csv, grid) if resume else {}
+    pending = [p for p, name in zip(dat_paths, names) if name not in done]
+    resumed = {name: n for name, n in done.items() if name in wanted}
+    if resumed:
+        print(f"[SCREEN] Reanudando: {len(resumed)} perfiles ya evaluados en {out_csv}, faltan {len(pending)}")
+
+    os.makedirs(Path(out_csv).parent, exist_ok=True)
+    on_rows = on_rows or (lambda rows: None)
+    chunk_size = max(1, int(chunk_size))
+    # se reescribe el CSV solo con perfiles completos y luego se agregan bloques a medida que terminan
+    tmp = f"{out_csv}.{os.getpid()}.tmp"
+    with open(tmp, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        if done:
+            _copy_completed(out_csv, done, wanted, writer, on_rows, batch=chunk_size * len(grid))
+    os.replace(tmp, out_csv)
+
+    counts = dict(resumed)
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    workers = min(int(jobs) if jobs else (os.cpu_count() or 1), len(chunks))
+    n_done = 0
+    failed = []
+
+    def _collect(rows, errors, f, writer):
+        nonlocal n_done
+        writer.writerows(rows)
+        f.flush()
+        on_rows(rows)
+        for row in rows:
+            counts[row["airfoil"]] = counts.get(row["airfoil"], 0) + 1
+        for path, err in errors:
+            print(f"[ERROR] NeuralFoil falló en {path}: {err}")
+        failed.extend(errors)
+        n_done += len({row["airfoil"] for row in rows}) + len(errors)
+        print(f"[SCREEN] {n_done}/{len(pending)} perfiles evaluados")
+
+    with open(out_csv, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
+        if workers <= 1:
+            for chunk in chunks:
+                _collect(*_screen_chunk(chunk, alpha_list, Re_list, mach_list, n_crit), f, writer)
+        else:
+            print(f"[SCREEN] {len(pending)} perfiles en {len(chunks)} bloques con {workers} procesos")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(_screen_chunk, chunk, alpha_list, Re_list, mach_list, n_crit): chunk
+                    for chunk in chunks
+                }
+                for fut in as_completed(futures):
+                    try:
+                        rows, errors = fut.result()
+                    except ENV_ERRORS:
+                        raise
+                    except Exception as e:
+                        rows, errors = [], [(p, str(e)) for p in futures[fut]]
+                    _collect(rows, errors, f, writer)
+
+    if failed:
+        print(f"[SCREEN] {len(failed)}/{len(pending)} perfiles fallaron y no tienen filas NeuralFoil:")
+        for path, err in failed:
+            print(f"         {profile_store.profile_name(path)}: {err}")
+
+    return {name: counts[name] for name in names if name in counts}
@@ -0,0 +1,191 @@
+import csv
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import airfoil_comparison
+
+
+def _reference_rows(csv_path, solver=None, aoa_min=None, aoa_max=None):
+    """Lectura y filtro fila a fila: se descartan las filas con algun campo numerico invalido."""
+    rows = []
+    with open(csv_path, newline='') as f:
+        for raw in csv.DictReader(f):
+            try:
+                num = {k: float(raw.get(k, 0.0)) for k in airfoil_comparison.NUM_FIELDS}
+            except (TypeError, ValueError):
+                continue
+            if solver and raw["solver"] != solver:
+                continue
+            if (aoa_min is not None and num["alpha"] < aoa_min) or (aoa_max is not None and num["alpha"] > aoa_max):
+                continue
+            rows.append(dict(num, airfoil=raw["airfoil"]))
+    return rows
+
+
+def _reference_ranking(rows, metric, solver=None):
+    """Ranking fila a fila (grupos en orden de aparicion, sort estable)."""
+    groups = {}
+    for r in rows:
+        groups.setdefault(r["airfoil"], []).append(r)
+    ranking = []
+    for airfoil, rws in groups.items():
+        ratios = [r["CL"] / r["CD"] for r in rws if r["CD"] != 0]
+        value = {
+            "cd_mean": lambda: sum(r["CD"] for r in rws) / len(rws),
+            "cd_min": lambda: min(r["CD"] for r in rws),
+            "cl_mean": lambda: sum(r["CL"] for r in rws) / len(rws),
+            "clcd_mean": lambda: sum(ratios) / len(ratios) if ratios else None,
+            "clcd_max": lambda: max(ratios) if ratios else None,
+        }[metric]()
+        if value is not None:
+            ranking.append(dict(airfoil=airfoil, metric=metric, value=value, count=len(rws), solver=solver or "all"))
+    ranking.sort(key=(lambda r: r["value"]) if metric.startswith("cd") else (lambda r: -r["value"]))
+    return ranking
+
+
+class _CombinedCSV(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.csv = self.tmpdir / 'combined.csv'
+        rng = np.random.default_rng(3)
+        with open(self.csv, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["solver", "airfoil", "alpha", "Re", "mach", "CL", "CD", "CM"])
+            for i in range(2000):
+                cd = 0.0 if i % 37 == 0 else round(rng.random() * 0.05, 4)
+                cm = "" if i % 211 == 0 else 0.0  # fila descartada: CM invalido
+                writer.writerow([f"s{i % 2}", f"P{rng.integers(40)}", int(rng.integers(-4, 9)), 1e6, 0.1,
+                                 round(rng.random(), 3), cd, cm])
+            writer.writerow(["s0", "ONLY_ZERO_CD", 0, 1e6, 0.1, 0.5, 0.0, 0.0])
+            writer.writerow(["s0", "SHORT", 0])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+class TestVectorizedRanking(_CombinedCSV):
+    def test_all_metrics_match_row_by_row(self):
+        for kwargs in (dict(), dict(solver="s1", aoa_min=0.0, aoa_max=4.0)):
+            rows = _reference_rows(self.csv, **kwargs)
+            rankings = airfoil_comparison.compute_rankings(self.csv, **kwargs)
+            self.assertEqual(list(rankings), list(airfoil_comparison.METRICS))
+            data = airfoil_comparison.ResultSet.from_file(self.csv).filter(**kwargs)
+            self.assertEqual(len(data), len(rows))
+            self.assertEqual(data.rankings(solver=kwargs.get("solver")), rankings)
+            for metric, ranking in rankings.items():
+                self.assertEqual(ranking, _reference_ranking(rows, metric, kwargs.get("solver")), metric)
+        names = [r["airfoil"] for r in airfoil_comparison.compute_ranking(self.csv, metric="clcd_max")]
+        self.assertNotIn("ONLY_ZERO_CD", names)
+        self.assertNotIn("SHORT", names)
+
+    def test_ties_keep_first_appearance(self):
+        cols = {"airfoil": np.array(["B", "A", "C", "A", "B"]), "CL": np.ones(5), "CD": np.full(5, 0.01)}
+        ranking = airfoil_comparison.rank_columns(cols, ["cd_mean"])["cd_mean"]
+        self.assertEqual([(r["airfoil"], r["count"]) for r in ranking], [("B", 2), ("A", 2), ("C", 1)])
+
+    def test_nan_values_rank_last(self):
+        nan = float("nan")
+        cols = {"airfoil": np.array(["N", "A", "N", "B", "M"]), "CL": np.array([0.5, 0.4, 0.5, 0.6, nan]),
+                "CD": np.array([0.01, 0.02, nan, 0.01, 0.01])}
+        rankings = airfoil_comparison.rank_columns(cols, ["cd_mean", "cl_mean", "clcd_max"])
+        self.assertEqual([r["airfoil"] for r in rankings["cd_mean"]], ["B", "M", "A", "N"])
+        self.assertEqual([r["airfoil"] for r in rankings["cl_mean"]], ["B", "N", "A", "M"])
+        self.assertEqual([r["airfoil"] for r in rankings["clcd_max"]], ["B", "A", "N", "M"])
+        ranker = airfoil_comparison.StreamingRanker(["cd_mean", "cl_mean", "clcd_max"])
+        ranker.update_columns(dict(cols, solver=np.full(5, "s"), alpha=np.zeros(5)))
+        for metric, ranking in rankings.items():
+            self.assertEqual([r["airfoil"] for r in ranker.top(4, metric)], [r["airfoil"] for r in ranking])
+
+    def test_unknown_metric(self):
+        with self.assertRaises(ValueError):
+            airfoil_comparison.compute_ranking(self.csv, metric="cm_mean")
+
+    def test_run_comparison_several_metrics(self):
+        out = self.tmpdir / 'rankings.csv'
+        rankings = airfoil_comparison.run_comparison(self.csv, out, metric="cd_mean, clcd_max")
+        self.assertEqual(set(rankings), {"cd_mean", "clcd_max"})
+        with open(out, newline='') as f:
+            saved = list(csv.DictReader(f))
+        self.assertEqual(len(saved), len(rankings["cd_mean"]) + len(rankings["clcd_max"]))
+        self.assertEqual(saved[0]["metric"], "cd_mean")
+        self.assertEqual(saved[-1]["metric"], "clcd_max")
+
+
+class TestResultSet(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.rows = [dict(solver=solver, airfoil=name, alpha=a, Re=1e6, mach=0.1, CL=0.1 * a + k, CD=0.01 + 0.001 * k,
+                          CM=0.0)
+                     for k, name in enumerate(("A", "B", "C")) for a in (-2.0, 0.0, 2.0, 4.0)
+                     for solver in ("aerosandbox-neuralfoil", "su2-incomp")]
+        # fila SU2 sin resultado: vacia en el CSV, descartada en ambos caminos
+        self.rows.append(dict(solver="su2-incomp", airfoil="D", alpha=0.0, Re=1e6, mach=0.1, CL=None, CD=None, CM=None))
+        self.csv = self.tmpdir / 'combined.csv'
+        with open(self.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=["solver", "airfoil", "alpha", "Re", "mach", "CL", "CD", "CM"])
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_rows_in_memory_match_file(self):
+        kwargs = dict(solver="su2-incomp", aoa_min=0.0)
+        from_file = airfoil_comparison.ResultSet.from_file(self.csv, **kwargs)
+        from_rows = airfoil_comparison.ResultSet.from_rows(self.rows).filter(**kwargs)
+        self.assertEqual(len(from_rows), 9)
+        self.assertEqual(from_rows.rankings(solver="su2-incomp"), from_file.rankings(solver="su2-incomp"))
+
+    def test_run_comparison_does_not_read_input_with_data(self):
+        out = self.tmpdir / 'rankings.csv'
+        data = airfoil_comparison.ResultSet.from_rows(self.rows)
+        ranking = airfoil_comparison.run_comparison(self.tmpdir / 'missing.csv', out, metric="clcd_max",
+                                                    solver="su2-incomp", data=data)
+        self.assertEqual([r["airfoil"] for r in ranking], ["C", "B", "A"])
+        self.assertEqual(ranking, airfoil_comparison.run_comparison(self.csv, out, metric="clcd_max", solver="su2-incomp"))
+        # el filtro no modifica el dataset compartido
+        self.assertEqual(len(data), len(self.rows) - 1)
+
+
+class TestStreamingRanker(_CombinedCSV):
+    def _assert_close(self, got, expected):
+        self.assertEqual([(r["airfoil"], r["count"]) for r in got], [(r["airfoil"], r["count"]) for r in expected])
+        for g, e in zip(got, expected):
+            self.assertAlmostEqual(g["value"], e["value"], places=9)
+
+    def test_chunks_match_in_memory_ranking(self):
+        for kwargs in (dict(), dict(solver="s1", aoa_min=0.0, aoa_max=4.0)):
+            expected = airfoil_comparison.compute_rankings(self.csv, **kwargs)
+            ranker = airfoil_comparison.stream_rankings(self.csv, chunk_rows=97, **kwargs)
+            got = ranker.rankings()
+            for metric in airfoil_comparison.METRICS:
+                self._assert_close(got[metric], expected[metric])
+                self._assert_close(ranker.top(5, metric), expected[metric][:5])
+
+    def test_incremental_updates(self):
+        with open(self.csv, newline='') as f:
+            rows = list(csv.DictReader(f))
+        ranker = airfoil_comparison.StreamingRanker(["cd_mean", "clcd_max"], solver="s0")
+        seen = []
+        for start in range(0, len(rows), 250):
+            ranker.update(rows[start:start + 250])
+            seen.extend(rows[start:start + 250])
+            expected = airfoil_comparison.ResultSet.from_rows(seen).filter(solver="s0").rankings(
+                ["cd_mean", "clcd_max"], solver="s0")
+            self._assert_close(ranker.top(3), expected["cd_mean"][:3])
+        self.assertEqual(len(ranker), len(expected["cd_mean"]))
+
+    def test_run_comparison_stream(self):
+        out = self.tmpdir / 'rankings.csv'
+        ranking = airfoil_comparison.run_comparison(self.csv, out, metric="clcd_mean", stream=True, chunk_rows=128)
+        self._assert_close(ranking, airfoil_comparison.compute_ranking(self.csv, metric="clcd_mean"))
+        with open(out, newline='') as f:
+            self.assertEqual(len(list(csv.DictReader(f))), len(ranking))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import dat_writer
+import profile_generators
+from Airfoil_Generator import Airfoil
+
+
+class TestDatWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_format_matches_per_point_lines(self):
+        x = np.array([1.0, 0.5, 1e-9, -0.0, 12.3456789])
+        y = np.array([0.0, -0.1234565, 3.0, -1e-12, 7.0])
+        expected = "perfil\n" + "".join(f" {xi:.6f}  {yi:.6f}\n" for xi, yi in zip(x, y))
+        self.assertEqual(dat_writer.format_dat("perfil", x, y), expected)
+        expected = "perfil\n" + "".join(f"{xi:.6f} {yi:.6f}\n" for xi, yi in zip(x, y))
+        self.assertEqual(dat_writer.format_dat("perfil", x, y, dat_writer.AIRFOIL_LINE), expected)
+
+    def test_skip_unchanged_keeps_file(self):
+        path = self.tmpdir / 'a.dat'
+        x, y = np.linspace(0, 1, 5), np.zeros(5)
+        self.assertTrue(dat_writer.write_dat(path, 'a', x, y, skip_unchanged=True))
+        os.utime(path, (1, 1))
+        self.assertFalse(dat_writer.write_dat(path, 'a', x, y, skip_unchanged=True))
+        self.assertEqual(os.path.getmtime(path), 1)
+        self.assertTrue(dat_writer.write_dat(path, 'a', x, y + 0.5, skip_unchanged=True))
+        self.assertIn(' 0.000000  0.500000', path.read_text())
+
+    def test_regenerating_family_skips_files(self):
+        kw = dict(chord_start=6.0, chord_end=6.3, output_dir=str(self.tmpdir), skip_unchanged=True)
+        out = profile_generators.generate_rotodomo_profiles(**kw)
+        for info in out.values():
+            os.utime(info['dat'], (1, 1))
+        profile_generators.generate_rotodomo_profiles(**kw)
+        self.assertTrue(all(os.path.getmtime(info['dat']) == 1 for info in out.values()))
+
+    def test_airfoil_save_dat(self):
+        foil = Airfoil.naca00xx(t_rel=0.12, c=2.0, n_points=20, normalize=False)
+        path = self.tmpdir / 'naca.dat'
+        foil.save_dat(str(path))
+        lines = path.read_text().splitlines()
+        self.assertEqual(lines[0], 'NACA0012')
+        self.assertEqual(lines[1], f"{foil.X[0]:.6f} {foil.Y[0]:.6f}")
+        self.assertEqual(len(lines), 1 + len(foil.X))
+
+
+if __name__ == "__main__":
+    unittest.main()
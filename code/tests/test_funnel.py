@@ -0,0 +1,65 @@
+import argparse
+import csv
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import airfoil_comparison
+import main
+import surrogate
+
+
+class TestFunnel(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.csv = self.tmpdir / 'screen.csv'
+        cds = {'A': 0.010, 'B': 0.0102, 'C': 0.012, 'D': 0.020, 'OLD': 0.001}
+        with open(self.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=surrogate.FIELDNAMES)
+            writer.writeheader()
+            for name, cd in cds.items():
+                for alpha in (0.0, 2.0):
+                    writer.writerow(dict(solver=surrogate.SOLVER_NAME, airfoil=name, alpha=alpha, Re=1e6, mach=0.1,
+                                         CL=0.1 * alpha, CD=cd, CM=0.0))
+        # OLD quedo en el CSV de un cribado anterior pero no es parte de esta corrida
+        self.profiles = {f'key_{n}': {'dat': str(self.tmpdir / f'{n}.dat')} for n in 'ABCD'}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _args(self, **kw):
+        base = dict(surrogate_csv=str(self.csv), comparison_metric='cd_mean', comparison_aoa_min=None,
+                    comparison_aoa_max=None, funnel_top_k=None, funnel_tol=None)
+        base.update(kw)
+        return argparse.Namespace(**base)
+
+    def test_select_candidates(self):
+        ranking = [{'airfoil': n, 'value': v} for n, v in (('A', 1.0), ('B', 1.04), ('C', 1.2))]
+        self.assertEqual([r['airfoil'] for r in airfoil_comparison.select_candidates(ranking, top_k=2)], ['A', 'B'])
+        self.assertEqual([r['airfoil'] for r in airfoil_comparison.select_candidates(ranking, tol=0.05)], ['A', 'B'])
+        self.assertEqual([r['airfoil'] for r in airfoil_comparison.select_candidates(ranking, top_k=1, tol=0.05)],
+                         ['A'])
+        self.assertEqual(len(airfoil_comparison.select_candidates(ranking)), 3)
+
+    def test_funnel_keeps_best_current_profiles(self):
+        self.assertEqual(list(main.funnel_profiles(self.profiles, self._args(funnel_top_k=2))), ['key_A', 'key_B'])
+        self.assertEqual(list(main.funnel_profiles(self.profiles, self._args(funnel_tol=0.25))),
+                         ['key_A', 'key_B', 'key_C'])
+
+    def test_funnel_from_streamed_aggregates(self):
+        args = self._args(funnel_top_k=2)
+        ranker = main._funnel_ranker(args)
+        with open(self.csv, newline='') as f:
+            ranker.update(csv.DictReader(f))
+        self.csv.unlink()
+        self.assertEqual(list(main.funnel_profiles(self.profiles, args, ranker=ranker)), ['key_A', 'key_B'])
+
+    def test_funnel_metric_direction(self):
+        # clcd: mayor es mejor
+        selected = main.funnel_profiles(self.profiles, self._args(comparison_metric='clcd_max', funnel_top_k=1))
+        self.assertEqual(list(selected), ['key_A'])
+
+
+if __name__ == '__main__':
+    unittest.main()
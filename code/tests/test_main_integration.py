@@ -151,6 +151,8 @@ class TestMainPipelineIntegration(unittest.TestCase):
             pipeline.run_su2 = fake_run
             pipeline.run_case(dat_path, case_name, aoa=2.0)
             pipeline.run_case(dat_path, case_name, aoa=2.0)
+            # run_case registra en results/summary.sqlite; el CSV se exporta bajo demanda
+            pipeline.export_summary()
             # Check that CSV contains a single row for the case (excluding header)
             summary = Path('results') / 'summary.csv'
             self.assertTrue(summary.exists())
@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import mesh_generator
+
+
+def _naca0012_dat(path):
+    x = (1 - np.cos(np.linspace(0, np.pi, 41))) / 2
+    yt = 0.6 * (0.2969 * np.sqrt(x) - 0.126 * x - 0.3516 * x**2 + 0.2843 * x**3 - 0.1015 * x**4)
+    pts = np.vstack([np.c_[x[::-1], yt[::-1]], np.c_[x[1:], -yt[1:]]])
+    np.savetxt(path, pts)
+
+
+class _Recorder:
+    """Atributo cualquiera -> funcion que anota (ruta, args) en `calls`; devuelve tags crecientes."""
+
+    def __init__(self, calls, path=""):
+        self._calls = calls
+        self._path = path
+
+    def __getattr__(self, name):
+        path = f"{self._path}.{name}" if self._path else name
+        if name in ("model", "geo", "mesh", "field", "option"):
+            child = _Recorder(self._calls, path)
+            setattr(self, name, child)
+            return child
+
+        def record(*args, **kwargs):
+            self._calls.append((path, args))
+            return len(self._calls)
+        return record
+
+
+def _fake_gmsh(calls):
+    """Modulo gmsh falso que registra las llamadas a la API, para probarla sin libgmsh."""
+    gmsh = _Recorder(calls)
+    gmsh.write = lambda path: (calls.append(("write", (path,))), Path(path).write_text("NDIME= 2\n"))
+    return gmsh
+
+
+class TestMeshBackends(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.dat = self.tmpdir / 'n0012.dat'
+        _naca0012_dat(self.dat)
+        self.backup = (mesh_generator.subprocess.run, mesh_generator._import_gmsh, mesh_generator.GMSH_CMD)
+
+    def tearDown(self):
+        mesh_generator.subprocess.run, mesh_generator._import_gmsh, mesh_generator.GMSH_CMD = self.backup
+        shutil.rmtree(self.tmpdir)
+
+    def test_auto_falls_back_to_cli_with_geo_next_to_mesh(self):
+        calls = []
+        mesh_generator._import_gmsh = lambda: None
+        mesh_generator.GMSH_CMD = 'gmsh'
+        geo_text = []
+        mesh_generator.subprocess.run = lambda args, **kw: (calls.append(args), geo_text.append(Path(args[1]).read_text()))
+        cwd_files = set(os.listdir('.'))
+        mesh = self.tmpdir / 'case' / 'mesh.su2'
+        mesh.parent.mkdir()
+        mesh_generator.generate_su2_mesh(str(self.dat), str(mesh), backend='auto')
+        geo = self.tmpdir / 'case' / 'mesh.geo'
+        self.assertEqual(calls, [['gmsh', str(geo), '-2', '-o', str(mesh), '-format', 'su2']])
+        self.assertIn('Physical Curve("airfoil") = {1};', geo_text[0])
+        # el .geo se borra al terminar
+        self.assertFalse(geo.exists())
+        self.assertEqual(set(os.listdir('.')), cwd_files)
+
+    def test_cli_removes_geo_when_gmsh_fails(self):
+        def failing_run(args, **kw):
+            raise OSError("gmsh no arranca")
+        mesh_generator.GMSH_CMD = 'gmsh'
+        mesh_generator.subprocess.run = failing_run
+        mesh = self.tmpdir / 'cli.su2'
+        with self.assertRaises(OSError):
+            mesh_generator.generate_su2_mesh(str(self.dat), str(mesh), backend='cli')
+        self.assertEqual(sorted(p.name for p in self.tmpdir.iterdir()), ['n0012.dat'])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            mesh_generator.generate_su2_mesh(str(self.dat), str(self.tmpdir / 'm.su2'), backend='foo')
+
+    def test_api_call_sequence_with_fake_gmsh(self):
+        calls = []
+        pid_backup = mesh_generator._gmsh_pid
+        mesh_generator._gmsh_pid = None
+        mesh_generator._import_gmsh = lambda: _fake_gmsh(calls)
+        mesh = self.tmpdir / 'fake.su2'
+        try:
+            mesh_generator.generate_su2_mesh(str(self.dat), str(mesh), backend='api')
+        finally:
+            mesh_generator._gmsh_pid = pid_backup
+        self.assertTrue(mesh.exists())
+        by_name = {}
+        for name, args in calls:
+            by_name.setdefault(name, []).append(args)
+
+        n_pts = len(mesh_generator.prepare_airfoil_points(str(self.dat)))
+        airfoil_pts = [a for a in by_name['model.geo.addPoint'] if a[4] < 1000]
+        self.assertEqual([a[4] for a in airfoil_pts], list(range(1, len(airfoil_pts) + 1)))
+        self.assertIn(len(airfoil_pts), (n_pts, n_pts - 1))
+        # spline cerrada sobre el primer nodo, farfield con tags 1001-1004
+        self.assertEqual(by_name['model.geo.addSpline'], [(list(range(1, len(airfoil_pts) + 1)) + [1], 1)])
+        self.assertEqual([a[4] for a in by_name['model.geo.addPoint'] if a[4] > 1000], [1001, 1002, 1003, 1004])
+        self.assertEqual(by_name['model.geo.addLine'],
+                         [(1001, 1002, 1001), (1002, 1003, 1002), (1003, 1004, 1003), (1004, 1001, 1004)])
+        self.assertEqual(by_name['model.geo.addCurveLoop'], [([1], 1), ([1001, 1002, 1003, 1004], 2)])
+        self.assertEqual(by_name['model.geo.addPlaneSurface'], [([2, 1], 10)])
+        self.assertEqual(by_name['model.geo.mesh.setRecombine'], [(2, 10)])
+
+        groups = by_name['model.addPhysicalGroup']
+        self.assertEqual(groups, [(2, [10]), (1, [1001, 1002, 1003, 1004]), (1, [1])])
+        self.assertEqual([(a[0], a[2]) for a in by_name['model.setPhysicalName']],
+                         [(2, "fluid"), (1, "farfield"), (1, "airfoil")])
+
+        p = mesh_generator.MESH_PARAMS
+        self.assertEqual(by_name['model.mesh.field.add'], [("BoundaryLayer", 1), ("Distance", 2), ("Threshold", 3)])
+        self.assertEqual(by_name['model.mesh.field.setNumbers'], [(1, "CurvesList", [1]), (2, "CurvesList", [1])])
+        numbers = {(a[0], a[1]): a[2] for a in by_name['model.mesh.field.setNumber']}
+        self.assertEqual(numbers[(1, "Size")], p["bl_hwall_n"])
+        self.assertEqual(numbers[(1, "Thickness")], p["bl_thickness"])
+        self.assertEqual(numbers[(3, "InField")], 2)
+        self.assertEqual(numbers[(3, "SizeMin")], p["thr_lc_min"])
+        self.assertEqual(numbers[(3, "DistMax")], p["thr_dist_max"])
+        self.assertEqual(by_name['model.mesh.field.setAsBackgroundMesh'], [(3,)])
+
+        order = [name for name, _ in calls]
+        self.assertLess(order.index('model.geo.synchronize'), order.index('model.addPhysicalGroup'))
+        self.assertEqual(order[-3:], ['model.mesh.generate', 'write', 'model.remove'])
+        self.assertEqual(by_name['model.mesh.generate'], [(2,)])
+        self.assertEqual(by_name['write'], [(str(mesh),)])
+
+    @unittest.skipIf(mesh_generator._import_gmsh() is None, "modulo gmsh no disponible")
+    def test_api_writes_su2_with_markers(self):
+        mesh = self.tmpdir / 'api.su2'
+        mesh_generator.generate_su2_mesh(str(self.dat), str(mesh), backend='api')
+        text = mesh.read_text()
+        self.assertIn('NDIME= 2', text)
+        for marker in ('airfoil', 'farfield'):
+            self.assertIn(f'MARKER_TAG= {marker}', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
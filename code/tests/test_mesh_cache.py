@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import mesh_cache
+import mesh_generator
+
+
+class TestMeshCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.cache_dir = str(self.tmpdir / 'cache')
+        self.dat = self.tmpdir / 'foil.dat'
+        self.dat.write_text('foil\n1.0 0.0\n0.5 0.05\n0.0 0.0\n0.5 -0.05\n1.0 0.0\n')
+        self.limit_backup = os.environ.get('MESH_CACHE_MAX_MB')
+        os.environ.pop('MESH_CACHE_MAX_MB', None)
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        if self.limit_backup is not None:
+            os.environ['MESH_CACHE_MAX_MB'] = self.limit_backup
+
+    def fake_gen(self, dat_file, mesh_file):
+        self.calls.append(mesh_file)
+        Path(mesh_file).write_text(f'NDIME= 2\n% {len(self.calls)}\n')
+
+    def test_params_reach_the_generator(self):
+        received = []
+
+        def gen(dat_file, mesh_file, params=None):
+            received.append(params)
+            Path(mesh_file).write_text('NDIME= 2\n')
+
+        params = {'bl_hwall_n': 1e-6}
+        mesh_cache.get_or_create_mesh(str(self.dat), self._case_mesh('AoA0'), self.cache_dir, generate=gen, params=params)
+        mesh_cache.get_or_create_mesh(str(self.dat), self._case_mesh('AoA2'), self.cache_dir, generate=gen)
+        self.assertEqual(received, [params, None])
+
+    def _case_mesh(self, name):
+        out = self.tmpdir / name / f'{name}_airfoil_mesh.su2'
+        out.parent.mkdir(parents=True, exist_ok=True)
+        return str(out)
+
+    def test_key_depends_on_points_and_params(self):
+        pts = mesh_generator.prepare_airfoil_points(str(self.dat))
+        key = mesh_cache.mesh_key(pts)
+        self.assertEqual(key, mesh_cache.mesh_key(pts.copy()))
+        self.assertNotEqual(key, mesh_cache.mesh_key(pts, {'bl_hwall_n': 1e-6}))
+        self.assertNotEqual(key, mesh_cache.mesh_key(pts * 1.01))
+
+    def test_cases_share_one_generated_mesh(self):
+        a, b = self._case_mesh('AoA0'), self._case_mesh('AoA2')
+        self.assertFalse(mesh_cache.get_or_create_mesh(str(self.dat), a, self.cache_dir, generate=self.fake_gen))
+        self.assertTrue(mesh_cache.get_or_create_mesh(str(self.dat), b, self.cache_dir, generate=self.fake_gen))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(Path(a).read_text(), Path(b).read_text())
+        self.assertTrue(os.path.samefile(a, b))
+        self.assertEqual(os.stat(a).st_nlink, 3)
+
+    def test_evict_only_unreferenced_meshes(self):
+        a = self._case_mesh('AoA0')
+        mesh_cache.get_or_create_mesh(str(self.dat), a, self.cache_dir, generate=self.fake_gen)
+        orphan = Path(self.cache_dir) / ('0' * 64 + '.su2')
+        orphan.write_text('old mesh')
+        os.utime(orphan, (1, 1))
+        removed = mesh_cache.evict(self.cache_dir, max_bytes=0)
+        self.assertEqual(removed, [orphan.name])
+        self.assertTrue(Path(a).exists())
+
+    def test_evict_sweeps_stale_part_files(self):
+        a = self._case_mesh('AoA0')
+        mesh_cache.get_or_create_mesh(str(self.dat), a, self.cache_dir, generate=self.fake_gen)
+        cache = Path(self.cache_dir)
+        stale = [cache / ('1' * 64 + '.123.part.su2'), cache / ('1' * 64 + '.123.part.geo')]
+        fresh = cache / ('2' * 64 + '.456.part.geo')
+        for path in stale + [fresh]:
+            path.write_text('interrumpido')
+        for path in stale:
+            os.utime(path, (1, 1))
+        mesh_cache.evict(self.cache_dir)
+        self.assertEqual([p for p in stale if p.exists()], [])
+        # un temporal reciente puede ser de otro proceso mallando: no se toca
+        self.assertTrue(fresh.exists())
+        self.assertEqual(len(list(cache.glob('*.su2'))), 1)
+        self.assertTrue(Path(a).exists())
+
+    def test_without_hardlinks_the_case_gets_a_copy_not_a_symlink(self):
+        def no_link(src, dst):
+            raise OSError('sin hard links')
+        link_backup, os.link = os.link, no_link
+        try:
+            a = self._case_mesh('AoA0')
+            mesh_cache.get_or_create_mesh(str(self.dat), a, self.cache_dir, generate=self.fake_gen)
+        finally:
+            os.link = link_backup
+        self.assertFalse(os.path.islink(a))
+        # la copia no depende de la entrada del cache, que se puede limpiar sin romper el caso
+        mesh_cache.evict(self.cache_dir, max_bytes=0)
+        self.assertEqual(list(Path(self.cache_dir).glob('*.su2')), [])
+        self.assertTrue(Path(a).read_text().startswith('NDIME'))
+
+    def test_failed_generation_leaves_no_part_file(self):
+        def failing_gen(dat_file, mesh_file):
+            Path(mesh_file).write_text('a medias')
+            raise RuntimeError('gmsh fallo')
+        with self.assertRaises(RuntimeError):
+            mesh_cache.get_or_create_mesh(str(self.dat), self._case_mesh('AoA0'), self.cache_dir, generate=failing_gen)
+        self.assertEqual(list(Path(self.cache_dir).iterdir()), [])
+
+    def test_zero_limit_disables_cache(self):
+        os.environ['MESH_CACHE_MAX_MB'] = '0'
+        a = self._case_mesh('AoA0')
+        mesh_cache.get_or_create_mesh(str(self.dat), a, self.cache_dir, generate=self.fake_gen)
+        self.assertEqual(self.calls, [a])
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
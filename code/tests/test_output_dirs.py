@@ -128,7 +128,7 @@ class TestOutputDirectories(unittest.TestCase):
             self.assertTrue((Path(tmpdir) / 'run_summary.json').exists())
 
             # check that config_tmp references the output dir for breakdown
-            cfg_tmp = Path('config_tmp.cfg')
+            cfg_tmp = Path(tmpdir) / 'config_tmp.cfg'
             text = cfg_tmp.read_text()
             import su2_runner as sr
             wsl_tmp = sr.to_wsl(str(Path(tmpdir).resolve()))
@@ -164,7 +164,7 @@ class TestOutputDirectories(unittest.TestCase):
                 f.write('Total CL: 0.75\nTotal CD: 0.075\nTotal CM: 0.015\n')
             # run with cfl override
             su2_runner.run_su2(mesh_file, pipeline.CFG_INVISCID, output_dir=tmpdir, viscous=False, cfl=0.25)
-            cfg_tmp = Path('config_tmp.cfg')
+            cfg_tmp = Path(tmpdir) / 'config_tmp.cfg'
             text = cfg_tmp.read_text()
             self.assertIn('CFL = 0.25', text)
         finally:
@@ -0,0 +1,164 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import profile_generators
+
+
+def _naca_reference(chord_start, chord_end, chord_step, positions_count, antenna_length, antenna_height,
+                    n_points=200, thickness_min=0.02, thickness_max=0.5):
+    """Busqueda punto a punto original: {nombre: espesor minimo}."""
+    found = {}
+    chords = np.arange(chord_start, chord_end + 1e-6, chord_step)
+    thickness_range = np.arange(thickness_min, thickness_max + 1e-9, 0.01)
+    for c in chords:
+        if c - antenna_length <= 0:
+            continue
+        for pos_x in np.linspace(0.05, (c - antenna_length) * 0.9, positions_count):
+            for t in thickness_range:
+                x = np.linspace(0, c, n_points)
+                y = 5 * t * c * (0.2969 * np.sqrt(x / c) - 0.1260 * (x / c) - 0.3516 * (x / c) ** 2
+                                 + 0.2843 * (x / c) ** 3 - 0.1015 * (x / c) ** 4)
+                zona = (x >= pos_x) & (x <= pos_x + antenna_length)
+                if pos_x + antenna_length > x[-1] or not zona.any():
+                    continue
+                if np.min(y[zona]) >= antenna_height / 2 + 0.005:
+                    found[f"C{c:.1f}_NACA00{int(round(t * 100)):02d}_Pos{pos_x:.2f}m"] = t
+                    break
+    return found
+
+
+class TestNacaAntennaProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_matches_pointwise_search(self):
+        params = dict(chord_start=4.6, chord_end=7.0, chord_step=0.2, positions_count=7,
+                      antenna_length=4.5, antenna_height=0.4)
+        out = profile_generators.generate_naca_antenna_profiles(output_dir=self.tmpdir, **params)
+        self.assertTrue(out)
+        self.assertEqual(set(out), set(_naca_reference(**params)))
+
+    def test_dat_keeps_format(self):
+        out = profile_generators.generate_naca_antenna_profiles(
+            chord_start=6.0, chord_end=6.0, positions_count=1, n_points=50, output_dir=self.tmpdir)
+        (name, info), = out.items()
+        lines = Path(info["dat"]).read_text().splitlines()
+        self.assertEqual(lines[0], name)
+        self.assertEqual(len(lines), 1 + 2 * 50 - 1)
+        self.assertTrue(lines[1].startswith(" 6.000000  "))
+
+
+def _rotodomo_reference(chords, thickness_range, antenna_length=4.5, antenna_height=0.3):
+    """Chequeo original de esquinas: {nombre: espesor minimo}."""
+    found = {}
+    for c in chords:
+        if c - antenna_length <= 0:
+            continue
+        pos_x = c / 2.0 - antenna_length / 2.0
+        for t in thickness_range:
+            a, b, cx = c / 2.0, c * t / 2.0, c / 2.0
+            esquinas = [(px, py) for px in (pos_x, pos_x + antenna_length)
+                        for py in (antenna_height / 2.0, -antenna_height / 2.0)]
+            if all(((px - cx) ** 2 / a**2) + (py**2 / b**2) <= 0.99 for px, py in esquinas):
+                found[f"ROTO_c{c:.1f}_t{int(round(t * 100)):02d}"] = t
+                break
+    return found
+
+
+class TestRotodomoProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_quantized_matches_corner_check(self):
+        out = profile_generators.generate_rotodomo_profiles(chord_start=4.0, chord_end=8.0, chord_step=0.1,
+                                                            antenna_height=0.6, output_dir=self.tmpdir)
+        ref = _rotodomo_reference(np.arange(4.0, 8.0 + 1e-6, 0.1), np.arange(0.05, 0.45 + 1e-9, 0.01),
+                                  antenna_height=0.6)
+        self.assertTrue(out)
+        self.assertEqual(set(out), set(ref))
+
+    def test_continuous_thickness_is_tight(self):
+        chords = np.array([5.0, 6.0, 9.0])
+        t_min = profile_generators.rotodomo_min_thickness(chords)
+        a, b = chords / 2.0, chords * t_min / 2.0
+        val = (4.5 / 2) ** 2 / a**2 + 0.15**2 / b**2
+        np.testing.assert_allclose(val, 0.99)
+        self.assertTrue(np.isnan(profile_generators.rotodomo_min_thickness([4.5]))[0])
+
+        out = profile_generators.generate_rotodomo_profiles(chord_start=6.0, chord_end=6.0, continuous=True,
+                                                            output_dir=self.tmpdir)
+        (name, info), = out.items()
+        self.assertEqual(name, f"ROTO_c6.0_t{t_min[1] * 100:.2f}")
+        pts = np.loadtxt(info["dat"], skiprows=1)
+        self.assertAlmostEqual(pts[:, 1].max(), 6.0 * t_min[1] / 2.0, places=4)
+
+
+def _bezier_reference(chords, sharpness_list, thickness_range, antenna_length=4.5, antenna_height=0.3, n_points=200):
+    """Busqueda curva a curva original: {nombre: espesor minimo}."""
+    found = {}
+    tt = np.linspace(0, 1, n_points // 2)
+    for c in chords:
+        pos_x = c / 2.0 - antenna_length / 2.0
+        for sharp in sharpness_list:
+            for t in thickness_range:
+                ctrl = np.array([[0.0, 0.0], [c / 2 * (0.5 * sharp), 0.0], [c / 2 * (1.0 - 0.2), c * t / 2],
+                                 [c / 2, c * t / 2]])
+                half = sum(np.outer(w, p) for w, p in zip(
+                    [(1 - tt) ** 3, 3 * (1 - tt) ** 2 * tt, 3 * (1 - tt) * tt**2, tt**3], ctrl))
+                x = np.concatenate([half[:, 0], (c - half[::-1, 0])[1:]])
+                y = np.concatenate([half[:, 1], half[::-1, 1][1:]])
+                zona = (x >= pos_x) & (x <= pos_x + antenna_length)
+                if pos_x < x[0] or pos_x + antenna_length > x[-1] or not zona.any():
+                    continue
+                if np.min(2 * y[zona]) >= antenna_height + 0.01:
+                    found[f"SYM_c{c:.1f}_s{int(sharp * 10)}_t{int(round(t * 100)):02d}"] = t
+                    break
+    return found
+
+
+class TestBezierProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_family_matches_single_curve(self):
+        chords, sharpness, thickness = [6.0, 8.5], [0.1, 0.45], [0.05, 0.2, 0.33]
+        x, y = profile_generators.bezier_symmetric_family(chords, sharpness, thickness, n_points=60)
+        self.assertEqual(x.shape, (2, 2, 1, 59))
+        self.assertEqual(y.shape, (2, 1, 3, 59))
+        c, s, t = 8.5, 0.45, 0.2
+        tt = np.linspace(0, 1, 30)
+        ctrl = np.array([[0.0, 0.0], [c / 2 * 0.5 * s, 0.0], [c / 2 * 0.8, c * t / 2], [c / 2, c * t / 2]])
+        half = sum(np.outer(w, p) for w, p in zip(
+            [(1 - tt) ** 3, 3 * (1 - tt) ** 2 * tt, 3 * (1 - tt) * tt**2, tt**3], ctrl))
+        np.testing.assert_allclose(x[1, 1, 0, :30], half[:, 0])
+        np.testing.assert_allclose(y[1, 0, 1, :30], half[:, 1])
+        np.testing.assert_allclose(x[1, 1, 0, 30:], c - half[::-1, 0][1:])
+
+    def test_minimum_thickness_per_sharpness(self):
+        sharpness = [0.1, 0.35, 0.5, 0.9]
+        out = profile_generators.generate_bezier_profiles(chord_start=6.0, chord_end=7.5, chord_step=0.25,
+                                                          sharpness_list=sharpness, antenna_height=0.5,
+                                                          output_dir=self.tmpdir)
+        self.assertEqual(set(out), set(_bezier_reference(np.arange(6.0, 7.5 + 1e-6, 0.25), sharpness,
+                                                         np.arange(0.05, 0.55 + 1e-9, 0.01), antenna_height=0.5)))
+        first = next(iter(out.values()))
+        pts = np.loadtxt(first["dat"], skiprows=1)
+        self.assertEqual(pts.shape, (2 * 199, 2))
+        np.testing.assert_allclose(pts[199:], pts[198::-1] * [1, -1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import main
+import mesh_generator
+import profile_generators
+import profile_store
+import surrogate
+from Airfoil_Generator import Airfoil
+
+
+class TestProfileStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.kw = dict(chord_start=6.0, chord_end=6.5, antenna_height=0.4)
+        self.store = self.tmpdir / profile_store.STORE_NAME
+        self.profiles = profile_store.write_store(profile_generators.iter_rotodomo_profiles(**self.kw), self.store)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_refs_are_mapped_views(self):
+        shapes = list(profile_generators.iter_rotodomo_profiles(**self.kw))
+        self.assertEqual(list(self.profiles), [s.name for s in shapes])
+        self.assertEqual(profile_store.list_profiles(self.store), list(self.profiles))
+        data, _index = profile_store.open_store(self.store)
+        for shape in shapes:
+            ref = self.profiles[shape.name]['dat']
+            self.assertTrue(profile_store.is_ref(ref))
+            self.assertEqual(profile_store.profile_name(ref), shape.name)
+            pts = profile_store.load_points(ref)
+            self.assertTrue(np.shares_memory(pts, data))
+            np.testing.assert_array_equal(pts, shape.coords)
+        self.assertFalse(profile_store.is_ref('perfiles/NACA0012#1.dat'))
+        self.assertEqual(profile_store.profile_name('perfiles/C5.0_NACA0012_Pos0.05m.dat'), 'C5.0_NACA0012_Pos0.05m')
+
+    def test_readers_accept_refs(self):
+        name, info = next(iter(self.profiles.items()))
+        ref = info['dat']
+        expected = profile_store.load_points(ref)
+        np.testing.assert_array_equal(mesh_generator.load_airfoil_points(ref), expected)
+        np.testing.assert_array_equal(surrogate.load_coordinates(ref), expected)
+        foil = Airfoil.from_store(ref)
+        self.assertEqual(foil.name, name)
+        self.assertTrue(np.shares_memory(foil.X, expected))
+        pts = mesh_generator.prepare_airfoil_points(ref)
+        self.assertGreater(len(pts), 100)
+
+    def test_export_dat_matches_generator_output(self):
+        exported = profile_store.export_dat(self.store, self.tmpdir / 'dat')
+        generated = profile_generators.generate_rotodomo_profiles(output_dir=str(self.tmpdir / 'gen'), **self.kw)
+        self.assertEqual(list(exported), list(generated))
+        for name in generated:
+            self.assertEqual(Path(exported[name]['dat']).read_bytes(), Path(generated[name]['dat']).read_bytes())
+
+    def test_naca_export_matches_save_dat_byte_for_byte(self):
+        t_list, c_list = [0.12, 0.15], [1.0, 2.0]
+        store = self.tmpdir / 'naca' / profile_store.STORE_NAME
+        refs = profile_store.write_store(main.iter_airfoils(t_list, c_list), store)
+        saved = main.generate_airfoils(t_list, c_list, output_folder=str(self.tmpdir / 'saved'))
+        self.assertEqual(list(refs), list(saved))
+        exported = profile_store.export_dat(store, self.tmpdir / 'exported')
+        for name, info in saved.items():
+            self.assertEqual(Path(exported[name]['dat']).read_bytes(), Path(info['dat']).read_bytes())
+            os.utime(info['dat'], (1, 1))
+        # sobre los .dat de Airfoil.save_dat, skip_unchanged no reescribe ninguno
+        profile_store.export_dat(store, self.tmpdir / 'saved')
+        self.assertEqual({os.path.getmtime(info['dat']) for info in saved.values()}, {1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import pipeline
+import result_cache
+import su2_runner
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.mesh_file = str(self.tmpdir / 'airfoil_mesh.su2')
+        Path(self.mesh_file).write_text('NDIME= 2\n')
+        self.env_backup = os.environ.get('SU2_RESULT_CACHE')
+        os.environ['SU2_RESULT_CACHE'] = str(self.tmpdir / 'cache')
+        self.backup = (su2_runner._check_su2_available, su2_runner.subprocess.run)
+        su2_runner._check_su2_available = lambda: 'SU2_CFD'
+        self.launches = []
+
+        def fake_run(*args, **kwargs):
+            out = Path(args[0][-1]).parent
+            self.launches.append(out.name)
+            (out / 'forces_breakdown.dat').write_text('Total CL: 0.5\nTotal CD: 0.05\nTotal CM: 0.01\n')
+            (out / 'history.csv').write_text('"Inner_Iter","rms[Rho]"\n42,-9.5\n')
+
+            class R:
+                returncode = 0
+                stdout = 'All convergence criteria satisfied. Converged | YES'
+                stderr = ''
+            return R()
+
+        su2_runner.subprocess.run = fake_run
+
+    def tearDown(self):
+        su2_runner._check_su2_available, su2_runner.subprocess.run = self.backup
+        if self.env_backup is None:
+            os.environ.pop('SU2_RESULT_CACHE', None)
+        else:
+            os.environ['SU2_RESULT_CACHE'] = self.env_backup
+        shutil.rmtree(self.tmpdir)
+
+    def _run(self, name, aoa=2.0):
+        return su2_runner.run_su2(self.mesh_file, pipeline.CFG_INVISCID, aoa=aoa, output_dir=str(self.tmpdir / name),
+                                  retries=0)
+
+    def test_converged_case_is_served_from_cache(self):
+        first = self._run('run1')
+        second = self._run('run2')
+        self.assertEqual(self.launches, ['run1'])
+        self.assertEqual(first, second)
+        self.assertEqual(second[3], 42)
+        for name in ('forces_breakdown.dat', 'history.csv', 'run_summary.json'):
+            self.assertTrue((self.tmpdir / 'run2' / name).exists(), name)
+
+    def test_new_condition_or_mesh_is_solved(self):
+        self._run('run1')
+        self._run('run2', aoa=4.0)
+        Path(self.mesh_file).write_text('NDIME= 2\n% otra malla\n')
+        self._run('run3')
+        self.assertEqual(self.launches, ['run1', 'run2', 'run3'])
+
+    def test_cached_case_skips_reset_and_meshing(self):
+        dat = self.tmpdir / 'foil.dat'
+        dat.write_text('foil\n1.0 0.0\n0.5 0.05\n0.0 0.0\n0.5 -0.05\n1.0 0.0\n')
+        meshed, resets = [], []
+
+        def fake_mesh(dat_file, mesh_file):
+            meshed.append(mesh_file)
+            Path(mesh_file).write_text('NDIME= 2\n')
+
+        backup = (pipeline.generate_su2_mesh, pipeline.mesh_cache.get_or_create_mesh, os.environ.get('MESH_CACHE_MAX_MB'))
+        os.environ.pop('MESH_CACHE_MAX_MB', None)
+        pipeline.generate_su2_mesh = fake_mesh
+        get_or_create = pipeline.mesh_cache.get_or_create_mesh
+        pipeline.mesh_cache.get_or_create_mesh = lambda *a, **kw: (resets.append(a[1]), get_or_create(*a, **kw))[1]
+        try:
+            first = pipeline.run_case(str(dat), 'caso', aoa=2.0, root_dir=str(self.tmpdir), retries=0)
+            case_dir = self.tmpdir / pipeline.SU2_RESULTS_DIR / 'caso'
+            (case_dir / 'inviscid' / 'forces_breakdown.dat').unlink()
+            second = pipeline.run_case(str(dat), 'caso', aoa=2.0, root_dir=str(self.tmpdir), retries=0)
+        finally:
+            pipeline.generate_su2_mesh, pipeline.mesh_cache.get_or_create_mesh, limit = backup
+            if limit is not None:
+                os.environ['MESH_CACHE_MAX_MB'] = limit
+        self.assertEqual(self.launches, ['inviscid', 'viscous'])
+        self.assertEqual(len(meshed), 1)
+        # el segundo caso no pasa por el mallado: solo enlaza la malla cacheada
+        self.assertEqual(len(resets), 1)
+        self.assertEqual(first, second)
+        self.assertTrue((case_dir / 'inviscid' / 'forces_breakdown.dat').exists())
+        self.assertTrue((self.tmpdir / pipeline.MESH_DIR / 'caso' / 'caso_airfoil_mesh.su2').exists())
+
+    def test_key_ignores_paths_and_comments(self):
+        a, b = self.tmpdir / 'a.cfg', self.tmpdir / 'b.cfg'
+        a.write_text('% caso\nAOA = 2.0\nMESH_FILENAME = /x/mesh.su2\nITER= 100\n')
+        b.write_text('ITER = 100\nMESH_FILENAME = /y/mesh.su2\nAOA=2.0   % comentario\n')
+        self.assertEqual(result_cache.result_key('m', str(a), 's'), result_cache.result_key('m', str(b), 's'))
+        self.assertNotEqual(result_cache.result_key('m', str(a), 's'), result_cache.result_key('m', str(a), 's2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import csv
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import airfoil_comparison
+import main
+import result_export
+
+
+def _read(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+class TestCSVTee(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.rows = [dict(solver='neuralfoil', airfoil=f'P{i}', alpha=i, Re=1e6, mach=0.1, CL=0.1 * i, CD=0.01, CM=0.0)
+                     for i in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_rows_reach_disk_before_close(self):
+        main_csv, copy_csv = self.tmpdir / 'combined.csv', self.tmpdir / 'sub' / 'copy.csv'
+        out = result_export.CSVTee([main_csv, copy_csv, str(main_csv), ''])
+        self.assertEqual(out.paths, [str(main_csv), str(copy_csv)])
+        self.assertFalse(main_csv.exists())
+        out.write(self.rows[:2])
+        # ya volcado a disco aunque la corrida siga
+        self.assertEqual([r['airfoil'] for r in _read(main_csv)], ['P0', 'P1'])
+        out.write(self.rows[2:])
+        out.close()
+        self.assertEqual(out.count, 3)
+        self.assertEqual(main_csv.read_text(), copy_csv.read_text())
+        self.assertEqual(list(_read(copy_csv)[0]), result_export.FIELDNAMES)
+
+    def test_no_rows_no_file(self):
+        path = self.tmpdir / 'combined.csv'
+        with result_export.CSVTee([path]) as out:
+            out.write([])
+        self.assertFalse(path.exists())
+
+    def test_export_csv_wrapper(self):
+        path = self.tmpdir / 'combined.csv'
+        main.export_csv([dict(r, extra='x') for r in self.rows], out_path=str(path))
+        rows = _read(path)
+        self.assertEqual(len(rows), 3)
+        self.assertNotIn('extra', rows[0])
+
+
+class TestColumnarExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.rows = [dict(solver=solver, airfoil=f'P{i}', alpha=a, Re=1e6, mach=0.1, CL=0.1 * a + i, CD=0.01 * (i + 1),
+                          CM=0.0)
+                     for i in range(3) for a in (-2.0, 0.0, 2.0, 4.0) for solver in ('neuralfoil', 'su2-incomp')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @unittest.skipUnless(result_export.pa is None, "solo sin pyarrow")
+    def test_missing_pyarrow_fails_before_the_run(self):
+        with self.assertRaises(ImportError):
+            result_export.CSVTee([self.tmpdir / 'combined.csv', self.tmpdir / 'combined.parquet'])
+
+    @unittest.skipIf(result_export.pa is None, "pyarrow no instalado")
+    def test_columnar_ranking_matches_csv(self):
+        csv_path = self.tmpdir / 'combined.csv'
+        for suffix in ('.parquet', '.arrow'):
+            path = self.tmpdir / f'combined{suffix}'
+            with result_export.CSVTee([csv_path, path]) as out:
+                for r in self.rows:
+                    out.write([r])
+            for kwargs in (dict(), dict(solver='su2-incomp', aoa_min=0.0, aoa_max=2.0)):
+                expected = airfoil_comparison.compute_ranking(csv_path, metric='clcd_mean', **kwargs)
+                got = airfoil_comparison.compute_ranking(path, metric='clcd_mean', **kwargs)
+                self.assertEqual([(r['airfoil'], r['count']) for r in got],
+                                 [(r['airfoil'], r['count']) for r in expected])
+                for g, e in zip(got, expected):
+                    self.assertAlmostEqual(g['value'], e['value'])
+
+    @unittest.skipIf(result_export.pa is None, "pyarrow no instalado")
+    def test_batches_become_row_groups(self):
+        import pyarrow.parquet as pq
+        path = self.tmpdir / 'combined.parquet'
+        writer = result_export.ColumnarWriter(path, batch_rows=10)
+        writer.write(self.rows)
+        writer.close()
+        meta = pq.ParquetFile(path).metadata
+        self.assertEqual((meta.num_rows, meta.num_row_groups), (len(self.rows), 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import csv
+import multiprocessing as mp
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import results_db
+
+
+def _record_many(db_path, worker, n):
+    for i in range(n):
+        results_db.record(db_path, {'case': f'w{worker}_c{i}', 'aoa': float(i), 'CL_visc': 0.1 * i})
+
+
+class TestResultsDB(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.db = self.tmpdir / 'results' / results_db.DB_NAME
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _csv_rows(self):
+        with open(results_db.export_csv(self.db), newline='') as f:
+            return list(csv.reader(f))
+
+    def test_upsert_replaces_case_and_moves_it_last(self):
+        results_db.record(self.db, {'case': 'A', 'aoa': 0.0, 'CL_visc': np.float64(0.5), 'VIS_converged': True})
+        results_db.record(self.db, {'case': 'B', 'aoa': 2.0})
+        results_db.record(self.db, {'case': 'A', 'aoa': 0.0, 'CL_visc': 0.6, 'VIS_converged': False,
+                                    'VIS_final_iter': 120})
+        rows = self._csv_rows()
+        self.assertEqual(rows[0], results_db.SUMMARY_FIELDS)
+        self.assertEqual([r[1] for r in rows[1:]], ['B', 'A'])
+        a = dict(zip(rows[0], rows[2]))
+        self.assertEqual((a['CL_visc'], a['VIS_converged'], a['VIS_final_iter'], a['CL_inv']),
+                         ('0.6', 'False', '120', ''))
+
+    def test_imports_previous_summary_csv(self):
+        self.db.parent.mkdir(parents=True)
+        with open(self.db.parent / results_db.CSV_NAME, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(results_db.SUMMARY_FIELDS)
+            writer.writerow(['t0', 'OLD', 'old.dat', '0.0', '0.1', '1000000.0'] + [''] * 12)
+        results_db.record(self.db, {'case': 'NEW', 'aoa': 1.0})
+        self.assertEqual([r[1] for r in self._csv_rows()[1:]], ['OLD', 'NEW'])
+
+    @unittest.skipUnless(mp.get_start_method() == 'fork', "usa procesos con fork")
+    def test_concurrent_writers(self):
+        procs = [mp.Process(target=_record_many, args=(self.db, w, 25)) for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        self.assertTrue(all(p.exitcode == 0 for p in procs))
+        self.assertEqual(len(results_db.rows(self.db)), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
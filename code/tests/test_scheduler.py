@@ -0,0 +1,120 @@
+import multiprocessing as mp
+import os
+import shutil
+import unittest
+from pathlib import Path
+
+import pipeline
+import scheduler
+
+
+def fake_gen(dat_file, mesh_file):
+    os.makedirs(os.path.dirname(mesh_file), exist_ok=True)
+    with open(mesh_file, 'w') as f:
+        f.write('mesh')
+    # scratch file written to the cwd, like temp.geo
+    with open('temp.geo', 'w') as f:
+        f.write(mesh_file)
+
+
+def fake_run(mesh_file, cfg_template, aoa=0.0, mach=0.15, Re=1e6, viscous=False, max_iter=None, output_dir=None,
+             retries=1, strict=False, cfl=None, incompressible=False):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(Path(output_dir) / 'forces_breakdown.dat', 'w') as f:
+        f.write(f'Total CL: {aoa}\nTotal CD: 0.01\nTotal CM: 0.0\n')
+    return (float(aoa), 0.01, 0.0, 10, -8.0, True)
+
+
+class TestPlanResources(unittest.TestCase):
+    def test_fixed_jobs_fill_cores_with_ranks(self):
+        self.assertEqual(scheduler.plan_resources(100, jobs=4, mpi_ranks=0, cores=32), (4, 8))
+
+    def test_fixed_ranks_fill_cores_with_jobs(self):
+        self.assertEqual(scheduler.plan_resources(100, jobs=0, mpi_ranks=8, cores=32), (4, 8))
+        # never more concurrent cases than cases
+        self.assertEqual(scheduler.plan_resources(2, jobs=0, mpi_ranks=4, cores=32), (2, 4))
+
+    def test_auto_prefers_cases_then_ranks(self):
+        self.assertEqual(scheduler.plan_resources(100, cores=32), (32, 1))
+        self.assertEqual(scheduler.plan_resources(4, cores=32), (4, 8))
+
+    def test_explicit_values_are_kept(self):
+        self.assertEqual(scheduler.plan_resources(10, jobs=1, mpi_ranks=1, cores=32), (1, 1))
+
+
+class TestWarmStartChains(unittest.TestCase):
+    def test_chains_group_by_mesh_and_sort_polar(self):
+        cases = [
+            dict(dat_file='a.dat', case_name='a4', aoa=4.0, incompressible=True),
+            dict(dat_file='b.dat', case_name='b0', aoa=0.0, incompressible=True),
+            dict(dat_file='a.dat', case_name='a0', aoa=0.0, incompressible=True),
+            dict(dat_file='a.dat', case_name='a2', aoa=2.0, incompressible=True),
+        ]
+        self.assertEqual(scheduler.plan_chains(cases), [[2, 3, 0], [1]])
+
+    def test_each_point_restarts_from_nearest_completed(self):
+        backup = pipeline.run_case
+        calls = []
+
+        def fake_run_case(**case):
+            calls.append((case['case_name'], case.get('restart_from'), case.get('warm_start')))
+            return {"case": case['case_name'], "inviscid": None, "viscous": (0.1, 0.01, 0.0, 10, -8.0, True)}
+
+        pipeline.run_case = fake_run_case
+        try:
+            cases = [dict(dat_file='a.dat', case_name=f'a{a:g}', aoa=a, mach=0.2, Re=1e6, incompressible=True)
+                     for a in (8.0, 0.0, 2.0)]
+            done = []
+            results = scheduler.run_cases(cases, jobs=1, warm_start=True, on_result=lambda r: done.append(r['case']))
+        finally:
+            pipeline.run_case = backup
+        self.assertEqual([r['case'] for r in results], ['a8', 'a0', 'a2'])
+        # on_result sigue el orden en que terminan los casos, no el de envio
+        self.assertEqual(done, ['a0', 'a2', 'a8'])
+        donors = {name: (Path(d).name if d else None) for name, d, _ in calls}
+        self.assertEqual([c[0] for c in calls], ['a0', 'a2', 'a8'])
+        self.assertEqual(donors, {'a0': None, 'a2': 'a0', 'a8': 'a2'})
+        self.assertTrue(all(warm for _, _, warm in calls))
+
+
+@unittest.skipUnless(mp.get_start_method() == 'fork', "monkeypatching needs fork-started workers")
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.root = Path.cwd()
+        for d in ('meshes', 'results', scheduler.WORK_DIR):
+            if (self.root / d).exists():
+                shutil.rmtree(self.root / d)
+        self.backup = (pipeline.generate_su2_mesh, pipeline.run_su2)
+        pipeline.generate_su2_mesh = fake_gen
+        pipeline.run_su2 = fake_run
+        self.dat = self.root / 'sched_test.dat'
+        self.dat.write_text('test\n1.0 0.0\n0.0 0.0\n1.0 0.0\n')
+
+    def tearDown(self):
+        pipeline.generate_su2_mesh, pipeline.run_su2 = self.backup
+        for d in ('meshes', 'results', scheduler.WORK_DIR):
+            if (self.root / d).exists():
+                shutil.rmtree(self.root / d)
+        self.dat.unlink()
+
+    def test_parallel_results_in_submission_order(self):
+        aoas = [4.0, 0.0, 2.0, 6.0]
+        cases = [dict(dat_file=str(self.dat), case_name=f'SCHED_AoA{a}', aoa=a, incompressible=True)
+                 for a in aoas]
+        done = []
+        results = scheduler.run_cases(cases, jobs=3, on_result=lambda r: done.append(r['case']))
+        self.assertEqual([r['case'] for r in results], [c['case_name'] for c in cases])
+        self.assertEqual(sorted(done), sorted(c['case_name'] for c in cases))
+        self.assertEqual([r['viscous'][0] for r in results], aoas)
+        for c in cases:
+            self.assertTrue((self.root / 'results' / 'su2' / c['case_name'] / 'viscous' / 'forces_breakdown.dat').exists())
+            self.assertTrue((self.root / 'meshes' / c['case_name']).exists())
+        # scratch directories are per case and removed once the case finishes
+        self.assertFalse(any((self.root / scheduler.WORK_DIR).iterdir()))
+        self.assertFalse((self.root / 'temp.geo').exists())
+        rows = (self.root / 'results' / 'summary.csv').read_text().splitlines()
+        self.assertEqual(len(rows), 1 + len(cases))
+
+
+if __name__ == '__main__':
+    unittest.main()
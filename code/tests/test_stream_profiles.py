@@ -0,0 +1,152 @@
+import csv
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import main
+import profile_generators
+import surrogate
+
+
+class TestLazyProfiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_iterator_matches_written_profiles(self):
+        kw = dict(chord_start=6.0, chord_end=6.5, antenna_height=0.4)
+        shapes = list(profile_generators.iter_rotodomo_profiles(**kw))
+        self.assertEqual(list(self.tmpdir.iterdir()), [])
+        out = profile_generators.generate_rotodomo_profiles(output_dir=str(self.tmpdir), **kw)
+        self.assertEqual([s.name for s in shapes], list(out))
+        for shape in shapes:
+            np.testing.assert_allclose(np.loadtxt(out[shape.name]['dat'], skiprows=1), shape.coords, atol=1e-6)
+
+    def test_iterator_is_lazy(self):
+        shapes = profile_generators.iter_naca_antenna_profiles(chord_start=4.6, chord_end=100.0)
+        first = next(shapes)
+        self.assertEqual(first.family, 'naca_antenna')
+        self.assertIsNone(first.dat)
+        self.assertEqual(len(list(itertools.islice(shapes, 3))), 3)
+
+    def test_write_dat_only_once(self):
+        shape = next(profile_generators.iter_bezier_profiles(chord_start=6.0, chord_end=6.0))
+        path = shape.write_dat(str(self.tmpdir))
+        self.assertTrue(os.path.exists(path))
+        os.remove(path)
+        self.assertEqual(shape.write_dat(str(self.tmpdir / 'other')), path)
+        self.assertFalse(os.path.exists(path))
+
+
+class TestStreamPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.eval_backup = surrogate.evaluate_airfoil
+        self.calls = []
+
+        def fake_eval(dat_path, alpha_list, Re_list, mach_list, n_crit=9.0, coords=None, verbose=False, name=None):
+            name = name or Path(dat_path).stem
+            self.calls.append((name, None if coords is None else np.asarray(coords).shape))
+            return [dict(solver=surrogate.SOLVER_NAME, airfoil=name, alpha=a, Re=Re_list[0], mach=mach_list[0],
+                         CL=0.1, CD=0.01, CM=0.0) for a in alpha_list]
+
+        surrogate.evaluate_airfoil = fake_eval
+
+    def tearDown(self):
+        surrogate.evaluate_airfoil = self.eval_backup
+        shutil.rmtree(self.tmpdir)
+
+    def test_stream_surrogate_without_writing_profiles(self):
+        out_dir = self.tmpdir / 'profiles'
+        args = main.build_arg_parser().parse_args([
+            '--stream-profiles', '--skip-su2', '--profile-types', 'naca,rotodomo', '--t-list', '0.06,0.12',
+            '--rotodomo-c-start', '6.0', '--rotodomo-c-end', '6.2', '--aoa-list', '0,2',
+            '--profiles-output', str(out_dir), '--export-csv', str(self.tmpdir / 'combined.csv'),
+            '--comparison-csv', '',
+        ])
+        n_rows = main.run_pipeline(args)
+        names = [c[0] for c in self.calls]
+        self.assertEqual(names[:2], ['NACA0006_c1.0m', 'NACA0012_c1.0m'])
+        self.assertEqual(names[2:], ['ROTO_c6.0_t08', 'ROTO_c6.1_t08', 'ROTO_c6.2_t08'])
+        self.assertEqual(n_rows, 2 * len(names))
+        self.assertTrue((self.tmpdir / 'combined.csv').exists())
+        self.assertFalse(out_dir.exists())
+
+    def test_su2_cases_run_in_one_stage(self):
+        stages = []
+        backup = (main._prepare_su2, main.analyze_su2)
+        main._prepare_su2 = lambda args: True
+        main.analyze_su2 = lambda profiles, **kw: stages.append((dict(profiles), kw['jobs'])) or []
+        try:
+            args = main.build_arg_parser().parse_args([
+                '--stream-profiles', '--skip-aerosb', '--profile-types', 'naca', '--t-list', '0.06,0.12,0.18',
+                '--aoa-list', '0,2', '--jobs', '3', '--profiles-output', str(self.tmpdir / 'profiles'),
+                '--export-csv', str(self.tmpdir / 'combined.csv'), '--comparison-csv', '',
+            ])
+            main.run_pipeline(args)
+        finally:
+            main._prepare_su2, main.analyze_su2 = backup
+        self.assertEqual(len(stages), 1)
+        profiles, jobs = stages[0]
+        self.assertEqual(list(profiles), ['NACA0006_c1.0m', 'NACA0012_c1.0m', 'NACA0018_c1.0m'])
+        self.assertEqual(jobs, 3)
+        self.assertTrue(all(os.path.exists(info['dat']) for info in profiles.values()))
+
+    def test_batch_mode_skips_screening_by_default(self):
+        screen_csv = self.tmpdir / 'screen.csv'
+        args = main.build_arg_parser().parse_args([
+            '--skip-su2', '--profile-types', 'naca', '--t-list', '0.06,0.12', '--aoa-list', '0,2',
+            '--profiles-output', str(self.tmpdir / 'profiles'), '--surrogate-csv', str(screen_csv),
+            '--export-csv', str(self.tmpdir / 'combined.csv'), '--comparison-csv', '',
+        ])
+        n_rows = main.run_pipeline(args)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(n_rows, 4)
+        self.assertFalse(screen_csv.exists())
+
+    def test_funnel_and_final_ranking_from_streamed_output(self):
+        stages = []
+        backup = (main._prepare_su2, main.analyze_su2)
+        main._prepare_su2 = lambda args: True
+        main.analyze_su2 = lambda profiles, **kw: stages.append(list(profiles)) or []
+        ranking_csv = self.tmpdir / 'rankings.csv'
+        try:
+            args = main.build_arg_parser().parse_args([
+                '--funnel', '--funnel-top-k', '1', '--profile-types', 'naca', '--t-list', '0.06,0.12',
+                '--aoa-list', '0,2', '--profiles-output', str(self.tmpdir / 'profiles'),
+                '--surrogate-csv', str(self.tmpdir / 'screen.csv'), '--export-csv', str(self.tmpdir / 'combined.csv'),
+                '--comparison-csv', '', '--run-comparison', '--comparison-output', str(ranking_csv),
+            ])
+            self.assertEqual(main.run_pipeline(args), 4)
+        finally:
+            main._prepare_su2, main.analyze_su2 = backup
+        # empate en CD: gana el primero en aparecer
+        self.assertEqual(stages, [['NACA0006_c1.0m']])
+        with open(ranking_csv, newline='') as f:
+            ranked = list(csv.DictReader(f))
+        self.assertEqual([r['airfoil'] for r in ranked], ['NACA0006_c1.0m', 'NACA0012_c1.0m'])
+
+    def test_live_ranking_during_stream(self):
+        ranking_csv = self.tmpdir / 'rankings.csv'
+        args = main.build_arg_parser().parse_args([
+            '--stream-profiles', '--skip-su2', '--profile-types', 'naca', '--t-list', '0.06,0.12,0.18',
+            '--aoa-list', '0,2', '--profiles-output', str(self.tmpdir / 'profiles'),
+            '--export-csv', str(self.tmpdir / 'combined.csv'), '--comparison-csv', '',
+            '--run-comparison', '--comparison-stream', '--comparison-output', str(ranking_csv),
+        ])
+        main.run_pipeline(args)
+        with open(ranking_csv, newline='') as f:
+            ranked = list(csv.DictReader(f))
+        self.assertEqual(sorted(r['airfoil'] for r in ranked), sorted(set(c[0] for c in self.calls)))
+        self.assertTrue(all(r['count'] == '2' for r in ranked))
+
+
+if __name__ == "__main__":
+    unittest.main()
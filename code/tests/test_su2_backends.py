@@ -0,0 +1,73 @@
+import os
+import stat
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import su2_backends
+
+
+class TestSU2Backends(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.backend_backup = os.environ.get('SU2_BACKEND')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        if self.backend_backup is None:
+            os.environ.pop('SU2_BACKEND', None)
+        else:
+            os.environ['SU2_BACKEND'] = self.backend_backup
+
+    def _fake_install(self):
+        bin_dir = Path(self.tmpdir) / 'su2' / 'bin'
+        (bin_dir.parent / 'lib').mkdir(parents=True)
+        bin_dir.mkdir()
+        exe = bin_dir / 'SU2_CFD'
+        exe.write_text('#!/bin/sh\n')
+        exe.chmod(exe.stat().st_mode | stat.S_IXUSR)
+        return exe
+
+    def test_selection(self):
+        os.environ['SU2_BACKEND'] = 'wsl'
+        self.assertEqual(su2_backends.get_backend().name, 'wsl')
+        self.assertEqual(su2_backends.get_backend('native').name, 'native')
+        os.environ['SU2_BACKEND'] = 'auto'
+        self.assertEqual(su2_backends.get_backend().name, 'wsl' if os.name == 'nt' else 'native')
+        with self.assertRaises(ValueError):
+            su2_backends.get_backend('slurm')
+
+    def test_wsl_command_wraps_login_shell(self):
+        args, kwargs = su2_backends.WSLBackend().build_command('/usr/bin/SU2_CFD', '/home/u/runs/cfg.cfg', '/home/u/runs')
+        self.assertEqual(args[:3], ['wsl', 'bash', '-lc'])
+        self.assertIn('cd /home/u/runs && /usr/bin/SU2_CFD /home/u/runs/cfg.cfg', args[3])
+        self.assertEqual(su2_backends.to_wsl('C:\\runs\\cfg.cfg'), '/mnt/c/runs/cfg.cfg')
+        self.assertEqual(kwargs, {})
+
+    def test_native_command_calls_binary_directly(self):
+        exe = self._fake_install()
+        backend = su2_backends.NativeBackend()
+        self.assertEqual(backend.resolve([str(exe)], 'su2env'), str(exe))
+        args, kwargs = backend.build_command(str(exe), os.path.join(self.tmpdir, 'cfg.cfg'), self.tmpdir)
+        self.assertEqual(args, [str(exe), os.path.join(self.tmpdir, 'cfg.cfg')])
+        self.assertEqual(kwargs['cwd'], self.tmpdir)
+        env = kwargs['env']
+        self.assertTrue(env['PATH'].startswith(str(exe.parent)))
+        self.assertTrue(env['LD_LIBRARY_PATH'].startswith(str(exe.parent.parent / 'lib')))
+
+    def test_mpi_ranks_prefix_launcher(self):
+        args, _ = su2_backends.NativeBackend().build_command('/opt/su2/bin/SU2_CFD', '/runs/cfg.cfg', '/runs', mpi_ranks=8)
+        self.assertEqual(args, [su2_backends.SU2_MPIRUN, '-n', '8', '/opt/su2/bin/SU2_CFD', '/runs/cfg.cfg'])
+        args, _ = su2_backends.WSLBackend().build_command('SU2_CFD', '/runs/cfg.cfg', '/runs', mpi_ranks=4)
+        self.assertIn(f'{su2_backends.SU2_MPIRUN} -n 4 SU2_CFD /runs/cfg.cfg', args[3])
+        args, _ = su2_backends.NativeBackend().build_command('/opt/su2/bin/SU2_CFD', '/runs/cfg.cfg', '/runs', mpi_ranks=1)
+        self.assertEqual(args[0], '/opt/su2/bin/SU2_CFD')
+
+    def test_native_resolve_missing(self):
+        backend = su2_backends.NativeBackend()
+        self.assertIsNone(backend.resolve([os.path.join(self.tmpdir, 'nope', 'SU2_CFD')], 'no_such_env_xyz'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pipeline
+import su2_runner
+
+HEADER = "|  Inner_Iter|   rms[Rho]|  rms[RhoU]|          CL|          CD|         CMz|"
+
+FAKE_SOLVER = f"""#!{sys.executable}
+import sys
+print("{HEADER}", flush=True)
+for it in range(100000):
+    cl = 0.5 + (0.1 / (it + 1) if it < 50 else 0.0)
+    print(f"|{{it:>12d}}|{{-3.0:>11.4f}}|{{-3.5:>11.4f}}|{{cl:>12.6f}}|{{0.0123:>12.6f}}|{{-0.0450:>12.6f}}|", flush=True)
+"""
+
+
+class TestConvergenceMonitor(unittest.TestCase):
+    def test_detects_plateau_only_after_window(self):
+        mon = su2_runner.ConvergenceMonitor(tol=1e-4, window=5)
+        self.assertFalse(mon.feed("SU2 banner line"))
+        self.assertFalse(mon.feed(HEADER))
+        stops = []
+        for it, cl in enumerate([0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5]):
+            stops.append(mon.feed(f"|{it:>12d}|    -3.0000|    -3.5000|{cl:>12.6f}|    0.012300|   -0.045000|"))
+        self.assertEqual(stops, [False] * 6 + [True, True])
+        self.assertEqual(mon.iteration, 7)
+        self.assertAlmostEqual(mon.CD, 0.0123)
+        self.assertAlmostEqual(mon.CM, -0.045)
+
+    def test_ignores_rows_without_header(self):
+        mon = su2_runner.ConvergenceMonitor(tol=1e-4, window=2)
+        for it in range(5):
+            self.assertFalse(mon.feed(f"|{it:>12d}|    -3.0000|"))
+        self.assertIsNone(mon.CL)
+
+
+class TestRunSU2EarlyStop(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.backend_backup = os.environ.get('SU2_BACKEND')
+        self.check_backup = su2_runner._check_su2_available
+        os.environ['SU2_BACKEND'] = 'native'
+        solver = Path(self.tmpdir) / 'SU2_CFD'
+        solver.write_text(FAKE_SOLVER)
+        solver.chmod(solver.stat().st_mode | stat.S_IXUSR)
+        su2_runner._check_su2_available = lambda: str(solver)
+        self.mesh_file = str(Path(self.tmpdir) / 'airfoil_mesh.su2')
+        Path(self.mesh_file).write_text('mesh')
+
+    def tearDown(self):
+        su2_runner._check_su2_available = self.check_backup
+        if self.backend_backup is None:
+            os.environ.pop('SU2_BACKEND', None)
+        else:
+            os.environ['SU2_BACKEND'] = self.backend_backup
+        shutil.rmtree(self.tmpdir)
+
+    @unittest.skipIf(os.name == 'nt', "usa un ejecutable POSIX como solver falso")
+    def test_stops_solver_when_coefficients_settle(self):
+        out_dir = Path(self.tmpdir) / 'out'
+        res = su2_runner.run_su2(self.mesh_file, pipeline.CFG_INVISCID, output_dir=str(out_dir),
+                                 retries=0, early_stop_tol=1e-6, early_stop_window=20)
+        self.assertIsNotNone(res)
+        CL, CD, CM, final_iter, _final_rms, converged = res
+        self.assertTrue(converged)
+        self.assertAlmostEqual(CL, 0.5)
+        self.assertAlmostEqual(CD, 0.0123)
+        self.assertEqual(final_iter, 69)
+        summary = json.loads((out_dir / 'run_summary.json').read_text())
+        self.assertTrue(summary['early_stopped'])
+        self.assertIn(HEADER, (out_dir / 'su2_stdout.log').read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import shutil
+import unittest
+from pathlib import Path
+
+import su2_runner
+
+
+class _Result:
+    def __init__(self, stdout, returncode=0):
+        self.stdout = stdout
+        self.stderr = ''
+        self.returncode = returncode
+
+
+class TestSU2ResolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_backup = su2_runner.SU2_CACHE_FILE
+        self.run_backup = su2_runner.subprocess.run
+        self.backend_backup = os.environ.get('SU2_BACKEND')
+        os.environ['SU2_BACKEND'] = 'wsl'
+        su2_runner.SU2_CACHE_FILE = Path(self.tmpdir) / 'su2_resolution.json'
+        su2_runner._resolved_in_process.clear()
+        self.calls = []
+        self.env_mtime = '1700000000'
+
+        def fake_run(cmd, stdout=None, stderr=None, text=None):
+            self.calls.append(cmd)
+            script = cmd[-1]
+            if script.startswith('stat'):
+                return _Result(self.env_mtime + '\n')
+            return _Result('/opt/su2/bin/SU2_CFD\n')
+
+        su2_runner.subprocess.run = fake_run
+
+    def tearDown(self):
+        su2_runner.subprocess.run = self.run_backup
+        if self.backend_backup is None:
+            os.environ.pop('SU2_BACKEND', None)
+        else:
+            os.environ['SU2_BACKEND'] = self.backend_backup
+        su2_runner.SU2_CACHE_FILE = self.cache_backup
+        su2_runner._resolved_in_process.clear()
+        shutil.rmtree(self.tmpdir)
+
+    def _probes(self):
+        return [c for c in self.calls if c[1:3] == ['bash', '-lc']]
+
+    def test_resolved_once_per_process(self):
+        self.assertEqual(su2_runner._check_su2_available(), '/opt/su2/bin/SU2_CFD')
+        n_calls = len(self.calls)
+        self.assertTrue(su2_runner.is_su2_available())
+        self.assertEqual(su2_runner.get_su2_resolved_path(), '/opt/su2/bin/SU2_CFD')
+        self.assertEqual(len(self.calls), n_calls)
+        self.assertTrue(su2_runner.SU2_CACHE_FILE.exists())
+
+    def test_disk_cache_skips_login_shell_probes(self):
+        su2_runner._check_su2_available()
+        su2_runner._resolved_in_process.clear()
+        self.calls.clear()
+        self.assertEqual(su2_runner._check_su2_available(), '/opt/su2/bin/SU2_CFD')
+        self.assertEqual(self._probes(), [])
+
+    def test_conda_env_change_invalidates_entry(self):
+        su2_runner._check_su2_available()
+        su2_runner._resolved_in_process.clear()
+        self.calls.clear()
+        self.env_mtime = '1800000000'
+        su2_runner._check_su2_available()
+        self.assertEqual(len(self._probes()), 1)
+
+    def test_clear_cache(self):
+        su2_runner._check_su2_available()
+        su2_runner.clear_su2_cache()
+        self.assertFalse(su2_runner.SU2_CACHE_FILE.exists())
+        self.calls.clear()
+        su2_runner._check_su2_available()
+        self.assertEqual(len(self._probes()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,6 +49,34 @@ class TestSU2RunnerDirect(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result[0], 0.5)
 
+    def test_run_su2_keeps_per_run_files_in_output_dir(self):
+        check_backup = su2_runner._check_su2_available
+        run_backup = su2_runner.subprocess.run
+        su2_runner._check_su2_available = lambda: 'SU2_CFD'
+
+        def fake_run(*args, **kwargs):
+            class R:
+                pass
+            r = R()
+            r.returncode = 0
+            r.stdout = 'SU2 finished'
+            r.stderr = ''
+            return r
+
+        su2_runner.subprocess.run = fake_run
+        with open(Path(self.tmpdir) / 'forces_breakdown.dat', 'w') as f:
+            f.write('Total CL: 0.5\nTotal CD: 0.05\nTotal CM: 0.01\n')
+        cwd_files = set(os.listdir(self.root))
+
+        try:
+            su2_runner.run_su2(self.mesh_file, self.cfg_template, output_dir=self.tmpdir, viscous=False)
+        finally:
+            su2_runner._check_su2_available = check_backup
+            su2_runner.subprocess.run = run_backup
+        for name in ('config_tmp.cfg', 'su2_runner_debug.log', 'su2_stdout.log', 'su2_stderr.log'):
+            self.assertTrue((Path(self.tmpdir) / name).exists(), name)
+        self.assertEqual(set(os.listdir(self.root)), cwd_files)
+
 
 if __name__ == '__main__':
     unittest.main()
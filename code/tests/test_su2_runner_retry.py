@@ -36,7 +36,7 @@ class TestSU2RunnerRetries(unittest.TestCase):
         def fake_check():
             return '/usr/bin/SU2_CFD'
 
-        def fake_run(cmd, stdout, stderr, text):
+        def fake_run(cmd, stdout, stderr, text, **kwargs):
             class R:
                 pass
             calls['n'] += 1
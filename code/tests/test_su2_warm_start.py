@@ -0,0 +1,66 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import pipeline
+import su2_runner
+
+
+class TestSU2WarmStart(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.mesh_file = str(self.tmpdir / 'airfoil_mesh.su2')
+        Path(self.mesh_file).write_text('NDIME= 2\n')
+        self.backup = (su2_runner._check_su2_available, su2_runner.subprocess.run)
+        su2_runner._check_su2_available = lambda: 'SU2_CFD'
+
+        def fake_run(*args, **kwargs):
+            # simula SU2: escribe fuerzas y el restart ASCII junto al config
+            cfg = Path(args[0][-1]) if isinstance(args[0], list) else None
+            out = cfg.parent if cfg and cfg.exists() else None
+            if out is not None:
+                (out / 'forces_breakdown.dat').write_text('Total CL: 0.5\nTotal CD: 0.05\nTotal CM: 0.01\n')
+                (out / su2_runner.RESTART_NAME).write_text('"PointID","x","y"\n')
+
+            class R:
+                returncode = 0
+                stdout = 'SU2 finished'
+                stderr = ''
+            return R()
+
+        su2_runner.subprocess.run = fake_run
+
+    def tearDown(self):
+        su2_runner._check_su2_available, su2_runner.subprocess.run = self.backup
+        shutil.rmtree(self.tmpdir)
+
+    def _run(self, name, **kwargs):
+        out = self.tmpdir / name
+        res = su2_runner.run_su2(self.mesh_file, pipeline.CFG_INCOMP, output_dir=str(out), viscous=True,
+                                 incompressible=True, retries=0, warm_start=True, **kwargs)
+        self.assertIsNotNone(res)
+        return out, (out / su2_runner.CONFIG_TMP_NAME).read_text()
+
+    def test_restart_from_neighbour_on_same_mesh(self):
+        donor, cfg = self._run('aoa0', aoa=0.0)
+        self.assertIn('RESTART_ASCII', cfg)
+        self.assertNotIn('RESTART_SOL = YES', cfg)
+        meta = json.loads((donor / su2_runner.RESTART_META_NAME).read_text())
+        self.assertEqual(meta['mesh_sha256'], su2_runner.mesh_fingerprint(self.mesh_file))
+
+        out, cfg = self._run('aoa2', aoa=2.0, restart_from=str(donor))
+        self.assertIn('RESTART_SOL = YES', cfg)
+        self.assertTrue((out / su2_runner.SOLUTION_NAME).exists())
+
+    def test_mesh_mismatch_falls_back_to_cold_start(self):
+        donor, _ = self._run('aoa0', aoa=0.0)
+        Path(self.mesh_file).write_text('NDIME= 2\n% remallado\n')
+        out, cfg = self._run('aoa2', aoa=2.0, restart_from=str(donor))
+        self.assertNotIn('RESTART_SOL = YES', cfg)
+        self.assertFalse((out / su2_runner.SOLUTION_NAME).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
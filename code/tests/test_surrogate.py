@@ -0,0 +1,39 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import surrogate
+
+
+@unittest.skipIf(surrogate.asb is None, "aerosandbox no instalado")
+class TestSurrogateBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.dat = self.tmpdir / 'NACA2412.dat'
+        coords = surrogate.asb.Airfoil('naca2412').coordinates
+        np.savetxt(self.dat, coords, header='NACA2412', comments='')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_grid_matches_pointwise_calls_in_loop_order(self):
+        alphas, res, machs = [0.0, 4.0], [1e6, 3e6], [0.1, 0.2]
+        rows = surrogate.evaluate_airfoil(str(self.dat), alphas, res, machs)
+        self.assertEqual([(r['Re'], r['mach'], r['alpha']) for r in rows],
+                         [(R, M, a) for R in res for M in machs for a in alphas])
+        airfoil = surrogate.asb.Airfoil(name='NACA2412', coordinates=surrogate.load_coordinates(self.dat))
+        for r in rows:
+            ref = airfoil.get_aero_from_neuralfoil(alpha=r['alpha'], Re=r['Re'], mach=r['mach'], n_crit=9.0,
+                                                   include_360_deg_effects=True)
+            self.assertAlmostEqual(r['CL'], float(np.ravel(ref['CL'])[0]), places=10)
+            self.assertAlmostEqual(r['CD'], float(np.ravel(ref['CD'])[0]), places=10)
+            self.assertAlmostEqual(r['CM'], float(np.ravel(ref['CM'])[0]), places=10)
+        self.assertEqual({r['airfoil'] for r in rows}, {'NACA2412'})
+        self.assertEqual({r['solver'] for r in rows}, {surrogate.SOLVER_NAME})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import csv
+import multiprocessing as mp
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import surrogate
+
+
+def fake_evaluate(dat_path, alpha_list, Re_list, mach_list, n_crit=9.0):
+    name = Path(dat_path).stem
+    if name == 'broken':
+        raise ValueError('bad coordinates')
+    if name == 'noenv':
+        raise ImportError('Aerosandbox no está instalado')
+    alpha, Re, mach = surrogate.condition_grid(alpha_list, Re_list, mach_list)
+    return [dict(solver=surrogate.SOLVER_NAME, airfoil=name, alpha=float(a), Re=float(r), mach=float(m),
+                 CL=0.1 * a, CD=0.01, CM=0.0) for a, r, m in zip(alpha, Re, mach)]
+
+
+class TestSurrogateScreening(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.out = self.tmpdir / 'screen.csv'
+        self.paths = [str(self.tmpdir / f'P{i}.dat') for i in range(5)]
+        self.backup = surrogate.evaluate_airfoil
+        self.calls = []
+
+        def counting(dat_path, *args, **kwargs):
+            self.calls.append(Path(dat_path).stem)
+            return fake_evaluate(dat_path, *args, **kwargs)
+
+        surrogate.evaluate_airfoil = counting
+
+    def tearDown(self):
+        surrogate.evaluate_airfoil = self.backup
+        shutil.rmtree(self.tmpdir)
+
+    def _csv_rows(self):
+        with open(self.out, newline='') as f:
+            return list(csv.DictReader(f))
+
+    def test_incremental_csv_and_resume_skips_complete_profiles(self):
+        grid = ([0.0, 2.0], [1e6], [0.1, 0.2])
+        counts = surrogate.screen_profiles(self.paths, *grid, out_csv=str(self.out), chunk_size=2)
+        self.assertEqual(counts, {f'P{i}': 4 for i in range(5)})
+        self.assertEqual(len(self._csv_rows()), 5 * 4)
+
+        # simula una interrupcion: P4 falta y P3 quedo a medias
+        kept = [r for r in self._csv_rows() if r['airfoil'] not in ('P3', 'P4')]
+        partial = [r for r in self._csv_rows() if r['airfoil'] == 'P3'][:2]
+        with open(self.out, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=surrogate.FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(kept + partial)
+
+        self.calls.clear()
+        delivered = []
+        counts = surrogate.screen_profiles(self.paths, *grid, out_csv=str(self.out), chunk_size=2, resume=True,
+                                           on_rows=delivered.append)
+        self.assertEqual(sorted(self.calls), ['P3', 'P4'])
+        self.assertEqual(list(counts), ['P0', 'P1', 'P2', 'P3', 'P4'])
+        self.assertEqual(set(counts.values()), {4})
+        # las filas retomadas tambien se entregan (en lotes), ya convertidas a float
+        rows = [r for batch in delivered for r in batch]
+        self.assertEqual(sorted(r['airfoil'] for r in rows), sorted(f'P{i}' for i in range(5) for _ in range(4)))
+        self.assertIsInstance(rows[0]['CD'], float)
+        self.assertEqual(len(self._csv_rows()), 5 * 4)
+
+    def test_resume_with_subset_only_delivers_requested_profiles(self):
+        grid = ([0.0, 2.0], [1e6], [0.1])
+        surrogate.screen_profiles(self.paths[:3], *grid, out_csv=str(self.out), chunk_size=2)
+        self.calls.clear()
+        delivered = []
+        counts = surrogate.screen_profiles([self.paths[1], self.paths[4]], *grid, out_csv=str(self.out), chunk_size=2,
+                                           resume=True, on_rows=delivered.extend)
+        self.assertEqual(self.calls, ['P4'])
+        self.assertEqual(counts, {'P1': 2, 'P4': 2})
+        self.assertEqual(sorted(r['airfoil'] for r in delivered), ['P1', 'P1', 'P4', 'P4'])
+        # P0 y P2 siguen en el CSV de cribado para una proxima corrida que los pida
+        self.assertEqual(sorted({r['airfoil'] for r in self._csv_rows()}), ['P0', 'P1', 'P2', 'P4'])
+
+    def test_failed_profile_does_not_stop_screening(self):
+        paths = self.paths[:2] + [str(self.tmpdir / 'broken.dat')]
+        counts = surrogate.screen_profiles(paths, [0.0], [1e6], [0.1], out_csv=str(self.out), chunk_size=8)
+        self.assertEqual(counts, {'P0': 1, 'P1': 1})
+
+    def test_environment_failure_stops_screening(self):
+        paths = self.paths[:2] + [str(self.tmpdir / 'noenv.dat')]
+        with self.assertRaises(ImportError):
+            surrogate.screen_profiles(paths, [0.0], [1e6], [0.1], out_csv=str(self.out), chunk_size=8)
+
+    @unittest.skipUnless(mp.get_start_method() == 'fork', "monkeypatching needs fork-started workers")
+    def test_process_pool_matches_serial(self):
+        grid = ([0.0, 2.0, 4.0], [1e6, 2e6], [0.1])
+        serial, parallel = [], []
+        counts = surrogate.screen_profiles(self.paths, *grid, out_csv=str(self.out), jobs=1, chunk_size=2,
+                                           on_rows=serial.extend)
+        self.assertEqual(surrogate.screen_profiles(self.paths, *grid, out_csv=str(self.out), jobs=3, chunk_size=2,
+                                                   on_rows=parallel.extend), counts)
+        key = lambda r: (r['airfoil'], r['Re'], r['alpha'])
+        self.assertEqual(sorted(parallel, key=key), sorted(serial, key=key))
+        self.assertEqual(len(self._csv_rows()), len(serial))
+
+
+if __name__ == '__main__':
+    unittest.main()